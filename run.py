@@ -4,6 +4,9 @@ import json
 from src.linkedin_scraper.logging import get_logger
 from src.linkedin_scraper.main import scrape, scrape_html
 from src.linkedin_scraper.llm_extractor import extract_profile, extract_company
+from src.linkedin_scraper.config import METRICS_PORT
+from src.linkedin_scraper.metrics import serve_metrics
+from src.linkedin_scraper.tracing import configure_tracing, span
 
 logger = get_logger()
 
@@ -15,47 +18,175 @@ def main():
     parser = argparse.ArgumentParser(description="LinkedIn Scraper")
 
     # Create a mutually exclusive group for profile and company options
-    group = parser.add_mutually_exclusive_group(required=True)
+    group = parser.add_mutually_exclusive_group()
     group.add_argument(
         "--profile", action="store_true", help="Scrape a LinkedIn profile"
     )
     group.add_argument(
         "--company", action="store_true", help="Scrape a LinkedIn company"
     )
+    group.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a daemon serving scrape jobs over a local HTTP API",
+    )
 
     # Name parameter
-    parser.add_argument(
-        "--name", required=True, help="Profile or company name to scrape"
-    )
+    parser.add_argument("--name", help="Profile or company name to scrape")
 
     # Add llm parameter
     parser.add_argument(
         "--llm", action="store_true", help="Use LLM extraction on scraped HTML"
     )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write per-stage spans to TRACE_PATH (OTLP/JSON lines)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=METRICS_PORT,
+        help="Serve Prometheus metrics on this local port while running",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Scrape even if the target is fresh or unchanged",
+    )
+
+    # Daemon parameters
+    parser.add_argument(
+        "--workers", type=int, help="Number of warm browser contexts (daemon)"
+    )
+    parser.add_argument("--port", type=int, help="TCP port to listen on (daemon)")
+    parser.add_argument("--socket", help="Unix socket to listen on (daemon)")
+
+    # Offline reprocessing parameters
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--from-html",
+        metavar="PATH",
+        help="Reprocess stored HTML (file, directory or glob) instead of scraping",
+    )
+    source.add_argument(
+        "--from-archive",
+        action="store_true",
+        help="Reprocess the newest archived page of each target",
+    )
+    parser.add_argument(
+        "--since", help="Only archived pages fetched since (ISO date or timestamp)"
+    )
+    parser.add_argument("--output", help="Directory for reprocessed results")
+    parser.add_argument(
+        "--sink",
+        choices=["json", "ndjson", "parquet", "sqlite"],
+        help="Where scraped records go (default RESULT_SINK): one JSON file per "
+        "target, an NDJSON stream, Parquet files or the SQLite result store",
+    )
 
     args = parser.parse_args()
 
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+
+    if args.from_html or args.from_archive:
+        run_reprocess(args)
+        return
+
+    if not (args.profile or args.company or args.serve):
+        parser.error("one of --profile, --company, --serve or --from-html is required")
+
+    if args.serve:
+        from src.linkedin_scraper.daemon import ScraperDaemon
+        from src.linkedin_scraper.config import DAEMON_PORT, DAEMON_WORKERS
+
+        daemon = ScraperDaemon(workers=args.workers or DAEMON_WORKERS)
+        try:
+            asyncio.run(
+                daemon.serve_forever(
+                    port=args.port or DAEMON_PORT, socket_path=args.socket
+                )
+            )
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if not args.name:
+        parser.error("--name is required with --profile or --company")
+
     # Determine target type
     target_type = "profile" if args.profile else "company"
 
+    if args.trace:
+        configure_tracing(True)
+
     # Run scrape job
     if args.llm:
         # Use scrape_html and LLM extractor
         async def run_llm_extraction():
-            html = await scrape_html(type=target_type, name=args.name)
-
             if target_type == "profile":
-                result = extract_profile(html)
+                extract = extract_profile
             else:
-                result = extract_company(html)
+                extract = extract_company
+            # The target only counts as checked once extraction succeeded
+            result = await scrape_html(
+                type=target_type, name=args.name, force=args.force, extract=extract
+            )
+            if result is None:
+                print(f"{target_type} {args.name} unchanged, nothing to extract")
+                return
+            if result == "":
+                return
 
             # pretty print the result
             print(json.dumps(result, indent=4))
 
-        asyncio.run(run_llm_extraction())
+        with span("job", type=target_type, target=args.name, mode="llm"):
+            asyncio.run(run_llm_extraction())
     else:
         # Use regular scrape
-        asyncio.run(scrape(args.name, target_type))
+        with span("job", type=target_type, target=args.name, mode="data"):
+            asyncio.run(
+                scrape(args.name, target_type, sink=args.sink, force=args.force)
+            )
+
+
+def run_reprocess(args):
+    """Run cleaning (and LLM extraction with --llm) over stored HTML."""
+    import os
+    from datetime import datetime
+    from src.linkedin_scraper.config import DATA_DIR
+    from src.linkedin_scraper.reprocess import (
+        iter_archive_pages,
+        iter_html_files,
+        reprocess,
+    )
+
+    target_type = "profile" if args.profile else "company" if args.company else None
+    output_dir = args.output or os.path.join(DATA_DIR, "reprocessed")
+
+    archive = None
+    if args.from_archive:
+        from src.linkedin_scraper.storage.archive import HtmlArchive
+
+        since = None
+        if args.since:
+            try:
+                since = float(args.since)
+            except ValueError:
+                since = datetime.fromisoformat(args.since).timestamp()
+        archive = HtmlArchive()
+        pages = iter_archive_pages(archive, target_type, args.name, since)
+    else:
+        pages = iter_html_files(args.from_html, default_type=target_type)
+
+    try:
+        stats = asyncio.run(reprocess(pages, output_dir, llm=args.llm))
+    finally:
+        if archive:
+            archive.close()
+    print(json.dumps(stats, indent=4))
 
 
 if __name__ == "__main__":
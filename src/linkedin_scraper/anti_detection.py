@@ -6,6 +6,7 @@ Focuses on handling LinkedIn's anti-crawling mechanisms and CAPTCHAs
 import random
 from playwright.async_api import Page, BrowserContext
 from .logging import get_logger
+from .pacing import pace
 
 logger = get_logger()
 
@@ -181,8 +182,8 @@ class AntiDetectionHandler:
         # Execute mouse movement
         for point in points:
             await page.mouse.move(point["x"], point["y"])
-            # Random pause to simulate human behavior
-            await page.wait_for_timeout(random.randint(50, 200))
+            # Pause to simulate human behavior
+            await pace("pointer")
 
     async def random_scroll(self, page: Page):
         """
@@ -208,21 +209,21 @@ class AntiDetectionHandler:
             # Perform scroll
             await page.evaluate(f"window.scrollTo(0, {next_pos})")
 
-            # Random pause to simulate reading
-            await page.wait_for_timeout(random.randint(500, 3000))
+            # Pause to simulate reading
+            await pace("scroll")
 
             # Occasionally scroll up a bit to simulate reviewing content
             if random.random() < 0.3 and i > 0:
                 back_pos = max(0, next_pos - random.randint(100, 300))
                 await page.evaluate(f"window.scrollTo(0, {back_pos})")
-                await page.wait_for_timeout(random.randint(500, 1500))
+                await pace("scroll")
                 await page.evaluate(f"window.scrollTo(0, {next_pos})")
-                await page.wait_for_timeout(random.randint(500, 1500))
+                await pace("scroll")
 
         # Sometimes return to the top
         if random.random() < 0.5:
             await page.evaluate("window.scrollTo(0, 0)")
-            await page.wait_for_timeout(random.randint(500, 1500))
+            await pace("scroll")
 
     async def bypass_cloudflare(self, page: Page):
         """
@@ -285,7 +286,7 @@ class AntiDetectionHandler:
                 if await page.is_visible(selector):
                     logger.debug(f"Close popup: {selector}")
                     await page.click(selector)
-                    await page.wait_for_timeout(random.randint(500, 1500))
+                    await pace("click")
             except:
                 continue
 
@@ -295,20 +296,10 @@ class AntiDetectionHandler:
 
         Args:
             page: Playwright page object
-            action_type: Operation type, affects delay time range
+            action_type: Action class in the pacing policy (navigation, click,
+                input, scroll, pointer)
         """
-        if action_type == "navigation":
-            # Delay after page navigation
-            await page.wait_for_timeout(random.randint(2000, 5000))
-        elif action_type == "click":
-            # Delay before and after click operations
-            await page.wait_for_timeout(random.randint(500, 1500))
-        elif action_type == "input":
-            # Delay for input operations
-            await page.wait_for_timeout(random.randint(300, 800))
-        else:
-            # Default delay
-            await page.wait_for_timeout(random.randint(1000, 3000))
+        await pace(action_type)
 
     async def human_like_typing(self, page: Page, selector, text):
         """
@@ -326,11 +317,8 @@ class AntiDetectionHandler:
 
         # Type character by character to simulate human typing
         for char in text:
-            await page.type(selector, char, delay=random.randint(50, 150))
-
-            # Occasionally pause to simulate thinking
-            if random.random() < 0.1:
-                await page.wait_for_timeout(random.randint(200, 500))
+            await page.type(selector, char)
+            await pace("input")
 
     def get_browser_launch_options(self, use_proxy=False, proxy_url=None):
         """
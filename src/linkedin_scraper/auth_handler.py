@@ -3,7 +3,6 @@ LinkedIn Scraper - Authentication Handler Module
 Focuses on handling LinkedIn login, CAPTCHA, and security verification
 """
 
-import os
 import json
 import time
 import random
@@ -11,6 +10,7 @@ from pathlib import Path
 from playwright.async_api import Page, BrowserContext
 from .config import DEFAULT_TIMEOUT, LINKEDIN_URL, LINKEDIN_LOGIN_URL
 from .logging import get_logger
+from .storage.writer import get_writer
 
 logger = get_logger()
 
@@ -119,9 +119,8 @@ class LinkedInAuthHandler:
             context: Playwright browser context
         """
         cookies = await context.cookies()
-        os.makedirs(os.path.dirname(self.cookies_path), exist_ok=True)
-        with open(self.cookies_path, "w") as f:
-            json.dump(cookies, f)
+        # Written by the background writer, atomically, off the event loop
+        await get_writer().write_json(self.cookies_path, cookies, wait=True)
         logger.debug(f"Cookies saved to {self.cookies_path}")
 
     async def is_logged_in(self, page: Page):
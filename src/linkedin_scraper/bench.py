@@ -0,0 +1,488 @@
+"""
+LinkedIn Scraper - Benchmark Module
+Runs N targets at concurrency C through the real scrapers, against the
+local stand-in server or replayed HARs, and reports per-stage latency
+percentiles, throughput and peak memory, optionally against a baseline
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import multiprocessing
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+from .config import DATA_DIR, HAR_MODE, LINKEDIN_URL, PREFETCH_DEPTH
+from .logging import get_logger
+from .pacing import PACING_PROFILES, configure_pacing
+from .pipeline import Prefetcher
+from .storage.sinks import SINKS, open_sink
+from .storage.writer import get_writer
+from .tracing import span
+from .utils.procstats import PeakMemorySampler
+from .utils.stages import StageRecorder, recording, stage, summarize
+
+logger = get_logger()
+
+BENCH_MODES = ("data", "html", "llm")
+# Stages in pipeline order, for the table
+STAGE_ORDER = (
+    "launch",
+    "login",
+    "goto",
+    "prefetched",
+    "ready",
+    "scroll",
+    "extract",
+    "details",
+    "content",
+    "clean",
+    "llm",
+    "write",
+)
+# Latency increases smaller than this (seconds) are never flagged
+MIN_REGRESSION_DELTA = 0.005
+
+
+def make_targets(count: int, names: Optional[List[str]] = None) -> List[str]:
+    """
+    Target names for a run, cycling through `names` or generating some
+
+    Args:
+        count: Number of targets
+        names: Names to use, repeated as needed
+
+    Returns:
+        list: `count` target names
+    """
+    if not names:
+        # The stand-in server generates data for any name
+        return [f"bench-{i}" for i in range(count)]
+    return [names[i % len(names)] for i in range(count)]
+
+
+async def run_job(
+    scraper, target_type: str, name: str, mode: str, output_dir: str, sink=None
+):
+    """
+    Scrape one target the way the CLI would
+
+    Html and llm results are written to the sink when there is one, else to
+    one JSON file per target in output_dir
+
+    Returns:
+        bool: Whether the job succeeded
+    """
+    if mode == "data":
+        if target_type == "profile":
+            data = await scraper.scrape_profile(name)
+        else:
+            data = await scraper.scrape_company(name)
+        return isinstance(data, dict) and "error" not in data
+
+    from .main import extract_main_html
+
+    if target_type == "profile":
+        html = await scraper.scrape_profile_html(name)
+    else:
+        html = await scraper.scrape_company_html(name)
+    if not isinstance(html, str):
+        return False
+    result = await asyncio.to_thread(extract_main_html, html)
+    if mode == "llm":
+        from .llm_extractor import extract_company, extract_profile
+
+        extract = extract_profile if target_type == "profile" else extract_company
+        result = await asyncio.to_thread(extract, result)
+
+    if sink is not None:
+        with stage("write"):
+            await asyncio.to_thread(sink.write, target_type, name, result)
+        return True
+
+    output_file = os.path.join(output_dir, f"{target_type}_{name}.json")
+    with stage("write"):
+        await get_writer().write_json(output_file, result)
+    return True
+
+
+async def run_benchmark(
+    targets: List[str],
+    target_type: str = "profile",
+    concurrency: int = 1,
+    mode: str = "data",
+    headless: bool = True,
+    output_dir: Optional[str] = None,
+    scraper_factory=None,
+    prefetch: int = 0,
+    sink: Optional[str] = None,
+) -> dict:
+    """
+    Run the benchmark
+
+    Args:
+        targets: Target names, one job each
+        target_type: "profile" or "company"
+        concurrency: Scrapers (browser contexts) working in parallel
+        mode: "data" (structured scrape), "html" (HTML plus cleaning) or
+            "llm" (HTML, cleaning and LLM extraction)
+        headless: Run the browser headless
+        output_dir: Where html/llm results are written
+        scraper_factory: Callable returning a LinkedInScraper-like object
+        prefetch: Targets each worker loads ahead on spare pages
+        sink: Result sink (json, ndjson, parquet, sqlite) shared by the
+            workers and writing into output_dir; its records/sec go into the
+            report
+
+    Returns:
+        dict: Benchmark report
+    """
+    if mode not in BENCH_MODES:
+        raise ValueError(f"mode must be one of {BENCH_MODES}")
+    if scraper_factory is None:
+        from .scrapers.linkedin import LinkedInScraper
+
+        scraper_factory = LinkedInScraper
+    output_dir = output_dir or os.path.join(DATA_DIR, "bench", "output")
+    os.makedirs(output_dir, exist_ok=True)
+    result_sink = open_sink(sink, output_dir) if sink else None
+    factory_options = {"sink": result_sink} if result_sink else {}
+
+    recorder = StageRecorder()
+    memory = PeakMemorySampler()
+    queue: asyncio.Queue = asyncio.Queue()
+    for name in targets:
+        queue.put_nowait(name)
+    job_latencies = []
+    failures = 0
+    scrapers = []
+
+    async def worker(scraper):
+        nonlocal failures
+        prefetcher = Prefetcher(scraper, prefetch)
+        try:
+            while True:
+                name = prefetcher.next()
+                if name is None:
+                    try:
+                        name = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                while prefetcher.wants_more() and not queue.empty():
+                    ahead = queue.get_nowait()
+                    await prefetcher.prefetch(ahead, target_type, ahead)
+                start = time.perf_counter()
+                try:
+                    with span("job", type=target_type, target=name, mode=mode):
+                        ok = await run_job(
+                            scraper, target_type, name, mode, output_dir, result_sink
+                        )
+                except Exception as e:
+                    logger.debug(f"Benchmark job {name} failed: {e}")
+                    ok = False
+                job_latencies.append(time.perf_counter() - start)
+                failures += int(not ok)
+        finally:
+            await prefetcher.close()
+
+    started_at = time.time()
+    with recording(recorder):
+        memory.start()
+        startup_start = time.perf_counter()
+        try:
+            for index in range(concurrency):
+                scraper = scraper_factory(headless=headless, **factory_options)
+                shared = scrapers[0].browser if scrapers else None
+                with stage("launch"):
+                    await scraper.initialize_browser(browser=shared)
+                scrapers.append(scraper)
+                with stage("login"):
+                    logged_in = await scraper.login()
+                if not logged_in:
+                    raise RuntimeError(f"Login failed for benchmark worker {index}")
+            startup_seconds = time.perf_counter() - startup_start
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker(scraper) for scraper in scrapers))
+            # Outputs still queued on the file writer count towards the run
+            await get_writer().aflush()
+            wall_seconds = time.perf_counter() - start
+        finally:
+            await memory.stop()
+            # Shared contexts first, the browser owner last
+            for scraper in reversed(scrapers):
+                await scraper.cleanup()
+            if result_sink is not None:
+                await asyncio.to_thread(result_sink.close)
+
+    completed = len(job_latencies) - failures
+    report_sink = result_sink.stats() if result_sink else None
+    ordered = sorted(
+        recorder.summary().items(),
+        key=lambda item: (
+            STAGE_ORDER.index(item[0]) if item[0] in STAGE_ORDER else len(STAGE_ORDER)
+        ),
+    )
+    return {
+        "config": {
+            "type": target_type,
+            "targets": len(targets),
+            "concurrency": concurrency,
+            "prefetch": prefetch,
+            "sink": sink,
+            "mode": mode,
+            "site": LINKEDIN_URL,
+            "har_mode": HAR_MODE,
+            "started_at": started_at,
+        },
+        "jobs": {"total": len(job_latencies), "ok": completed, "failed": failures},
+        "startup_seconds": startup_seconds,
+        "wall_seconds": wall_seconds,
+        "throughput": {
+            "jobs_per_second": completed / wall_seconds if wall_seconds else 0.0,
+            "pages_per_minute": 60 * completed / wall_seconds if wall_seconds else 0.0,
+        },
+        "job_latency": summarize(job_latencies),
+        "stages": dict(ordered),
+        "sink": report_sink,
+        "memory": {
+            "python_peak_rss_mb": memory.python_peak / 1024**2,
+            "browser_peak_rss_mb": memory.browser_peak / 1024**2,
+        },
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float = 0.10) -> List[dict]:
+    """
+    Find regressions against a baseline report
+
+    Latencies and memory regress when they grow by more than `threshold`
+    (and latencies by at least MIN_REGRESSION_DELTA), throughput when it
+    drops by more than `threshold`.
+
+    Args:
+        report: Current report
+        baseline: Report of the reference run
+        threshold: Allowed relative change
+
+    Returns:
+        list: One entry per regressed metric
+    """
+    regressions = []
+
+    def check(metric, current, previous, higher_is_worse=True, min_delta=0.0):
+        if not previous:
+            return
+        change = (current - previous) / previous
+        worse = change > threshold if higher_is_worse else change < -threshold
+        if worse and abs(current - previous) >= min_delta:
+            regressions.append(
+                {
+                    "metric": metric,
+                    "baseline": previous,
+                    "current": current,
+                    "change": change,
+                }
+            )
+
+    latencies = dict(report.get("stages", {}), job=report.get("job_latency", {}))
+    baseline_latencies = dict(
+        baseline.get("stages", {}), job=baseline.get("job_latency", {})
+    )
+    for name, stats in latencies.items():
+        previous = baseline_latencies.get(name)
+        if not previous:
+            continue
+        for q in ("p50", "p95", "p99"):
+            check(
+                f"{name}.{q}",
+                stats.get(q, 0.0),
+                previous.get(q, 0.0),
+                min_delta=MIN_REGRESSION_DELTA,
+            )
+    check(
+        "throughput.pages_per_minute",
+        report["throughput"]["pages_per_minute"],
+        baseline.get("throughput", {}).get("pages_per_minute", 0.0),
+        higher_is_worse=False,
+    )
+    sink, baseline_sink = report.get("sink"), baseline.get("sink")
+    if sink and baseline_sink and sink["sink"] == baseline_sink["sink"]:
+        check(
+            "sink.records_per_second",
+            sink["records_per_second"],
+            baseline_sink["records_per_second"],
+            higher_is_worse=False,
+        )
+    for name, value in report.get("memory", {}).items():
+        check(f"memory.{name}", value, baseline.get("memory", {}).get(name, 0.0))
+    return regressions
+
+
+def format_table(report: dict, regressions: Optional[List[dict]] = None) -> str:
+    """Human-readable summary of a report."""
+    regressed = {r["metric"].split(".")[0] for r in regressions or []}
+    config = report["config"]
+    lines = [
+        f"{config['targets']} {config['type']} target(s), concurrency "
+        f"{config['concurrency']}, mode {config['mode']}, site {config['site']}",
+        "",
+        f"{'stage':<10} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}",
+    ]
+    rows = list(report["stages"].items()) + [("job", report["job_latency"])]
+    for name, stats in rows:
+        flag = "  REGRESSED" if name in regressed else ""
+        lines.append(
+            f"{name:<10} {stats['count']:>6} {stats['p50'] * 1000:>9.1f} "
+            f"{stats['p95'] * 1000:>9.1f} {stats['p99'] * 1000:>9.1f}{flag}"
+        )
+    jobs = report["jobs"]
+    memory = report["memory"]
+    lines += [
+        "",
+        f"jobs: {jobs['ok']} ok, {jobs['failed']} failed in "
+        f"{report['wall_seconds']:.2f}s (startup {report['startup_seconds']:.2f}s)",
+        f"throughput: {report['throughput']['pages_per_minute']:.1f} pages/min",
+        f"peak RSS: python {memory['python_peak_rss_mb']:.0f} MB, "
+        f"browser {memory['browser_peak_rss_mb']:.0f} MB",
+    ]
+    sink = report.get("sink")
+    if sink:
+        lines.append(
+            f"sink: {sink['sink']}, {sink['records']} records, "
+            f"{sink['records_per_second']:.0f} records/s"
+        )
+    if regressions is not None:
+        lines.append("")
+        if not regressions:
+            lines.append("no regressions against the baseline")
+        for r in regressions:
+            lines.append(
+                f"REGRESSION {r['metric']}: {r['baseline']:.4g} -> "
+                f"{r['current']:.4g} ({r['change']:+.0%})"
+            )
+    return "\n".join(lines)
+
+
+def _serve_standin(host: str, port: int):
+    from .standin.server import StandInServer
+
+    async def serve():
+        server = StandInServer()
+        await server.start(host=host, port=port)
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def start_standin(timeout: float = 10.0) -> multiprocessing.Process:
+    """
+    Start the stand-in server in a separate process at LINKEDIN_URL
+
+    Running it in its own process keeps its CPU and memory out of the
+    scraper's numbers.
+    """
+    url = urlsplit(LINKEDIN_URL)
+    if url.hostname not in ("127.0.0.1", "localhost") or not url.port:
+        raise ValueError(
+            "Set LINKEDIN_URL to a local address such as http://127.0.0.1:8780 "
+            "to benchmark against the stand-in server"
+        )
+    process = multiprocessing.Process(
+        target=_serve_standin, args=(url.hostname, url.port), daemon=True
+    )
+    process.start()
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((url.hostname, url.port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"Stand-in server did not start at {LINKEDIN_URL}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LinkedIn scraper benchmark")
+    parser.add_argument("--type", choices=("profile", "company"), default="profile")
+    parser.add_argument("--targets", type=int, default=20, help="number of jobs")
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--mode", choices=BENCH_MODES, default="data")
+    parser.add_argument("--names", help="comma separated target names to cycle")
+    parser.add_argument(
+        "--standin",
+        action="store_true",
+        help="start the stand-in server at LINKEDIN_URL for the run",
+    )
+    parser.add_argument("--headed", action="store_true", help="show the browser")
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=PREFETCH_DEPTH,
+        help="targets each worker loads ahead on spare pages",
+    )
+    parser.add_argument(
+        "--pacing",
+        choices=tuple(PACING_PROFILES),
+        default="none",
+        help="pacing profile for the scrapers' human-like delays",
+    )
+    parser.add_argument(
+        "--sink",
+        choices=tuple(SINKS),
+        help="write results through this sink and report its records/sec",
+    )
+    parser.add_argument("--output", help="report path (JSON)")
+    parser.add_argument("--baseline", help="baseline report to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="relative change flagged as a regression",
+    )
+    args = parser.parse_args()
+    configure_pacing(args.pacing)
+
+    standin = start_standin() if args.standin else None
+    try:
+        names = args.names.split(",") if args.names else None
+        report = asyncio.run(
+            run_benchmark(
+                make_targets(args.targets, names),
+                target_type=args.type,
+                concurrency=args.concurrency,
+                mode=args.mode,
+                headless=not args.headed,
+                prefetch=args.prefetch,
+                sink=args.sink,
+            )
+        )
+    finally:
+        if standin is not None:
+            standin.terminate()
+
+    regressions = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        report["regressions"] = regressions
+
+    output = args.output or os.path.join(
+        DATA_DIR, "bench", f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(format_table(report, regressions))
+    print(f"\nreport written to {output}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
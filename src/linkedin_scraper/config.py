@@ -3,6 +3,7 @@ LinkedIn crawler configuration file
 """
 
 import os
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -14,9 +15,12 @@ LINKEDIN_PASSWORD = os.getenv("LINKEDIN_PASSWORD", "your_password")
 
 # Browser configuration
 HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
-SLOW_MO = int(
-    os.getenv("SLOW_MO", "50")
-)  # Slow down Playwright operations in milliseconds, helps bypass anti-crawling
+# Slow down every Playwright operation (milliseconds); off by default, delays
+# come from the pacing policy below
+SLOW_MO = int(os.getenv("SLOW_MO", "0"))
+# Pacing: delay profile (human, fast or none) and most seconds of delay per job
+PACING_PROFILE = os.getenv("PACING_PROFILE", "human")
+PACING_JOB_BUDGET = float(os.getenv("PACING_JOB_BUDGET", "30"))
 
 # User agent configuration - use modern browser user agent
 USER_AGENT = os.getenv(
@@ -29,12 +33,128 @@ PROXY = os.getenv("PROXY", None)
 
 # Timeout settings
 DEFAULT_TIMEOUT = int(os.getenv("DEFAULT_TIMEOUT", "300000"))  # 30 seconds
+# Upper bound for a single profile section extractor (milliseconds)
+SECTION_TIMEOUT = int(os.getenv("SECTION_TIMEOUT", "15000"))
+# Most time (milliseconds) spent after navigation waiting for a page type's
+# readiness predicates before extraction goes ahead with what has rendered
+READINESS_BUDGET = int(os.getenv("READINESS_BUDGET", "10000"))
+# Targets each worker loads on spare pages while it scrapes the current one,
+# 0 disables prefetching; every prefetched target is one more page loading
+PREFETCH_DEPTH = int(os.getenv("PREFETCH_DEPTH", "0"))
+# Company sub-pages scraped next to the main page, each on a page of its own
+# (comma separated: about, jobs, people; empty for the main page only)
+COMPANY_SUBPAGES = os.getenv("COMPANY_SUBPAGES", "about,jobs,people")
+# Profile sections read from their own detail pages (/in/<name>/details/...),
+# loaded concurrently instead of scrolling the profile page (comma separated:
+# experience, education, skills, certifications, languages; empty to scroll)
+PROFILE_DETAIL_SECTIONS = os.getenv(
+    "PROFILE_DETAIL_SECTIONS", "experience,education,skills,certifications,languages"
+)
 # Path to save data
-DATA_DIR = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data"
+DATA_DIR = os.getenv(
+    "DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data"),
 )
 COOKIES_PATH = os.path.join(DATA_DIR, "cookies.json")
+# Playwright storage state (cookies plus localStorage) reused across runs
+STORAGE_STATE_PATH = os.path.join(DATA_DIR, "storage_state.json")
+# Seconds a validated session is trusted without a validation navigation
+SESSION_TTL = int(os.getenv("SESSION_TTL", "21600"))
 # Cookies configuration (optional, read from .env)
 LINKEDIN_COOKIES = os.getenv("LINKEDIN_COOKIES", None)
-LINKEDIN_URL = "https://www.linkedin.com"
-LINKEDIN_LOGIN_URL = "https://www.linkedin.com/login"
+# HTTP fetch tier: requests in flight and pooled connections
+HTTP_CONCURRENCY = int(os.getenv("HTTP_CONCURRENCY", "4"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "8"))
+# Tiered fetching: tiers tried in order, and the on-disk HTML cache. The
+# archive tier keeps every fetched page and serves it back while fresh; it
+# stands in for the cache tier when zstandard is not installed
+FETCH_TIERS = os.getenv("FETCH_TIERS", "archive,http,browser")
+HTML_CACHE_DIR = os.path.join(DATA_DIR, "html_cache")
+HTML_CACHE_TTL = int(os.getenv("HTML_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
+# Raw HTML archive: zstd level, disk budget and maximum page age (seconds)
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+# Archive the pages rendered by structured scrapes as well
+ARCHIVE_PAGES = os.getenv("ARCHIVE_PAGES", "true").lower() == "true"
+ARCHIVE_LEVEL = int(os.getenv("ARCHIVE_LEVEL", "10"))
+ARCHIVE_MAX_BYTES = int(os.getenv("ARCHIVE_MAX_BYTES", str(5 * 1024**3)))
+ARCHIVE_MAX_AGE = int(os.getenv("ARCHIVE_MAX_AGE", str(90 * 24 * 3600)))
+# Where scraped records go: json (one file per target), ndjson (append-only
+# stream, rotated at SINK_ROTATE_BYTES), parquet (a file every
+# SINK_BATCH_SIZE records, needs pyarrow) or sqlite (the result store,
+# upserted in batches of up to SINK_BATCH_SIZE)
+RESULT_SINK = os.getenv("RESULT_SINK", "json").lower()
+SINK_ROTATE_BYTES = int(os.getenv("SINK_ROTATE_BYTES", str(256 * 1024**2)))
+SINK_BATCH_SIZE = int(os.getenv("SINK_BATCH_SIZE", "1000"))
+# Background file writer: documents queued before coroutines have to wait,
+# and most documents written per batch
+WRITER_QUEUE_SIZE = int(os.getenv("WRITER_QUEUE_SIZE", "1000"))
+WRITER_BATCH_SIZE = int(os.getenv("WRITER_BATCH_SIZE", "64"))
+# Indexed result store: latest record per profile and company
+RESULTS_PATH = os.path.join(DATA_DIR, "results.sqlite")
+# Change-only record store: latest snapshot plus field-level deltas per scrape
+RECORD_DELTAS = os.getenv("RECORD_DELTAS", "false").lower() == "true"
+DELTAS_PATH = os.path.join(DATA_DIR, "deltas.sqlite")
+# Revalidation: per-entity freshness TTLs and the stale-while-revalidate
+# window (seconds) after which a re-scrape checks for changes first
+REVALIDATE = os.getenv("REVALIDATE", "true").lower() == "true"
+VALIDATORS_PATH = os.path.join(DATA_DIR, "validators.sqlite")
+FRESHNESS_TTL_PROFILE = int(os.getenv("FRESHNESS_TTL_PROFILE", str(5 * 24 * 3600)))
+FRESHNESS_TTL_COMPANY = int(os.getenv("FRESHNESS_TTL_COMPANY", str(2 * 24 * 3600)))
+STALE_WHILE_REVALIDATE = int(os.getenv("STALE_WHILE_REVALIDATE", str(12 * 3600)))
+# HAR record/replay: "off", "record" (one HAR per job) or "replay" (serve
+# jobs from recorded HARs, with latency and jitter added in milliseconds)
+HAR_MODE = os.getenv("HAR_MODE", "off").lower()
+HAR_DIR = os.getenv("HAR_DIR", os.path.join(DATA_DIR, "har"))
+HAR_LATENCY = int(os.getenv("HAR_LATENCY", "0"))
+HAR_LATENCY_JITTER = int(os.getenv("HAR_LATENCY_JITTER", "0"))
+# Tracing: per-job spans exported as OTLP/JSON lines
+TRACING = os.getenv("TRACING", "false").lower() == "true"
+TRACE_PATH = os.getenv("TRACE_PATH", os.path.join(DATA_DIR, "traces.jsonl"))
+TRACE_BATCH_SIZE = int(os.getenv("TRACE_BATCH_SIZE", "256"))
+# Offline reprocessing: concurrent LLM calls
+REPROCESS_CONCURRENCY = int(os.getenv("REPROCESS_CONCURRENCY", "4"))
+# Daemon mode: warm browser contexts serving a local job API
+DAEMON_HOST = os.getenv("DAEMON_HOST", "127.0.0.1")
+DAEMON_PORT = int(os.getenv("DAEMON_PORT", "8765"))
+DAEMON_SOCKET = os.getenv("DAEMON_SOCKET", None)  # Unix socket, overrides host/port
+DAEMON_WORKERS = int(os.getenv("DAEMON_WORKERS", "2"))
+DAEMON_QUEUE_SIZE = int(os.getenv("DAEMON_QUEUE_SIZE", "16"))
+# Context lifecycle: replace the browser context after this many jobs or once
+# the browser's RSS passes the limit (MB), 0 disables either; jobs whose page
+# crashed or hung (no answer within PAGE_HANG_TIMEOUT seconds) are run again
+CONTEXT_MAX_JOBS = int(os.getenv("CONTEXT_MAX_JOBS", "50"))
+CONTEXT_MAX_RSS_MB = int(os.getenv("CONTEXT_MAX_RSS_MB", "2048"))
+PAGE_HANG_TIMEOUT = float(os.getenv("PAGE_HANG_TIMEOUT", "10"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "2"))
+# Supervisor: worker processes (one browser each), browser contexts per
+# process, and seconds between worker metrics reports
+SUPERVISOR_PROCESSES = int(os.getenv("SUPERVISOR_PROCESSES", str(os.cpu_count() or 1)))
+SUPERVISOR_CONCURRENCY = int(os.getenv("SUPERVISOR_CONCURRENCY", "2"))
+SUPERVISOR_METRICS_INTERVAL = float(os.getenv("SUPERVISOR_METRICS_INTERVAL", "5"))
+# Job queue shared by scraper nodes: memory://, sqlite:///path or
+# redis://host:port/db; claimed jobs are redelivered after the visibility
+# timeout (seconds) and dead-lettered after QUEUE_MAX_ATTEMPTS claims
+QUEUE_PATH = os.getenv("QUEUE_PATH", os.path.join(DATA_DIR, "jobs.sqlite"))
+QUEUE_URL = os.getenv("QUEUE_URL", f"sqlite://{os.path.abspath(QUEUE_PATH)}")
+QUEUE_VISIBILITY_TIMEOUT = float(os.getenv("QUEUE_VISIBILITY_TIMEOUT", "600"))
+QUEUE_MAX_ATTEMPTS = int(os.getenv("QUEUE_MAX_ATTEMPTS", "3"))
+QUEUE_BATCH_SIZE = int(os.getenv("QUEUE_BATCH_SIZE", "8"))
+QUEUE_RETRY_DELAY = float(os.getenv("QUEUE_RETRY_DELAY", "60"))
+# Prometheus metrics endpoint (GET /metrics), off when the port is 0; the
+# daemon also serves it on its own API
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+# Stand-in server for load tests (python -m src.linkedin_scraper.standin.server)
+STANDIN_HOST = os.getenv("STANDIN_HOST", "127.0.0.1")
+STANDIN_PORT = int(os.getenv("STANDIN_PORT", "8780"))
+STANDIN_LATENCY = int(os.getenv("STANDIN_LATENCY", "0"))  # milliseconds
+STANDIN_JITTER = int(os.getenv("STANDIN_JITTER", "0"))  # milliseconds
+STANDIN_ERROR_RATE = float(os.getenv("STANDIN_ERROR_RATE", "0"))
+# Site root, overridable to point the scrapers at the stand-in server
+LINKEDIN_URL = os.getenv("LINKEDIN_URL", "https://www.linkedin.com").rstrip("/")
+LINKEDIN_LOGIN_URL = os.getenv("LINKEDIN_LOGIN_URL", f"{LINKEDIN_URL}/login")
+# Domain for cookies given without one (LINKEDIN_COOKIES, cookies.json)
+_LINKEDIN_HOST = urlsplit(LINKEDIN_URL).hostname or "www.linkedin.com"
+LINKEDIN_COOKIE_DOMAIN = (
+    f".{_LINKEDIN_HOST[4:]}" if _LINKEDIN_HOST.startswith("www.") else _LINKEDIN_HOST
+)
@@ -0,0 +1,406 @@
+"""
+LinkedIn Scraper - Daemon Module
+Keeps warm, logged-in browser contexts alive and serves scrape jobs over a
+local HTTP API (TCP or Unix socket)
+"""
+
+import time
+import uuid
+import json
+import asyncio
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from .config import (
+    DAEMON_HOST,
+    DAEMON_PORT,
+    DAEMON_QUEUE_SIZE,
+    DAEMON_SOCKET,
+    DAEMON_WORKERS,
+)
+from .logging import get_logger
+from .metrics import JOBS, JOBS_IN_PROGRESS, QUEUE_DEPTH, metrics_response
+from .tracing import current_trace_id, span
+from .pipeline import Prefetcher
+from .scrapers.linkedin import LinkedInScraper
+from .utils.http_server import HTTPServer, Request, Response, json_response
+
+logger = get_logger()
+
+JOB_TYPES = ("profile", "company")
+JOB_MODES = ("data", "html")
+FINISHED_STATES = ("done", "failed")
+# Finished jobs kept around for status/result lookups
+MAX_FINISHED_JOBS = 1000
+
+
+@dataclass
+class Job:
+    """A scrape job submitted to the daemon."""
+
+    type: str
+    name: str
+    mode: str = "data"
+    llm: bool = False
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = "queued"
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    trace_id: Optional[str] = None
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+    def to_dict(self):
+        """Status view of the job, without the result payload."""
+        return {
+            "id": self.id,
+            "type": self.type,
+            "name": self.name,
+            "mode": self.mode,
+            "llm": self.llm,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "trace_id": self.trace_id,
+        }
+
+    async def set_status(self, status, **fields):
+        """Update the job and wake up every stream waiting on it."""
+        async with self.changed:
+            self.status = status
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.changed.notify_all()
+
+
+async def run_job(scraper: LinkedInScraper, job: Job):
+    """
+    Run one job on a warm, logged-in scraper
+
+    Args:
+        scraper: Initialized LinkedInScraper
+        job: Job to run
+
+    Returns:
+        Scraped data, cleaned main HTML or LLM extraction result
+
+    Raises:
+        RuntimeError: The scraper reported an error instead of a result
+    """
+    if job.mode == "data":
+        if job.type == "profile":
+            result = await scraper.scrape_profile(job.name)
+        else:
+            result = await scraper.scrape_company(job.name)
+        if isinstance(result, dict) and "error" in result:
+            raise RuntimeError(result["error"])
+        return result
+
+    # Imported lazily so that data-only daemons never build the LLM client
+    from .main import extract_main_html
+    from .llm_extractor import extract_company, extract_profile
+
+    if job.type == "profile":
+        html = await scraper.scrape_profile_html(job.name)
+    else:
+        html = await scraper.scrape_company_html(job.name)
+    if not isinstance(html, str):
+        raise RuntimeError(html.get("error", "scrape failed"))
+
+    main_html = await asyncio.to_thread(extract_main_html, html)
+    if not job.llm:
+        return main_html
+    extract = extract_profile if job.type == "profile" else extract_company
+    return await asyncio.to_thread(extract, main_html)
+
+
+async def start_scrapers(count: int, headless=True, scraper_factory=LinkedInScraper):
+    """
+    Launch one browser with `count` logged-in scrapers sharing it
+
+    Args:
+        count: Number of scrapers (browser contexts)
+        headless: Run the browser headless
+        scraper_factory: Callable returning a LinkedInScraper-like object
+
+    Returns:
+        list: The scrapers, the browser owner first
+    """
+    scrapers = []
+    try:
+        for index in range(count):
+            scraper = scraper_factory(headless=headless)
+            # The first scraper launches Chromium, the others open contexts in
+            # it and start from the storage state the first login saved
+            shared = scrapers[0].browser if scrapers else None
+            await scraper.initialize_browser(browser=shared)
+            scrapers.append(scraper)
+            if not await scraper.login():
+                raise RuntimeError(f"Login failed for scraper {index}")
+    except BaseException:
+        # Shared contexts first, the browser owner last
+        for scraper in reversed(scrapers):
+            await scraper.cleanup()
+        raise
+    return scrapers
+
+
+class ScraperDaemon:
+    """
+    Pool of warm scrapers fed from a bounded job queue
+    """
+
+    def __init__(
+        self,
+        workers=DAEMON_WORKERS,
+        queue_size=DAEMON_QUEUE_SIZE,
+        headless=True,
+    ):
+        """
+        Initialize the daemon
+
+        Args:
+            workers: Number of browser contexts kept warm
+            queue_size: Jobs accepted beyond the busy workers before rejecting
+            headless: Run the browser headless
+        """
+        self.worker_count = workers
+        self.headless = headless
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.scrapers = []
+        self.busy = 0
+        self.prefetchers = []
+        self.worker_tasks = []
+        self.started_at = None
+        self.http = HTTPServer()
+        self.http.route("GET", "/health", self.handle_health)
+        self.http.route("GET", "/metrics", self.handle_metrics)
+        self.http.route("POST", "/jobs", self.handle_submit)
+        self.http.route("GET", "/jobs/{job_id}", self.handle_status)
+        self.http.route("GET", "/jobs/{job_id}/result", self.handle_result)
+        self.http.route("GET", "/jobs/{job_id}/stream", self.handle_stream)
+
+    async def start(self, host=DAEMON_HOST, port=DAEMON_PORT, socket_path=None):
+        """
+        Warm up the scrapers and start serving the job API
+
+        Args:
+            host: TCP host to bind
+            port: TCP port to bind
+            socket_path: Unix socket path, used instead of host/port when set
+        """
+        self.started_at = time.time()
+        QUEUE_DEPTH.set_function(self.queue.qsize)
+        self.scrapers = await start_scrapers(self.worker_count, self.headless)
+        for scraper in self.scrapers:
+            self.worker_tasks.append(asyncio.create_task(self._worker(scraper)))
+        logger.debug(f"Daemon warmed up {len(self.scrapers)} scraper(s)")
+
+        socket_path = socket_path or DAEMON_SOCKET
+        await self.http.start(host=host, port=port, socket_path=socket_path)
+        where = socket_path or f"http://{host}:{self.http.port}"
+        logger.debug(f"Daemon listening on {where}")
+
+    async def serve_forever(self, **kwargs):
+        """Start the daemon and block until cancelled."""
+        await self.start(**kwargs)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        """Stop serving, cancel workers and close the browser contexts."""
+        await self.http.close()
+        QUEUE_DEPTH.set_function(None)
+        for task in self.worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+        # Shared contexts first, the browser owner last
+        for scraper in reversed(self.scrapers):
+            await scraper.cleanup()
+        self.scrapers = []
+
+    def submit(self, job: Job) -> bool:
+        """
+        Queue a job without waiting
+
+        Returns:
+            bool: False when the queue is full and the job was rejected
+        """
+        # Prefetched jobs keep counting against the queue's capacity
+        if self.queue.maxsize and (
+            self.queue.qsize() + self.prefetched() >= self.queue.maxsize
+        ):
+            return False
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            return False
+        self.jobs[job.id] = job
+        self._prune_jobs()
+        return True
+
+    def prefetched(self) -> int:
+        """Jobs taken off the queue to load ahead on spare pages."""
+        return sum(len(prefetcher.ahead) for prefetcher in self.prefetchers)
+
+    async def _worker(self, scraper: LinkedInScraper):
+        prefetcher = Prefetcher(scraper)
+        self.prefetchers.append(prefetcher)
+        try:
+            while True:
+                job = prefetcher.next() or await self.queue.get()
+                # Jobs already waiting start loading on spare pages meanwhile
+                while prefetcher.wants_more() and not self.queue.empty():
+                    ahead = self.queue.get_nowait()
+                    await prefetcher.prefetch(ahead, ahead.type, ahead.name)
+                await self._run(scraper, job)
+        finally:
+            self.prefetchers.remove(prefetcher)
+            for job in prefetcher.held():
+                await job.set_status(
+                    "failed", error="daemon stopped", finished_at=time.time()
+                )
+                self.queue.task_done()
+            await prefetcher.close()
+
+    async def _run(self, scraper: LinkedInScraper, job: Job):
+        self.busy += 1
+        JOBS_IN_PROGRESS.inc()
+        try:
+            with span(
+                "job",
+                **{"job.id": job.id, "job.type": job.type, "job.mode": job.mode},
+                target=job.name,
+            ):
+                await job.set_status(
+                    "running", started_at=time.time(), trace_id=current_trace_id()
+                )
+                result = await run_job(scraper, job)
+            await job.set_status("done", result=result, finished_at=time.time())
+            JOBS.inc(type=job.type, status="done")
+        except asyncio.CancelledError:
+            await job.set_status(
+                "failed", error="daemon stopped", finished_at=time.time()
+            )
+            raise
+        except Exception as e:
+            logger.debug(f"Job {job.id} failed: {e}")
+            await job.set_status("failed", error=str(e), finished_at=time.time())
+            JOBS.inc(type=job.type, status="failed")
+        finally:
+            self.busy -= 1
+            JOBS_IN_PROGRESS.dec()
+            self.queue.task_done()
+
+    def _prune_jobs(self):
+        finished = [j.id for j in self.jobs.values() if j.status in FINISHED_STATES]
+        for job_id in finished[: max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def health(self):
+        """Current load and state of the daemon."""
+        ready = sum(1 for task in self.worker_tasks if not task.done())
+        return {
+            "status": "ok" if ready else "unavailable",
+            "uptime": time.time() - self.started_at if self.started_at else 0,
+            "workers": len(self.scrapers),
+            "workers_ready": ready,
+            "workers_busy": self.busy,
+            "prefetched": self.prefetched(),
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "saturated": self.queue.full(),
+            "jobs": dict(Counter(job.status for job in self.jobs.values())),
+        }
+
+    def _get_job(self, request: Request) -> Optional[Job]:
+        return self.jobs.get(request.params["job_id"])
+
+    async def handle_health(self, request: Request) -> Response:
+        health = self.health()
+        return json_response(health, status=200 if health["workers_ready"] else 503)
+
+    async def handle_metrics(self, request: Request) -> Response:
+        return await metrics_response()
+
+    async def handle_submit(self, request: Request) -> Response:
+        payload = request.json()
+        job_type = payload.get("type")
+        mode = payload.get("mode", "data")
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"type must be one of {JOB_TYPES}")
+        if mode not in JOB_MODES:
+            raise ValueError(f"mode must be one of {JOB_MODES}")
+        if not payload.get("name"):
+            raise ValueError("name is required")
+
+        job = Job(
+            type=job_type,
+            name=payload["name"],
+            mode=mode,
+            llm=bool(payload.get("llm", False)),
+        )
+        if not self.submit(job):
+            JOBS.inc(type=job.type, status="rejected")
+            # Backpressure: tell the caller to come back instead of queueing
+            return json_response(
+                {"error": "queue full", "queue_capacity": self.queue.maxsize},
+                status=429,
+                headers={"Retry-After": "1"},
+            )
+        return json_response(job.to_dict(), status=202)
+
+    async def handle_status(self, request: Request) -> Response:
+        job = self._get_job(request)
+        if job is None:
+            return json_response({"error": "unknown job"}, status=404)
+        return json_response(job.to_dict())
+
+    async def handle_result(self, request: Request) -> Response:
+        job = self._get_job(request)
+        if job is None:
+            return json_response({"error": "unknown job"}, status=404)
+        if job.status not in FINISHED_STATES:
+            return json_response(job.to_dict(), status=202)
+        return json_response(
+            {
+                "id": job.id,
+                "status": job.status,
+                "result": job.result,
+                "error": job.error,
+            }
+        )
+
+    async def handle_stream(self, request: Request) -> Response:
+        job = self._get_job(request)
+        if job is None:
+            return json_response({"error": "unknown job"}, status=404)
+
+        async def events():
+            # One NDJSON line per status change, the last one carries the result
+            last_status = None
+            while True:
+                async with job.changed:
+                    if job.status == last_status:
+                        await job.changed.wait()
+                    event = job.to_dict()
+                last_status = event["status"]
+                if last_status in FINISHED_STATES:
+                    event["result"] = job.result
+                yield (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+                if last_status in FINISHED_STATES:
+                    return
+
+        return Response(
+            status=200,
+            headers={"Content-Type": "application/x-ndjson"},
+            stream=events(),
+        )
@@ -0,0 +1,27 @@
+"""
+LinkedIn Scraper - Fetch Layer
+Ways of obtaining raw LinkedIn pages other than a full browser render
+"""
+
+from .base import FetchResult, Target
+from .http import HttpFetcher, is_complete
+from .tiers import ArchiveTier, BrowserTier, CacheTier, FetchTier, HttpTier
+from .validators import ValidatorStore, Validators, main_content_hash
+from .orchestrator import FetchOrchestrator, build_orchestrator
+
+__all__ = [
+    "FetchResult",
+    "Target",
+    "HttpFetcher",
+    "is_complete",
+    "FetchTier",
+    "ArchiveTier",
+    "CacheTier",
+    "HttpTier",
+    "BrowserTier",
+    "ValidatorStore",
+    "Validators",
+    "main_content_hash",
+    "FetchOrchestrator",
+    "build_orchestrator",
+]
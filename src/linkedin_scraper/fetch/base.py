@@ -0,0 +1,55 @@
+"""
+Shared types for the fetch layer
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Literal, Optional
+
+from ..config import LINKEDIN_URL
+from .validators import Validators
+
+TargetType = Literal["profile", "company"]
+
+
+@dataclass(frozen=True)
+class Target:
+    """A LinkedIn entity to fetch."""
+
+    type: TargetType
+    name: str
+
+    @property
+    def url(self) -> str:
+        """Public page URL of the target."""
+        if self.type == "profile":
+            return f"{LINKEDIN_URL}/in/{self.name}"
+        return f"{LINKEDIN_URL}/company/{self.name}/"
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used by caches and stores."""
+        return f"{self.type}:{self.name}"
+
+
+@dataclass
+class FetchResult:
+    """Raw page fetched for a target, whichever way it was obtained."""
+
+    target: Target
+    html: str
+    url: str
+    status: int = 200
+    headers: Dict[str, str] = field(default_factory=dict)
+    complete: bool = True
+    tier: Optional[str] = None
+    elapsed: float = 0.0
+    fetched_at: float = field(default_factory=time.time)
+    # Set when the target is known not to have changed since the last fetch;
+    # `html` is then empty and the page needs no further processing
+    unchanged: bool = False
+    # Hash of the first screen of a browser render, before scrolling
+    preview_hash: Optional[str] = None
+    # Validators describing this fetch, saved by FetchOrchestrator.commit()
+    # once the page has been processed
+    validators: Optional[Validators] = None
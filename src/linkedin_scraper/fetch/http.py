@@ -0,0 +1,231 @@
+"""
+Async HTTP fetch tier
+Fetches LinkedIn pages with the stored session cookies over one pooled
+client, and tells which responses still need a browser render
+"""
+
+import json
+import time
+import asyncio
+import importlib.util
+from pathlib import Path
+from typing import Optional
+
+import httpx
+from playwright.async_api import BrowserContext
+
+from ..config import (
+    COOKIES_PATH,
+    DEFAULT_TIMEOUT,
+    HTTP_CONCURRENCY,
+    HTTP_MAX_CONNECTIONS,
+    LINKEDIN_COOKIE_DOMAIN,
+    STORAGE_STATE_PATH,
+    USER_AGENT,
+)
+from ..logging import get_logger
+from .base import FetchResult, Target
+
+logger = get_logger()
+
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,"
+    "image/webp,image/apng,*/*;q=0.8,"
+    "application/signed-exchange;v=b3;q=0.9",
+    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6",
+}
+
+# Markup that only exists once the page content has been server-rendered;
+# LinkedIn's logged-in app shell ships without it and needs JavaScript
+COMPLETENESS_MARKERS = {
+    "profile": ("text-heading-xlarge", "pv-top-card", "top-card-layout__title"),
+    "company": ("org-top-card", "org-module-card", "top-card-layout__title"),
+}
+
+# Redirect targets meaning the session was not accepted
+AUTH_WALL_PATHS = ("/login", "/authwall", "/checkpoint", "/uas/login")
+
+
+def is_complete(target: Target, status: int, url: str, html: str) -> bool:
+    """
+    Check whether an HTTP response already holds the target's content
+
+    Args:
+        target: Fetched target
+        status: HTTP status code
+        url: Final URL after redirects
+        html: Response body
+
+    Returns:
+        bool: Whether the page can be used without a browser render
+    """
+    if status != 200 or not html:
+        return False
+    if any(path in url for path in AUTH_WALL_PATHS):
+        return False
+    if "<main" not in html:
+        return False
+    return any(marker in html for marker in COMPLETENESS_MARKERS[target.type])
+
+
+class HttpFetcher:
+    """
+    Pooled async HTTP client sharing its cookie jar with the browser session
+    """
+
+    def __init__(
+        self,
+        cookies_path=COOKIES_PATH,
+        storage_state_path=STORAGE_STATE_PATH,
+        concurrency=HTTP_CONCURRENCY,
+        max_connections=HTTP_MAX_CONNECTIONS,
+        timeout=DEFAULT_TIMEOUT / 1000,
+    ):
+        """
+        Initialize the HTTP fetcher
+
+        Args:
+            cookies_path: cookies.json written by the auth handler
+            storage_state_path: Playwright storage state, preferred when present
+            concurrency: Maximum requests in flight
+            max_connections: Connection pool size
+            timeout: Request timeout in seconds
+        """
+        self.cookies_path = cookies_path
+        self.storage_state_path = storage_state_path
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=60,
+        )
+        self.timeout = timeout
+        self.client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        """Create the shared client and load the cookie jar once."""
+        if self.client is not None:
+            return
+        self.client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            cookies=self.load_cookies(),
+            limits=self.limits,
+            timeout=self.timeout,
+            # HTTP/2 needs the optional h2 package (httpx[http2])
+            http2=importlib.util.find_spec("h2") is not None,
+            follow_redirects=True,
+        )
+
+    async def close(self):
+        """Close the shared client and its pooled connections."""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def load_cookies(self) -> httpx.Cookies:
+        """
+        Build the cookie jar from the saved session
+
+        Returns:
+            httpx.Cookies: Jar with the LinkedIn session cookies
+        """
+        cookies = []
+        try:
+            if Path(self.storage_state_path).exists():
+                with open(self.storage_state_path, "r") as f:
+                    cookies = json.load(f).get("cookies", [])
+            elif Path(self.cookies_path).exists():
+                with open(self.cookies_path, "r") as f:
+                    cookies = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Error loading cookies for HTTP fetcher: {e}")
+
+        jar = httpx.Cookies()
+        for cookie in cookies:
+            jar.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", LINKEDIN_COOKIE_DOMAIN),
+                path=cookie.get("path", "/"),
+            )
+        return jar
+
+    async def sync_from_context(self, context: BrowserContext):
+        """
+        Copy the browser's current cookies into the shared jar
+
+        Args:
+            context: Playwright browser context
+        """
+        await self.start()
+        for cookie in await context.cookies():
+            self.client.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie["domain"],
+                path=cookie.get("path", "/"),
+            )
+
+    async def sync_to_context(self, context: BrowserContext):
+        """
+        Push cookies refreshed by HTTP responses back into the browser
+
+        Args:
+            context: Playwright browser context
+        """
+        if self.client is None:
+            return
+        cookies = [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path or "/",
+            }
+            for cookie in self.client.cookies.jar
+        ]
+        if cookies:
+            await context.add_cookies(cookies)
+
+    async def fetch(self, target: Target, headers=None) -> FetchResult:
+        """
+        Fetch a target's page
+
+        Args:
+            target: Target to fetch
+            headers: Extra request headers
+
+        Returns:
+            FetchResult: Response, with `complete` False when it needs a render
+        """
+        await self.start()
+        async with self.semaphore:
+            start = time.perf_counter()
+            response = await self.client.get(target.url, headers=headers)
+            elapsed = time.perf_counter() - start
+
+        html = response.text
+        final_url = str(response.url)
+        complete = is_complete(target, response.status_code, final_url, html)
+        logger.debug(
+            f"HTTP {response.status_code} {target.url} in {elapsed:.2f}s "
+            f"({response.http_version}, complete={complete})"
+        )
+        return FetchResult(
+            target=target,
+            html=html,
+            url=final_url,
+            status=response.status_code,
+            headers=dict(response.headers),
+            complete=complete,
+            tier="http",
+            elapsed=elapsed,
+        )
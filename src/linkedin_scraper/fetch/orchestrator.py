@@ -0,0 +1,301 @@
+"""
+Fetch orchestrator
+Tries each tier in order, falls back when a tier misses or its result is
+not accepted, and records per-tier hit rates and latencies. With a
+validator store, targets still within their freshness TTL are skipped and
+the others are revalidated before being fetched again. A changed page only
+counts as checked once the caller has processed it and committed the result.
+Long-lived processes may also skip stale targets and revalidate them in the
+background, keeping a changed page for the next fetch of the target
+"""
+
+import copy
+import time
+import asyncio
+from collections import Counter, OrderedDict, deque
+from typing import Dict, List, Optional
+
+from ..config import FETCH_TIERS, REVALIDATE
+from ..logging import get_logger
+from ..metrics import CACHE_LOOKUPS, FETCH_ERRORS, PAGES_FETCHED, RETRIES
+from ..tracing import span
+from ..utils.stages import percentile
+from .base import FetchResult, Target
+from .http import HttpFetcher
+from .tiers import ArchiveTier, BrowserTier, CacheTier, FetchTier, HttpTier
+from .validators import (
+    FRESH,
+    STALE,
+    ValidatorStore,
+    Validators,
+    main_content_hash,
+)
+
+logger = get_logger()
+
+TIER_NAMES = ("archive", "cache", "http", "browser")
+
+# Latency samples kept per tier for percentiles
+MAX_SAMPLES = 10000
+# Changed pages found in the background and kept until their next fetch
+MAX_PENDING = 100
+
+
+class TierStats:
+    """Attempts, hits and latencies of one tier."""
+
+    def __init__(self):
+        self.attempts = 0
+        self.hits = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=MAX_SAMPLES)
+
+    def record(self, elapsed: float, hit: bool, failed: bool = False):
+        self.attempts += 1
+        self.hits += int(hit)
+        self.errors += int(failed)
+        self.latencies.append(elapsed)
+
+    def to_dict(self):
+        return {
+            "attempts": self.attempts,
+            "hits": self.hits,
+            "errors": self.errors,
+            "hit_rate": self.hits / self.attempts if self.attempts else 0.0,
+            "p50": percentile(self.latencies, 0.50),
+            "p95": percentile(self.latencies, 0.95),
+        }
+
+
+class FetchOrchestrator:
+    """
+    Serves targets from the cheapest tier that has an acceptable page
+    """
+
+    def __init__(
+        self,
+        tiers: List[FetchTier],
+        validators: Optional[ValidatorStore] = None,
+        serve_stale: bool = False,
+    ):
+        """
+        Initialize the orchestrator
+
+        Args:
+            tiers: Tiers ordered from cheapest to most expensive
+            validators: Validator store enabling freshness TTLs and
+                revalidation, every fetch goes through the tiers without one
+            serve_stale: Skip stale targets and revalidate them in the
+                background; only for long-lived processes, which fetch the
+                target again and get the changed page. Otherwise stale
+                targets are revalidated right away, like due ones
+        """
+        self.tiers = tiers
+        self.validators = validators
+        self.serve_stale = serve_stale
+        self.stats: Dict[str, TierStats] = {tier.name: TierStats() for tier in tiers}
+        self.revalidation = Counter()
+        self.background = set()
+        # Target key -> changed result of a background revalidation
+        self.pending: "OrderedDict[str, FetchResult]" = OrderedDict()
+
+    async def fetch(self, target: Target) -> Optional[FetchResult]:
+        """
+        Fetch a target through the tiers
+
+        Args:
+            target: Target to fetch
+
+        Returns:
+            FetchResult: Result of the first accepting tier, or None. The
+                result has `unchanged` set, and no HTML, when the target is
+                still fresh or did not change since it was last fetched;
+                otherwise pass it to commit() once it has been processed
+        """
+        if self.validators is None:
+            return await self._fetch_tiers(target, None)
+
+        pending = self.pending.pop(target.key, None)
+        if pending is not None:
+            self.revalidation["pending"] += 1
+            logger.debug(f"{target.key} changed, serving the background fetch")
+            return pending
+
+        known = self.validators.get(target.key)
+        state = self.validators.state(target.type, known)
+        if state == FRESH:
+            self.revalidation["fresh"] += 1
+            logger.debug(f"{target.key} is fresh, skipping")
+            return FetchResult(target=target, html="", url=target.url, unchanged=True)
+        if state == STALE and self.serve_stale:
+            # Skip it this time and find out in the background whether the
+            # next run has anything to do
+            self.revalidation["stale"] += 1
+            task = asyncio.create_task(self._revalidate_in_background(target, known))
+            self.background.add(task)
+            task.add_done_callback(self.background.discard)
+            logger.debug(f"{target.key} is stale, revalidating in the background")
+            return FetchResult(target=target, html="", url=target.url, unchanged=True)
+        return await self._revalidate(target, known)
+
+    async def _revalidate(
+        self, target: Target, known: Optional[Validators]
+    ) -> Optional[FetchResult]:
+        result = await self._fetch_tiers(target, known)
+        if result is not None:
+            result.validators = self._next_validators(result, known)
+            self.revalidation["unchanged" if result.unchanged else "changed"] += 1
+            if result.unchanged:
+                # Nothing left to process, the check itself is the outcome
+                self.commit(result)
+        return result
+
+    async def _revalidate_in_background(self, target: Target, known: Validators):
+        try:
+            result = await self._revalidate(target, known)
+            if result is not None and not result.unchanged:
+                # Nobody processes the new version now: the next fetch in
+                # this process gets it, and a later run finds it due
+                known.checked_at = 0.0
+                self.validators.save(known)
+                self.pending[target.key] = result
+                while len(self.pending) > MAX_PENDING:
+                    self.pending.popitem(last=False)
+        except Exception as e:
+            logger.debug(f"Background revalidation of {target.key} failed: {e}")
+
+    async def _fetch_tiers(
+        self, target: Target, known: Optional[Validators]
+    ) -> Optional[FetchResult]:
+        for index, tier in enumerate(self.tiers):
+            if known is not None and tier.local:
+                continue
+            start = time.perf_counter()
+            failed = False
+            try:
+                with span(f"fetch.{tier.name}", target=target.key):
+                    if known is not None:
+                        result = await tier.revalidate(target, known)
+                    else:
+                        result = await tier.fetch(target)
+            except Exception as e:
+                logger.debug(f"Tier {tier.name} failed for {target.key}: {e}")
+                result, failed = None, True
+            accepted = result is not None and (result.unchanged or tier.accept(result))
+            elapsed = time.perf_counter() - start
+            self.stats[tier.name].record(elapsed, accepted, failed)
+            if failed:
+                FETCH_ERRORS.inc(tier=tier.name)
+            if tier.local:
+                CACHE_LOOKUPS.inc(tier=tier.name, result="hit" if accepted else "miss")
+
+            if accepted:
+                PAGES_FETCHED.inc(tier=tier.name)
+                result.tier = tier.name
+                result.elapsed = elapsed
+                logger.debug(f"{target.key} served by {tier.name} in {elapsed:.2f}s")
+                if not result.unchanged:
+                    # Let the cheaper tiers keep it for next time
+                    for cheaper in self.tiers[:index]:
+                        await cheaper.store(result)
+                return result
+            if index < len(self.tiers) - 1:
+                RETRIES.inc(tier=tier.name)
+
+        logger.debug(f"No tier could serve {target.key}")
+        return None
+
+    def _next_validators(
+        self, result: FetchResult, known: Optional[Validators]
+    ) -> Validators:
+        now = time.time()
+        validators = copy.copy(known) if known else Validators(key=result.target.key)
+        if not result.unchanged:
+            content_hash = main_content_hash(result.html)
+            # A full fetch whose main region reads the same is unchanged too
+            if known is not None and known.content_hash == content_hash:
+                result.unchanged = True
+            else:
+                validators.changed_at = now
+            validators.content_hash = content_hash
+            validators.etag = result.headers.get("etag")
+            validators.last_modified = result.headers.get("last-modified")
+        if result.preview_hash:
+            validators.preview_hash = result.preview_hash
+        validators.checked_at = now
+        return validators
+
+    def commit(self, result: FetchResult):
+        """
+        Save a fetched result's validators once the page has been processed
+
+        Until then the target stays due, so a page whose extraction failed
+        is fetched again on the next run instead of being taken as fresh.
+
+        Args:
+            result: Result returned by fetch()
+        """
+        if self.validators is not None and result.validators is not None:
+            self.validators.save(result.validators)
+            result.validators = None
+
+    def report(self):
+        """Per-tier statistics, in tier order, plus revalidation outcomes."""
+        report = {name: stats.to_dict() for name, stats in self.stats.items()}
+        if self.validators is not None:
+            report["revalidation"] = dict(self.revalidation)
+        return report
+
+    async def close(self):
+        """Finish background revalidations, then close every tier."""
+        await asyncio.gather(*self.background, return_exceptions=True)
+        for tier in self.tiers:
+            await tier.close()
+        if self.validators is not None:
+            self.validators.close()
+
+
+def _archive_tier() -> FetchTier:
+    from ..storage.archive import open_archive
+
+    archive = open_archive()
+    if archive is None:
+        # Without zstandard, keep plain HTML files rather than nothing
+        return CacheTier()
+    return ArchiveTier(archive)
+
+
+def build_orchestrator(
+    tiers=FETCH_TIERS, headless=True, revalidate=REVALIDATE, serve_stale=False
+) -> FetchOrchestrator:
+    """
+    Build an orchestrator from tier names
+
+    Args:
+        tiers: Comma separated tier names, e.g. "archive,http,browser"
+        headless: Run the browser headless if the browser tier launches one
+        revalidate: Skip fresh targets and revalidate stale ones
+        serve_stale: Revalidate stale targets in the background, see
+            FetchOrchestrator
+
+    Returns:
+        FetchOrchestrator: Orchestrator with the requested tiers
+    """
+    names = [name.strip() for name in tiers.split(",") if name.strip()]
+    unknown = [name for name in names if name not in TIER_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown fetch tiers: {', '.join(unknown)}")
+
+    # The HTTP and browser tiers share one session, in both directions
+    fetcher = HttpFetcher() if "http" in names else None
+    browser = BrowserTier(headless=headless, http=fetcher)
+    built = {
+        "archive": _archive_tier,
+        "cache": CacheTier,
+        "http": lambda: HttpTier(fetcher, browser=browser),
+        "browser": lambda: browser,
+    }
+    validators = ValidatorStore() if revalidate else None
+    return FetchOrchestrator(
+        [built[name]() for name in names], validators, serve_stale=serve_stale
+    )
@@ -0,0 +1,304 @@
+"""
+Fetch tiers, from cheapest to most expensive: local HTML cache, plain
+HTTP request, full browser render
+"""
+
+import os
+import time
+import asyncio
+from typing import Optional
+
+from ..config import HTML_CACHE_DIR, HTML_CACHE_TTL
+from ..logging import get_logger
+from ..storage.archive import STRUCTURED_TIER
+from .base import FetchResult, Target
+from .http import HttpFetcher
+from .validators import Validators, main_content_hash
+
+logger = get_logger()
+
+
+class FetchTier:
+    """
+    One way of obtaining a page. Subclasses implement fetch() and may narrow
+    accept(); store() lets cheaper tiers keep what a later tier fetched.
+    """
+
+    name = "tier"
+    # Local tiers only hold copies of earlier fetches and are skipped when a
+    # target is being revalidated against the site
+    local = False
+
+    async def fetch(self, target: Target) -> Optional[FetchResult]:
+        """Fetch the target, or return None when this tier has nothing."""
+        raise NotImplementedError
+
+    async def revalidate(
+        self, target: Target, validators: Validators
+    ) -> Optional[FetchResult]:
+        """
+        Fetch a target fetched before; tiers that can tell the page did not
+        change cheaply return a result with `unchanged` set
+        """
+        return await self.fetch(target)
+
+    def accept(self, result: FetchResult) -> bool:
+        """Whether a fetched result is good enough to stop here."""
+        return result.complete and bool(result.html)
+
+    async def store(self, result: FetchResult) -> None:
+        """Keep a result served by a more expensive tier."""
+
+    async def close(self) -> None:
+        """Release the tier's resources."""
+
+
+class CacheTier(FetchTier):
+    """
+    Raw HTML kept on disk per target, valid for a maximum age
+    """
+
+    name = "cache"
+    local = True
+
+    def __init__(self, cache_dir=HTML_CACHE_DIR, max_age=HTML_CACHE_TTL):
+        """
+        Initialize the cache tier
+
+        Args:
+            cache_dir: Directory holding cached pages
+            max_age: Seconds a cached page is served
+        """
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+
+    def _path(self, target: Target):
+        return os.path.join(self.cache_dir, target.type, f"{target.name}.html")
+
+    def _read(self, path):
+        fetched_at = os.path.getmtime(path)
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read(), fetched_at
+
+    def _write(self, path, html):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(html)
+        os.replace(tmp_path, path)
+
+    async def fetch(self, target: Target) -> Optional[FetchResult]:
+        try:
+            html, fetched_at = await asyncio.to_thread(self._read, self._path(target))
+        except OSError:
+            return None
+        return FetchResult(
+            target=target, html=html, url=target.url, fetched_at=fetched_at
+        )
+
+    def accept(self, result: FetchResult) -> bool:
+        fresh = time.time() - result.fetched_at < self.max_age
+        return fresh and super().accept(result)
+
+    async def store(self, result: FetchResult) -> None:
+        await asyncio.to_thread(self._write, self._path(result.target), result.html)
+
+
+class ArchiveTier(FetchTier):
+    """
+    Cache backed by the compressed HTML archive; every page fetched by a
+    later tier is archived, and the newest one is served while fresh
+    """
+
+    name = "archive"
+    local = True
+
+    def __init__(self, archive=None, max_age=HTML_CACHE_TTL):
+        """
+        Initialize the archive tier
+
+        Args:
+            archive: HtmlArchive to use, one is opened when omitted
+            max_age: Seconds an archived page is served
+        """
+        if archive is None:
+            from ..storage.archive import HtmlArchive
+
+            archive = HtmlArchive()
+        self.archive = archive
+        self.max_age = max_age
+
+    async def fetch(self, target: Target) -> Optional[FetchResult]:
+        # Pages of structured scrapes were never fully scrolled
+        page = await asyncio.to_thread(
+            self.archive.latest,
+            target.type,
+            target.name,
+            exclude_tiers=(STRUCTURED_TIER,),
+        )
+        if page is None:
+            return None
+        html = await asyncio.to_thread(self.archive.get, page.sha256)
+        return FetchResult(
+            target=target,
+            html=html,
+            url=page.url or target.url,
+            fetched_at=page.fetched_at,
+        )
+
+    def accept(self, result: FetchResult) -> bool:
+        fresh = time.time() - result.fetched_at < self.max_age
+        return fresh and super().accept(result)
+
+    async def store(self, result: FetchResult) -> None:
+        await asyncio.to_thread(
+            self.archive.put,
+            result.target.type,
+            result.target.name,
+            result.html,
+            url=result.url,
+            tier=result.tier,
+            fetched_at=result.fetched_at,
+        )
+
+    async def close(self) -> None:
+        self.archive.close()
+
+
+class HttpTier(FetchTier):
+    """
+    Plain HTTP request with the stored session cookies
+    """
+
+    name = "http"
+
+    def __init__(self, fetcher: Optional[HttpFetcher] = None, browser=None):
+        """
+        Initialize the HTTP tier
+
+        Args:
+            fetcher: Shared HttpFetcher, one is created when omitted
+            browser: BrowserTier sharing the session; cookies refreshed by
+                HTTP responses are pushed into its context
+        """
+        self.fetcher = fetcher or HttpFetcher()
+        self.browser = browser
+
+    async def fetch(self, target: Target) -> Optional[FetchResult]:
+        result = await self.fetcher.fetch(target)
+        await self._sync_browser(result)
+        return result
+
+    async def revalidate(
+        self, target: Target, validators: Validators
+    ) -> Optional[FetchResult]:
+        result = await self.fetcher.fetch(
+            target, headers=validators.conditional_headers()
+        )
+        await self._sync_browser(result)
+        if result.status == 304:
+            result.unchanged = True
+        return result
+
+    async def _sync_browser(self, result: FetchResult):
+        scraper = self.browser.scraper if self.browser is not None else None
+        if scraper is None or "set-cookie" not in result.headers:
+            return
+        try:
+            await self.fetcher.sync_to_context(scraper.context)
+        except Exception as e:
+            logger.debug(f"Error pushing HTTP cookies to the browser: {e}")
+
+    async def close(self) -> None:
+        await self.fetcher.close()
+
+
+class BrowserTier(FetchTier):
+    """
+    Full Playwright render; the browser is only launched on first use
+    """
+
+    name = "browser"
+
+    def __init__(self, scraper=None, headless=True, http=None):
+        """
+        Initialize the browser tier
+
+        Args:
+            scraper: Initialized and logged-in LinkedInScraper to reuse
+            headless: Run the browser headless when launching one
+            http: HttpFetcher whose cookie jar follows the browser session,
+                so that later HTTP fetches go out logged in
+        """
+        self.scraper = scraper
+        self.owns_scraper = scraper is None
+        self.headless = headless
+        self.http = http
+
+    async def _get_scraper(self):
+        if self.scraper is None:
+            from ..scrapers.linkedin import LinkedInScraper
+
+            scraper = LinkedInScraper(headless=self.headless)
+            await scraper.initialize_browser()
+            if not await scraper.login():
+                await scraper.cleanup()
+                raise RuntimeError("Login failed, browser tier unavailable")
+            self.scraper = scraper
+            # Logged in or restored: the HTTP tier can use the session now
+            await self._sync_http()
+        return self.scraper
+
+    async def _sync_http(self):
+        if self.http is None or self.scraper is None:
+            return
+        try:
+            await self.http.sync_from_context(self.scraper.context)
+        except Exception as e:
+            logger.debug(f"Error copying browser cookies to HTTP: {e}")
+
+    async def fetch(self, target: Target) -> Optional[FetchResult]:
+        return await self._render(target, None)
+
+    async def revalidate(
+        self, target: Target, validators: Validators
+    ) -> Optional[FetchResult]:
+        return await self._render(target, validators.preview_hash)
+
+    async def _render(self, target: Target, known_preview: Optional[str]):
+        scraper = await self._get_scraper()
+        preview = {}
+
+        def is_unchanged(html):
+            # Called on the first screen, before the scraper starts scrolling
+            preview["hash"] = main_content_hash(html)
+            return known_preview is not None and preview["hash"] == known_preview
+
+        if target.type == "profile":
+            html = await scraper.scrape_profile_html(target.name, is_unchanged)
+        else:
+            html = await scraper.scrape_company_html(target.name, is_unchanged)
+        # Renders refresh session cookies; keep the HTTP jar up to date
+        await self._sync_http()
+        if html is None:
+            return FetchResult(
+                target=target,
+                html="",
+                url=scraper.page.url,
+                unchanged=True,
+                preview_hash=preview.get("hash"),
+            )
+        if not isinstance(html, str):
+            logger.debug(f"Browser tier failed for {target.key}: {html}")
+            return None
+        return FetchResult(
+            target=target,
+            html=html,
+            url=scraper.page.url,
+            preview_hash=preview.get("hash"),
+        )
+
+    async def close(self) -> None:
+        if self.scraper is not None and self.owns_scraper:
+            await self.scraper.cleanup()
+            self.scraper = None
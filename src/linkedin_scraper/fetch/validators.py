@@ -0,0 +1,187 @@
+"""
+Revalidation state per target
+Keeps HTTP validators (ETag, Last-Modified) and a hash of the scoped main
+region, and decides when a target is fresh, stale-but-usable or due
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from ..config import (
+    FRESHNESS_TTL_COMPANY,
+    FRESHNESS_TTL_PROFILE,
+    STALE_WHILE_REVALIDATE,
+    VALIDATORS_PATH,
+)
+
+MAIN_RE = re.compile(r"<main\b.*?</main>", re.S | re.I)
+NON_CONTENT_RE = re.compile(r"<(script|style|code|template)\b.*?</\1>", re.S | re.I)
+TAG_RE = re.compile(r"<[^>]+>")
+
+FRESH = "fresh"
+STALE = "stale"  # past its TTL but within the stale-while-revalidate window
+DUE = "due"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS validators (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    preview_hash TEXT,
+    checked_at REAL NOT NULL,
+    changed_at REAL NOT NULL
+)
+"""
+
+
+def main_content_hash(html: str) -> str:
+    """
+    Hash the visible text of a page's <main> region
+
+    Markup churn (ember ids, tracking attributes, inline scripts) does not
+    change the hash, only the text a reader would see does.
+
+    Args:
+        html: Page HTML
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    match = MAIN_RE.search(html)
+    region = match.group(0) if match else html
+    region = NON_CONTENT_RE.sub(" ", region)
+    text = " ".join(TAG_RE.sub(" ", region).split())
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Validators:
+    """Stored validators of one target."""
+
+    key: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    preview_hash: Optional[str] = None
+    checked_at: float = 0.0
+    changed_at: float = 0.0
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that turn a GET into a conditional request."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ValidatorStore:
+    """
+    SQLite-backed validators with per-entity freshness TTLs
+    """
+
+    def __init__(
+        self,
+        path=VALIDATORS_PATH,
+        ttls=None,
+        stale_while_revalidate=STALE_WHILE_REVALIDATE,
+    ):
+        """
+        Initialize the validator store
+
+        Args:
+            path: SQLite database path
+            ttls: Seconds a target stays fresh, per target type
+            stale_while_revalidate: Seconds past the TTL during which the
+                target is skipped while being revalidated in the background
+        """
+        self.ttls = ttls or {
+            "profile": FRESHNESS_TTL_PROFILE,
+            "company": FRESHNESS_TTL_COMPANY,
+        }
+        self.stale_while_revalidate = stale_while_revalidate
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(SCHEMA)
+        self.db.commit()
+
+    def get(self, key: str) -> Optional[Validators]:
+        """Stored validators of a target, if it was fetched before."""
+        row = self.db.execute(
+            "SELECT key, etag, last_modified, content_hash, preview_hash, "
+            "checked_at, changed_at FROM validators WHERE key = ?",
+            (key,),
+        ).fetchone()
+        return Validators(*row) if row else None
+
+    def state(self, target_type: str, validators: Optional[Validators]) -> str:
+        """
+        Classify a target as fresh, stale or due for a fetch
+
+        Args:
+            target_type: "profile" or "company"
+            validators: Stored validators, None if never fetched
+
+        Returns:
+            str: FRESH, STALE or DUE
+        """
+        if validators is None:
+            return DUE
+        age = time.time() - validators.checked_at
+        ttl = self.ttls.get(target_type, 0)
+        if age < ttl:
+            return FRESH
+        if age < ttl + self.stale_while_revalidate:
+            return STALE
+        return DUE
+
+    def save(self, validators: Validators):
+        """Insert or replace a target's validators."""
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO validators VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    validators.key,
+                    validators.etag,
+                    validators.last_modified,
+                    validators.content_hash,
+                    validators.preview_hash,
+                    validators.checked_at,
+                    validators.changed_at,
+                ),
+            )
+            self.db.commit()
+
+    def checked(self, key: str, content_hash: str) -> Validators:
+        """
+        Record a check of a target that has no HTTP validators, such as a
+        structured browser scrape
+
+        Args:
+            key: Target key
+            content_hash: Hash of what the check found
+
+        Returns:
+            Validators: The saved validators
+        """
+        now = time.time()
+        validators = self.get(key) or Validators(key=key)
+        if validators.content_hash != content_hash:
+            validators.changed_at = now
+        validators.content_hash = content_hash
+        validators.checked_at = now
+        self.save(validators)
+        return validators
+
+    def close(self):
+        """Close the database."""
+        self.db.close()
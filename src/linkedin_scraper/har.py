@@ -0,0 +1,113 @@
+"""
+LinkedIn Scraper - HAR Record/Replay Module
+Records the network traffic of each scrape job to a HAR file, and serves
+later runs from those files so the Playwright path can run offline
+"""
+
+import os
+import re
+import random
+import asyncio
+
+from playwright.async_api import BrowserContext, Route
+
+from .config import HAR_DIR, HAR_LATENCY, HAR_LATENCY_JITTER, HAR_MODE
+from .logging import get_logger
+
+logger = get_logger()
+
+HAR_MODES = ("off", "record", "replay")
+
+
+def job_slug(job_name: str) -> str:
+    """File-system safe name for a job, e.g. `profile_jane-doe`."""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", job_name).strip("_") or "job"
+
+
+class HarSession:
+    """
+    Record or replay mode shared by every job of a scraper
+    """
+
+    def __init__(
+        self,
+        mode=HAR_MODE,
+        har_dir=HAR_DIR,
+        latency=HAR_LATENCY,
+        jitter=HAR_LATENCY_JITTER,
+    ):
+        """
+        Initialize the HAR session
+
+        Args:
+            mode: "off", "record" or "replay"
+            har_dir: Directory holding one HAR archive per job
+            latency: Delay added to every replayed request (milliseconds)
+            jitter: Random extra delay of up to this many milliseconds
+        """
+        if mode not in HAR_MODES:
+            raise ValueError(f"HAR mode must be one of {HAR_MODES}, got {mode!r}")
+        self.mode = mode
+        self.har_dir = har_dir
+        self.latency = latency
+        self.jitter = jitter
+
+    @property
+    def enabled(self) -> bool:
+        """Whether jobs run in their own recording or replaying context."""
+        return self.mode != "off"
+
+    def path(self, job_name: str) -> str:
+        """HAR archive of a job; zipped so bodies are stored as separate files."""
+        return os.path.join(self.har_dir, f"{job_slug(job_name)}.har.zip")
+
+    def context_options(self, job_name: str) -> dict:
+        """
+        Extra new_context() options for a job's context
+
+        Args:
+            job_name: Job identifier
+
+        Returns:
+            dict: record_har_* options in record mode, nothing otherwise
+        """
+        if self.mode != "record":
+            return {}
+        os.makedirs(self.har_dir, exist_ok=True)
+        return {
+            "record_har_path": self.path(job_name),
+            "record_har_content": "attach",
+            "record_har_mode": "minimal",
+        }
+
+    async def attach(self, context: BrowserContext, job_name: str):
+        """
+        Serve a job's context from its recorded HAR in replay mode
+
+        Args:
+            context: The job's browser context
+            job_name: Job identifier
+        """
+        if self.mode != "replay":
+            return
+        path = self.path(job_name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"No HAR recorded for {job_name} ({path}), run it with "
+                f"HAR_MODE=record first"
+            )
+        # Anything missing from the recording fails instead of going online
+        await context.route_from_har(path, not_found="abort")
+        if self.latency or self.jitter:
+            # Routes registered later run first; delay, then let the HAR answer
+            await context.route("**/*", self._delay)
+        logger.debug(f"Replaying {job_name} from {path}")
+
+    def delay(self) -> float:
+        """Seconds to hold back one replayed request."""
+        return (self.latency + random.uniform(0, self.jitter)) / 1000
+
+    async def _delay(self, route: Route):
+        await asyncio.sleep(self.delay())
+        await route.fallback()
+
@@ -0,0 +1,53 @@
+"""
+LinkedIn Scraper - Job Queues
+Backlogs of scrape jobs with visibility timeouts, acknowledgements and dead
+letters, in memory, in SQLite (one host) or in Redis (several hosts), so
+scraper nodes can work through one shared backlog without double work
+"""
+
+from urllib.parse import parse_qs, urlsplit
+
+from ..config import QUEUE_URL
+from .base import JobQueue, QueuedJob, job_id
+from .memory import MemoryQueue
+from .sqlite import SqliteQueue
+from .consumer import QueueConsumer, consume
+
+
+def open_queue(url: str = QUEUE_URL, **kwargs) -> JobQueue:
+    """
+    Open a queue from a URL
+
+    Args:
+        url: `memory://`, `sqlite:///path/to/jobs.sqlite` (or
+            `sqlite://relative/path`), or `redis://host:port/db`, optionally
+            with `?prefix=` naming the backlog
+        kwargs: visibility_timeout and max_attempts, see JobQueue
+
+    Returns:
+        JobQueue: The queue
+    """
+    parts = urlsplit(url)
+    if parts.scheme == "memory":
+        return MemoryQueue(**kwargs)
+    if parts.scheme == "sqlite":
+        return SqliteQueue(path=parts.netloc + parts.path, **kwargs)
+    if parts.scheme in ("redis", "rediss", "unix"):
+        from .redis import DEFAULT_PREFIX, RedisQueue
+
+        prefix = parse_qs(parts.query).get("prefix", [DEFAULT_PREFIX])[0]
+        url = parts._replace(query="").geturl()
+        return RedisQueue(url=url, prefix=prefix, **kwargs)
+    raise ValueError(f"Unsupported queue URL: {url}")
+
+
+__all__ = [
+    "JobQueue",
+    "QueuedJob",
+    "job_id",
+    "MemoryQueue",
+    "SqliteQueue",
+    "QueueConsumer",
+    "consume",
+    "open_queue",
+]
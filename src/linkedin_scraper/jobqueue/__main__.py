@@ -0,0 +1,98 @@
+"""
+Command line for the shared job queue
+
+    python -m src.linkedin_scraper.jobqueue enqueue --profile --names names.txt
+    python -m src.linkedin_scraper.jobqueue work --workers 2 --output results.jsonl
+    python -m src.linkedin_scraper.jobqueue stats
+"""
+
+import json
+import asyncio
+import argparse
+
+from ..config import QUEUE_URL
+from . import open_queue
+from .consumer import consume
+
+
+def read_names(path: str):
+    """Target names from a file, one per line, # comments ignored."""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = (line.split("#", 1)[0].strip() for line in f)
+        return [line for line in lines if line]
+
+
+async def run(args):
+    queue = open_queue(args.queue)
+    try:
+        if args.command == "enqueue":
+            target_type = "profile" if args.profile else "company"
+            payloads = [
+                {"type": target_type, "name": name, "mode": args.mode, "llm": args.llm}
+                for name in read_names(args.names)
+            ]
+            added = await queue.put(payloads)
+            print(f"Enqueued {added} of {len(payloads)} jobs")
+        elif args.command == "work":
+            output = open(args.output, "a", encoding="utf-8") if args.output else None
+
+            def on_result(job, status, result, error):
+                print(f"{status:6} {job.id} (attempt {job.attempts})")
+                if output is not None and status == "done":
+                    record = {"id": job.id, **job.payload, "result": result}
+                    output.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+            try:
+                summary = await consume(
+                    queue,
+                    workers=args.workers,
+                    headless=not args.headful,
+                    drain=args.drain,
+                    on_result=on_result,
+                )
+            finally:
+                if output is not None:
+                    output.close()
+            print(json.dumps(summary, indent=2))
+        elif args.command == "stats":
+            print(json.dumps(await queue.stats(), indent=2))
+        elif args.command == "dead":
+            for job in await queue.dead_letters():
+                print(
+                    json.dumps({"id": job.id, "attempts": job.attempts, **job.payload})
+                )
+    finally:
+        await queue.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared scrape job queue")
+    parser.add_argument("--queue", default=QUEUE_URL, help="Queue URL")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="Add targets to the backlog")
+    group = enqueue.add_mutually_exclusive_group(required=True)
+    group.add_argument("--profile", action="store_true")
+    group.add_argument("--company", action="store_true")
+    enqueue.add_argument("--names", required=True, help="File with one name per line")
+    enqueue.add_argument("--mode", choices=("data", "html"), default="data")
+    enqueue.add_argument("--llm", action="store_true")
+
+    work = commands.add_parser("work", help="Run scrapers against the backlog")
+    work.add_argument("--workers", type=int, default=2)
+    work.add_argument("--headful", action="store_true")
+    work.add_argument("--drain", action="store_true", help="Exit when nothing is left")
+    work.add_argument("--output", help="JSON lines file for results")
+
+    commands.add_parser("stats", help="Pending, in-flight and dead job counts")
+    commands.add_parser("dead", help="List dead-lettered jobs")
+
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
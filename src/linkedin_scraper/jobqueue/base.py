@@ -0,0 +1,138 @@
+"""
+Queue interface shared by the job queue backends
+"""
+
+import abc
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from ..config import QUEUE_MAX_ATTEMPTS, QUEUE_VISIBILITY_TIMEOUT
+
+
+@dataclass
+class QueuedJob:
+    """A job as stored in a queue."""
+
+    id: str
+    payload: dict
+    attempts: int = 0
+    enqueued_at: float = field(default_factory=time.time)
+    # Token of the claim that handed the job out, required by ack/nack
+    lease: str = ""
+
+
+def new_lease() -> str:
+    """Random token identifying one claim of a job."""
+    return uuid.uuid4().hex
+
+
+def job_id(payload: dict) -> str:
+    """
+    Default job ID, e.g. `profile:jane-doe:data` or `company:acme:html+llm`
+
+    Deriving the ID from the target and what is asked of it means nodes
+    seeding the same backlog enqueue each job once, while a data job and an
+    HTML or LLM job for the same target stay separate.
+    """
+    mode = payload.get("mode", "data")
+    if payload.get("llm"):
+        mode += "+llm"
+    return f"{payload['type']}:{payload['name']}:{mode}"
+
+
+class JobQueue(abc.ABC):
+    """
+    Backlog of jobs claimed with a visibility timeout
+
+    A claimed job is invisible to other consumers until it is acknowledged,
+    released with nack(), or its visibility timeout runs out, after which
+    it is handed out again. A job claimed `max_attempts` times without an
+    ack is moved to the dead letters instead. Delivery is at least once.
+
+    Every claim hands out a new lease token. ack() and nack() only act on
+    jobs whose lease is still current, so a consumer that overran its
+    visibility timeout cannot remove or release a job another consumer has
+    claimed since.
+    """
+
+    def __init__(
+        self,
+        visibility_timeout=QUEUE_VISIBILITY_TIMEOUT,
+        max_attempts=QUEUE_MAX_ATTEMPTS,
+    ):
+        """
+        Initialize the queue
+
+        Args:
+            visibility_timeout: Seconds a claimed job stays invisible
+            max_attempts: Claims before a job is dead-lettered
+        """
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+
+    @abc.abstractmethod
+    async def put(self, payloads: Iterable[dict], ids: Optional[List[str]] = None):
+        """
+        Enqueue jobs; jobs whose ID is already queued are skipped
+
+        Args:
+            payloads: Job payloads, with at least `type` and `name`
+            ids: Job IDs, derived from the payloads by default
+
+        Returns:
+            int: Number of jobs added
+        """
+
+    @abc.abstractmethod
+    async def claim(
+        self, count: int = 1, visibility_timeout: Optional[float] = None
+    ) -> List[QueuedJob]:
+        """
+        Claim up to `count` visible jobs
+
+        Args:
+            count: Batch size
+            visibility_timeout: Overrides the queue's timeout for this claim
+
+        Returns:
+            list: Claimed jobs with their lease, possibly fewer than `count`
+                or none
+        """
+
+    @abc.abstractmethod
+    async def ack(self, jobs: Iterable[QueuedJob]) -> int:
+        """
+        Remove finished jobs
+
+        Args:
+            jobs: Jobs as returned by claim()
+
+        Returns:
+            int: Jobs removed; jobs whose lease was superseded are left alone
+        """
+
+    @abc.abstractmethod
+    async def nack(self, jobs: Iterable[QueuedJob], delay: float = 0) -> int:
+        """
+        Make claimed jobs visible again after `delay` seconds
+
+        Args:
+            jobs: Jobs as returned by claim()
+            delay: Seconds before the jobs can be claimed again
+
+        Returns:
+            int: Jobs released; jobs whose lease was superseded are left alone
+        """
+
+    @abc.abstractmethod
+    async def dead_letters(self) -> List[QueuedJob]:
+        """Jobs that ran out of attempts."""
+
+    @abc.abstractmethod
+    async def stats(self) -> Dict[str, int]:
+        """Counts of pending (visible), in-flight and dead jobs."""
+
+    async def close(self):
+        """Release connections."""
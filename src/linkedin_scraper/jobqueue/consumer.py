@@ -0,0 +1,207 @@
+"""
+Runs warm scrapers against a shared job queue
+"""
+
+import asyncio
+import time
+from typing import Callable, List, Optional
+
+from ..config import QUEUE_BATCH_SIZE, QUEUE_RETRY_DELAY
+from ..logging import get_logger
+from ..metrics import JOBS
+from ..tracing import span
+from .base import JobQueue, QueuedJob
+
+logger = get_logger()
+
+# Seconds between claims while the queue has nothing visible
+IDLE_INTERVAL = 2.0
+# Seconds acknowledgements are held back to be sent in one batch
+ACK_INTERVAL = 1.0
+
+
+class QueueConsumer:
+    """
+    Claims jobs in batches for a pool of scrapers and acknowledges them
+
+    Failed jobs are released with a delay and retried by whichever node
+    claims them next, until the queue dead-letters them.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        scrapers: List,
+        batch_size=QUEUE_BATCH_SIZE,
+        retry_delay=QUEUE_RETRY_DELAY,
+        on_result: Optional[
+            Callable[[QueuedJob, str, object, Optional[str]], None]
+        ] = None,
+    ):
+        """
+        Initialize the consumer
+
+        Args:
+            queue: Shared job queue
+            scrapers: Initialized, logged-in scrapers, one job each at a time
+            batch_size: Most jobs claimed or acknowledged in one round trip
+            retry_delay: Seconds before a failed job becomes visible again
+            on_result: Called with (job, status, result, error) per job
+        """
+        self.queue = queue
+        self.scrapers = scrapers
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.on_result = on_result
+        self.claimed: asyncio.Queue = asyncio.Queue()
+        self.acks: List[QueuedJob] = []
+        self.running = 0
+        self.done = 0
+        self.failed = 0
+
+    async def _claim_loop(self, drain: bool):
+        while True:
+            free = len(self.scrapers) - self.running - self.claimed.qsize()
+            if free <= 0:
+                await asyncio.sleep(0.05)
+                continue
+            jobs = await self.queue.claim(min(free, self.batch_size))
+            for job in jobs:
+                self.claimed.put_nowait(job)
+            if jobs:
+                continue
+            if drain and not self.running and self.claimed.empty():
+                # Nothing visible and nothing running: the backlog is done,
+                # apart from jobs other nodes hold or delayed retries
+                return
+            await asyncio.sleep(IDLE_INTERVAL)
+
+    async def _ack_loop(self):
+        while True:
+            await asyncio.sleep(ACK_INTERVAL)
+            await self.flush_acks()
+
+    async def flush_acks(self):
+        """Acknowledge finished jobs in one batch."""
+        if self.acks:
+            batch, self.acks = self.acks, []
+            acked = await self.queue.ack(batch)
+            if acked < len(batch):
+                logger.debug(
+                    f"{len(batch) - acked} finished jobs were claimed again "
+                    "after their visibility timeout"
+                )
+
+    async def _work(self, scraper):
+        from ..daemon import Job, run_job
+
+        while True:
+            queued = await self.claimed.get()
+            if queued is None:
+                return
+            self.running += 1
+            payload = queued.payload
+            job = Job(
+                type=payload["type"],
+                name=payload["name"],
+                mode=payload.get("mode", "data"),
+                llm=payload.get("llm", False),
+            )
+            result, error = None, None
+            try:
+                with span("job", type=job.type, target=job.name, mode=job.mode):
+                    result = await run_job(scraper, job)
+                if isinstance(result, dict) and "error" in result:
+                    error = result["error"]
+            except Exception as e:
+                error = str(e)
+            finally:
+                self.running -= 1
+
+            status = "failed" if error else "done"
+            JOBS.inc(type=job.type, status=status)
+            if error:
+                self.failed += 1
+                logger.debug(
+                    f"Job {queued.id} failed (attempt {queued.attempts}): {error}"
+                )
+                await self.queue.nack([queued], delay=self.retry_delay)
+            else:
+                self.done += 1
+                self.acks.append(queued)
+                if len(self.acks) >= self.batch_size:
+                    await self.flush_acks()
+            if self.on_result is not None:
+                self.on_result(queued, status, result, error)
+
+    async def run(self, drain: bool = False) -> dict:
+        """
+        Work through the queue
+
+        Args:
+            drain: Return once nothing is left to claim, instead of waiting
+                for new jobs forever
+
+        Returns:
+            dict: Jobs done and failed, elapsed seconds
+        """
+        start = time.perf_counter()
+        workers = [asyncio.create_task(self._work(s)) for s in self.scrapers]
+        acker = asyncio.create_task(self._ack_loop())
+        try:
+            await self._claim_loop(drain)
+            for _ in workers:
+                self.claimed.put_nowait(None)
+            await asyncio.gather(*workers)
+        finally:
+            acker.cancel()
+            for task in workers:
+                task.cancel()
+            # Jobs claimed but not started go back for other nodes
+            leftover = []
+            while not self.claimed.empty():
+                queued = self.claimed.get_nowait()
+                if queued is not None:
+                    leftover.append(queued)
+            if leftover:
+                await self.queue.nack(leftover)
+            await self.flush_acks()
+        return {
+            "done": self.done,
+            "failed": self.failed,
+            "elapsed": time.perf_counter() - start,
+        }
+
+
+async def consume(
+    queue: JobQueue,
+    workers: int = 2,
+    headless: bool = True,
+    drain: bool = False,
+    on_result=None,
+    scraper_factory=None,
+) -> dict:
+    """
+    Start a browser with `workers` scrapers and work through a queue
+
+    Args:
+        queue: Shared job queue
+        workers: Scrapers (browser contexts) on this node
+        headless: Run the browser headless
+        drain: Stop once the queue has nothing left to claim
+        on_result: Called with (job, status, result, error) per job
+        scraper_factory: Callable returning a LinkedInScraper-like object
+
+    Returns:
+        dict: Jobs done and failed on this node
+    """
+    from ..daemon import start_scrapers
+
+    kwargs = {"scraper_factory": scraper_factory} if scraper_factory else {}
+    scrapers = await start_scrapers(workers, headless, **kwargs)
+    consumer = QueueConsumer(queue, scrapers, on_result=on_result)
+    try:
+        return await consumer.run(drain=drain)
+    finally:
+        for scraper in reversed(scrapers):
+            await scraper.cleanup()
@@ -0,0 +1,90 @@
+"""
+In-process job queue, for single-process runs and tests
+"""
+
+import time
+from dataclasses import replace
+from typing import Dict, List
+
+from .base import JobQueue, QueuedJob, job_id, new_lease
+
+
+class MemoryQueue(JobQueue):
+    """
+    Job queue held in a dict; jobs are lost when the process exits
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.jobs: Dict[str, QueuedJob] = {}
+        # Job ID -> time it becomes visible again
+        self.visible_at: Dict[str, float] = {}
+        # Job ID -> lease of its latest claim
+        self.leases: Dict[str, str] = {}
+        self.dead: Dict[str, QueuedJob] = {}
+
+    async def put(self, payloads, ids=None):
+        payloads = list(payloads)
+        ids = ids or [job_id(payload) for payload in payloads]
+        added = 0
+        for id, payload in zip(ids, payloads):
+            if id in self.jobs or id in self.dead:
+                continue
+            self.jobs[id] = QueuedJob(id=id, payload=payload)
+            self.visible_at[id] = 0.0
+            added += 1
+        return added
+
+    async def claim(self, count=1, visibility_timeout=None) -> List[QueuedJob]:
+        now = time.time()
+        timeout = visibility_timeout or self.visibility_timeout
+        claimed = []
+        for id in sorted(self.visible_at, key=self.visible_at.get):
+            if len(claimed) >= count or self.visible_at[id] > now:
+                break
+            job = self.jobs[id]
+            if job.attempts >= self.max_attempts:
+                self.dead[id] = self.jobs.pop(id)
+                del self.visible_at[id]
+                self.leases.pop(id, None)
+                continue
+            job.attempts += 1
+            self.visible_at[id] = now + timeout
+            self.leases[id] = new_lease()
+            # A snapshot, like the other backends hand out
+            claimed.append(replace(job, lease=self.leases[id]))
+        return claimed
+
+    def _held(self, job: QueuedJob) -> bool:
+        return bool(job.lease) and self.leases.get(job.id) == job.lease
+
+    async def ack(self, jobs):
+        acked = 0
+        for job in jobs:
+            if self._held(job):
+                del self.jobs[job.id]
+                del self.visible_at[job.id]
+                del self.leases[job.id]
+                acked += 1
+        return acked
+
+    async def nack(self, jobs, delay=0):
+        released = 0
+        for job in jobs:
+            if self._held(job):
+                self.visible_at[job.id] = time.time() + delay
+                del self.leases[job.id]
+                released += 1
+        return released
+
+    async def dead_letters(self) -> List[QueuedJob]:
+        return list(self.dead.values())
+
+    async def stats(self):
+        now = time.time()
+        pending = sum(1 for at in self.visible_at.values() if at <= now)
+        return {
+            "pending": pending,
+            "in_flight": len(self.visible_at) - pending,
+            "dead": len(self.dead),
+        }
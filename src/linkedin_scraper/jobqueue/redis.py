@@ -0,0 +1,191 @@
+"""
+Redis job queue, shared by scraper nodes on several hosts
+"""
+
+import json
+import time
+from typing import List
+
+from .base import JobQueue, QueuedJob, job_id, new_lease
+
+DEFAULT_PREFIX = "linkedin-scraper:jobs"
+
+
+class RedisQueue(JobQueue):
+    """
+    Job queue in Redis (or anything speaking its protocol)
+
+    Keys under `prefix`: `:jobs` (hash of payloads), `:visible` (sorted
+    set scored by the time each job becomes visible), `:attempts` (hash),
+    `:leases` (hash of the latest claim's lease) and `:dead` (hash of dead
+    letters). Claims are optimistic WATCH/MULTI transactions on `:visible`,
+    so two nodes never claim the same job, and acks and nacks on `:leases`,
+    so a superseded lease never touches the job; no server-side scripting
+    is needed.
+    """
+
+    def __init__(
+        self,
+        url="redis://localhost:6379/0",
+        prefix=DEFAULT_PREFIX,
+        client=None,
+        **kwargs,
+    ):
+        """
+        Initialize the queue
+
+        Args:
+            url: Redis URL, used when no client is given
+            prefix: Key prefix, one per backlog
+            client: redis.asyncio client (or fakeredis) to use instead
+            kwargs: visibility_timeout and max_attempts, see JobQueue
+        """
+        super().__init__(**kwargs)
+        # Optional dependency, only needed for the Redis backend
+        from redis.exceptions import WatchError
+
+        if client is None:
+            import redis.asyncio
+
+            client = redis.asyncio.from_url(url, decode_responses=True)
+        self.redis = client
+        self.WatchError = WatchError
+        self.jobs_key = f"{prefix}:jobs"
+        self.visible_key = f"{prefix}:visible"
+        self.attempts_key = f"{prefix}:attempts"
+        self.leases_key = f"{prefix}:leases"
+        self.dead_key = f"{prefix}:dead"
+
+    async def put(self, payloads, ids=None):
+        payloads = list(payloads)
+        ids = ids or [job_id(payload) for payload in payloads]
+        if not ids:
+            return 0
+        dead = await self.redis.hmget(self.dead_key, ids)
+        now = time.time()
+        new = [(id, p) for id, p, d in zip(ids, payloads, dead) if d is None]
+        if not new:
+            return 0
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for id, payload in new:
+                record = {"payload": payload, "enqueued_at": now}
+                pipe.hsetnx(self.jobs_key, id, json.dumps(record, ensure_ascii=False))
+            # NX leaves queued and in-flight jobs as they are
+            pipe.zadd(self.visible_key, {id: now for id, _ in new}, nx=True)
+            results = await pipe.execute()
+        return results[-1]
+
+    async def claim(self, count=1, visibility_timeout=None) -> List[QueuedJob]:
+        timeout = visibility_timeout or self.visibility_timeout
+        async with self.redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(self.visible_key)
+                    now = time.time()
+                    ids = await pipe.zrangebyscore(
+                        self.visible_key, "-inf", now, start=0, num=count
+                    )
+                    if not ids:
+                        # Leaving the pipeline block unwatches
+                        return []
+                    attempts = await pipe.hmget(self.attempts_key, ids)
+                    records = await pipe.hmget(self.jobs_key, ids)
+
+                    claimed, exhausted = [], False
+                    pipe.multi()
+                    for id, tries, record in zip(ids, attempts, records):
+                        tries = int(tries or 0)
+                        record = json.loads(record) if record else {"payload": {}}
+                        if tries >= self.max_attempts:
+                            exhausted = True
+                            dead = dict(record, attempts=tries)
+                            pipe.hset(self.dead_key, id, json.dumps(dead))
+                            pipe.zrem(self.visible_key, id)
+                            pipe.hdel(self.jobs_key, id)
+                            pipe.hdel(self.attempts_key, id)
+                            pipe.hdel(self.leases_key, id)
+                            continue
+                        lease = new_lease()
+                        pipe.zadd(self.visible_key, {id: now + timeout}, xx=True)
+                        pipe.hincrby(self.attempts_key, id, 1)
+                        pipe.hset(self.leases_key, id, lease)
+                        claimed.append(
+                            QueuedJob(
+                                id=id,
+                                payload=record["payload"],
+                                attempts=tries + 1,
+                                enqueued_at=record.get("enqueued_at", now),
+                                lease=lease,
+                            )
+                        )
+                    await pipe.execute()
+                except self.WatchError:
+                    # Another consumer claimed first, look again
+                    continue
+                if claimed or not exhausted:
+                    return claimed
+
+    async def _release(self, jobs, apply) -> int:
+        """Run `apply(pipe, ids)` on the jobs whose lease is still current."""
+        jobs = [job for job in jobs if job.lease]
+        if not jobs:
+            return 0
+        async with self.redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(self.leases_key)
+                    leases = await pipe.hmget(self.leases_key, [j.id for j in jobs])
+                    ids = [j.id for j, lease in zip(jobs, leases) if lease == j.lease]
+                    if not ids:
+                        return 0
+                    pipe.multi()
+                    pipe.hdel(self.leases_key, *ids)
+                    apply(pipe, ids)
+                    await pipe.execute()
+                    return len(ids)
+                except self.WatchError:
+                    # A lease changed meanwhile, check again
+                    continue
+
+    async def ack(self, jobs):
+        def apply(pipe, ids):
+            pipe.zrem(self.visible_key, *ids)
+            pipe.hdel(self.jobs_key, *ids)
+            pipe.hdel(self.attempts_key, *ids)
+
+        return await self._release(jobs, apply)
+
+    async def nack(self, jobs, delay=0):
+        visible_at = time.time() + delay
+
+        def apply(pipe, ids):
+            pipe.zadd(self.visible_key, {id: visible_at for id in ids}, xx=True)
+
+        return await self._release(jobs, apply)
+
+    async def dead_letters(self) -> List[QueuedJob]:
+        letters = await self.redis.hgetall(self.dead_key)
+        jobs = []
+        for id, record in letters.items():
+            record = json.loads(record)
+            jobs.append(
+                QueuedJob(
+                    id=id,
+                    payload=record["payload"],
+                    attempts=record["attempts"],
+                    enqueued_at=record.get("enqueued_at", 0.0),
+                )
+            )
+        return jobs
+
+    async def stats(self):
+        now = time.time()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zcount(self.visible_key, "-inf", now)
+            pipe.zcard(self.visible_key)
+            pipe.hlen(self.dead_key)
+            pending, total, dead = await pipe.execute()
+        return {"pending": pending, "in_flight": total - pending, "dead": dead}
+
+    async def close(self):
+        await self.redis.aclose()
@@ -0,0 +1,177 @@
+"""
+SQLite job queue, shared by the processes of one host
+"""
+
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import threading
+from typing import List
+
+from ..config import QUEUE_PATH
+from .base import JobQueue, QueuedJob, job_id, new_lease
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    visible_at REAL NOT NULL,
+    dead INTEGER NOT NULL DEFAULT 0,
+    lease TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_visible ON jobs (dead, visible_at);
+"""
+
+
+class SqliteQueue(JobQueue):
+    """
+    Job queue in a SQLite database
+
+    Claims run in IMMEDIATE transactions, so concurrent consumers (threads
+    or processes on the same file) never claim the same job.
+    """
+
+    def __init__(self, path=QUEUE_PATH, **kwargs):
+        """
+        Initialize the queue
+
+        Args:
+            path: SQLite database path
+            kwargs: visibility_timeout and max_attempts, see JobQueue
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(jobs)")}
+        if "lease" not in columns:
+            # Queue files created before claims carried a lease
+            self.db.execute("ALTER TABLE jobs ADD COLUMN lease TEXT")
+
+    def _transaction(self, work):
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(self.db)
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+            self.db.execute("COMMIT")
+            return result
+
+    async def _run(self, work):
+        # Waiting on the database lock must not block the event loop
+        return await asyncio.to_thread(self._transaction, work)
+
+    async def put(self, payloads, ids=None):
+        payloads = list(payloads)
+        ids = ids or [job_id(payload) for payload in payloads]
+        now = time.time()
+        rows = [
+            (id, json.dumps(payload, ensure_ascii=False), now, now)
+            for id, payload in zip(ids, payloads)
+        ]
+
+        def work(db):
+            before = db.total_changes
+            db.executemany(
+                "INSERT OR IGNORE INTO jobs (id, payload, enqueued_at, visible_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            return db.total_changes - before
+
+        return await self._run(work)
+
+    async def claim(self, count=1, visibility_timeout=None) -> List[QueuedJob]:
+        timeout = visibility_timeout or self.visibility_timeout
+
+        def work(db):
+            now = time.time()
+            db.execute(
+                "UPDATE jobs SET dead = 1 "
+                "WHERE dead = 0 AND visible_at <= ? AND attempts >= ?",
+                (now, self.max_attempts),
+            )
+            rows = db.execute(
+                "SELECT id, payload, attempts, enqueued_at FROM jobs "
+                "WHERE dead = 0 AND visible_at <= ? ORDER BY visible_at LIMIT ?",
+                (now, count),
+            ).fetchall()
+            jobs = [
+                QueuedJob(
+                    id=id,
+                    payload=json.loads(payload),
+                    attempts=attempts + 1,
+                    enqueued_at=enqueued_at,
+                    lease=new_lease(),
+                )
+                for id, payload, attempts, enqueued_at in rows
+            ]
+            db.executemany(
+                "UPDATE jobs SET attempts = attempts + 1, visible_at = ?, lease = ? "
+                "WHERE id = ?",
+                [(now + timeout, job.lease, job.id) for job in jobs],
+            )
+            return jobs
+
+        return await self._run(work)
+
+    async def _changes(self, sql, rows):
+        def work(db):
+            before = db.total_changes
+            db.executemany(sql, rows)
+            return db.total_changes - before
+
+        return await self._run(work)
+
+    async def ack(self, jobs):
+        rows = [(job.id, job.lease) for job in jobs]
+        return await self._changes("DELETE FROM jobs WHERE id = ? AND lease = ?", rows)
+
+    async def nack(self, jobs, delay=0):
+        visible_at = time.time() + delay
+        rows = [(visible_at, job.id, job.lease) for job in jobs]
+        return await self._changes(
+            "UPDATE jobs SET visible_at = ?, lease = NULL "
+            "WHERE id = ? AND lease = ? AND dead = 0",
+            rows,
+        )
+
+    async def dead_letters(self) -> List[QueuedJob]:
+        def work(db):
+            rows = db.execute(
+                "SELECT id, payload, attempts, enqueued_at FROM jobs WHERE dead = 1"
+            ).fetchall()
+            return [
+                QueuedJob(id, json.loads(payload), attempts, enqueued_at)
+                for id, payload, attempts, enqueued_at in rows
+            ]
+
+        return await self._run(work)
+
+    async def stats(self):
+        def work(db):
+            now = time.time()
+            return db.execute(
+                "SELECT "
+                "COALESCE(SUM(dead = 0 AND visible_at <= ?), 0), "
+                "COALESCE(SUM(dead = 0 AND visible_at > ?), 0), "
+                "COALESCE(SUM(dead = 1), 0) FROM jobs",
+                (now, now),
+            ).fetchone()
+
+        pending, in_flight, dead = await self._run(work)
+        return {"pending": pending, "in_flight": in_flight, "dead": dead}
+
+    async def close(self):
+        self.db.close()
@@ -0,0 +1,109 @@
+"""
+LinkedIn Scraper - Context Lifecycle Module
+Keeps long runs at flat memory and alive through renderer crashes: the
+scraper's browser context is replaced after a number of jobs or once the
+browser grows past an RSS limit, and a page that crashed or stopped
+responding is replaced and its job run again on the fresh one
+"""
+
+import asyncio
+import weakref
+from typing import Optional
+
+from playwright.async_api import Page
+
+from .config import (
+    CONTEXT_MAX_JOBS,
+    CONTEXT_MAX_RSS_MB,
+    JOB_MAX_ATTEMPTS,
+    PAGE_HANG_TIMEOUT,
+)
+from .logging import get_logger
+from .utils.procstats import browser_rss, is_supported
+
+logger = get_logger()
+
+
+class PageCrashed(Exception):
+    """A job's page crashed or hung on every attempt."""
+
+
+class ContextLifecycle:
+    """
+    Decides when a scraper's context is worn out or its page is broken
+    """
+
+    def __init__(
+        self,
+        max_jobs=CONTEXT_MAX_JOBS,
+        max_rss_mb=CONTEXT_MAX_RSS_MB,
+        hang_timeout=PAGE_HANG_TIMEOUT,
+        max_attempts=JOB_MAX_ATTEMPTS,
+    ):
+        """
+        Initialize the lifecycle policy
+
+        Args:
+            max_jobs: Jobs run in one context before it is replaced, 0 for no limit
+            max_rss_mb: Browser RSS (MB) above which the context is replaced,
+                0 for no limit
+            hang_timeout: Seconds a page may take to answer a health probe
+            max_attempts: Times a job is run when its page keeps failing
+        """
+        self.max_jobs = max_jobs
+        self.max_rss = max_rss_mb * 1024 * 1024
+        self.hang_timeout = hang_timeout
+        self.max_attempts = max(1, max_attempts)
+        self.jobs = 0
+        self.crashed = weakref.WeakSet()
+
+    def watch(self, page: Page):
+        """Track crashes of a newly created page."""
+        page.on("crash", self._on_crash)
+
+    def _on_crash(self, page: Page):
+        logger.debug(f"Page crashed at {page.url}")
+        self.crashed.add(page)
+
+    def reset(self):
+        """Start counting jobs for a fresh context."""
+        self.jobs = 0
+
+    def job_done(self):
+        """Count a job run in the current context."""
+        self.jobs += 1
+
+    async def recycle_reason(self) -> Optional[str]:
+        """
+        Whether the current context should be replaced before the next job
+
+        Returns:
+            str: "jobs" or "rss", None while the context is still healthy
+        """
+        if self.max_jobs and self.jobs >= self.max_jobs:
+            return "jobs"
+        if self.max_rss and is_supported():
+            # /proc walks are blocking, keep them off the event loop
+            if await asyncio.to_thread(browser_rss) > self.max_rss:
+                return "rss"
+        return None
+
+    async def page_failed(self, page: Page) -> Optional[str]:
+        """
+        Check a page after a job
+
+        Returns:
+            str: "crash", "closed" or "hung", None when the page responds
+        """
+        if page in self.crashed:
+            return "crash"
+        if page.is_closed():
+            return "closed"
+        try:
+            await asyncio.wait_for(page.evaluate("1"), self.hang_timeout)
+        except asyncio.TimeoutError:
+            return "hung"
+        except Exception as e:
+            logger.debug(f"Page health probe failed: {e}")
+            return "crash"
+        return None
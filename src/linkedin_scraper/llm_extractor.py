@@ -1,5 +1,6 @@
 import json
 import os
+from functools import lru_cache
 
 from dotenv import load_dotenv
 from together import Together
@@ -7,6 +8,8 @@ from together import Together
 from .prompts.company import get_company_info_prompt
 from .prompts.profile import get_profile_info_prompt
 from .logging import get_logger
+from .metrics import LLM_TOKENS
+from .utils.stages import stage
 from .models.company import Company
 from .models.profile import Profile
 
@@ -18,15 +21,27 @@ load_dotenv()
 
 TOGETHER_API_KEY = os.getenv("TOGETHER_API_KEY")
 
-# Initialize Together client
-together_client = Together(api_key=TOGETHER_API_KEY)
+
+@lru_cache(maxsize=None)
+def get_together_client():
+    """Create the Together client on first use and reuse it afterwards."""
+    return Together(api_key=TOGETHER_API_KEY)
+
+
+def record_usage(response):
+    """Count the tokens an LLM response reports in the metrics."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    LLM_TOKENS.inc(usage.prompt_tokens or 0, kind="prompt")
+    LLM_TOKENS.inc(usage.completion_tokens or 0, kind="completion")
 
 
 def llm_call_company(
     prompt,
     model="deepseek-ai/DeepSeek-V3",
 ):
-    response = together_client.chat.completions.create(
+    response = get_together_client().chat.completions.create(
         model=model,
         messages=[
             {
@@ -42,6 +57,7 @@ def llm_call_company(
             "schema": Company.model_json_schema(),
         },
     )
+    record_usage(response)
     output = json.loads(response.choices[0].message.content)
     # logger.debug(json.dumps(output, indent=2))
     return output
@@ -51,7 +67,7 @@ def llm_call_profile(
     prompt,
     model="deepseek-ai/DeepSeek-V3",
 ):
-    response = together_client.chat.completions.create(
+    response = get_together_client().chat.completions.create(
         model=model,
         messages=[
             {
@@ -67,6 +83,7 @@ def llm_call_profile(
             "schema": Profile.model_json_schema(),
         },
     )
+    record_usage(response)
     output = json.loads(response.choices[0].message.content)
     # logger.debug(json.dumps(output, indent=2))
     return output
@@ -77,7 +94,8 @@ def extract_company(html_content: str):
     if html_content and len(html_content) > 100:
         company_info_prompt = get_company_info_prompt(html_content)
         logger.debug("CALL LLM...")
-        response = llm_call_company(prompt=company_info_prompt)
+        with stage("llm"):
+            response = llm_call_company(prompt=company_info_prompt)
     return response
 
 
@@ -86,5 +104,6 @@ def extract_profile(html_content: str):
     if html_content and len(html_content) > 100:
         profile_info_prompt = get_profile_info_prompt(html_content)
         logger.debug("CALL LLM...")
-        response = llm_call_profile(prompt=profile_info_prompt)
+        with stage("llm"):
+            response = llm_call_profile(prompt=profile_info_prompt)
     return response
@@ -1,19 +1,26 @@
 import os
 import asyncio
-from typing import Literal
+from typing import Any, Callable, Literal, Optional
 
 from bs4 import BeautifulSoup
 
 from .utils.html_cleaner import clean_html
 
-from .config import DATA_DIR
+from .config import DATA_DIR, REVALIDATE
 
 from .scrapers.linkedin import LinkedInScraper
+from .fetch import Target, ValidatorStore, build_orchestrator
+from .fetch.validators import FRESH
+from .storage.deltas import PARTIAL_KEY, record_hash
 from .logging import debug, error
+from .utils.stages import stage
 
 
 async def scrape(
-    target_name: str, target_type: Literal["profile", "company"] = "profile"
+    target_name: str,
+    target_type: Literal["profile", "company"] = "profile",
+    sink: Optional[str] = None,
+    force: bool = False,
 ) -> None:
     """
     Main scraping function that orchestrates the LinkedIn scraping process.
@@ -21,8 +28,22 @@ async def scrape(
     Args:
         target_name: The profile or company name/identifier
         target_type: The type of target to scrape ("profile" or "company")
+        sink: Result sink name (json, ndjson, parquet, sqlite), defaults to
+            RESULT_SINK
+        force: Scrape even if the target is still fresh
     """
-    scraper = LinkedInScraper()
+    # Structured scrapes read the rendered page, so there is no conditional
+    # request to make: fresh targets are skipped, the others scraped in full
+    validators = ValidatorStore() if REVALIDATE and not force else None
+    key = f"{Target(target_type, target_name).key}:data"
+    if validators is not None:
+        known = validators.get(key)
+        if validators.state(target_type, known) == FRESH:
+            debug(f"{target_type} {target_name} is fresh, skipping")
+            validators.close()
+            return
+
+    scraper = LinkedInScraper(sink=sink)
 
     try:
         # Check if data directory exists, create it if it doesn't
@@ -41,10 +62,17 @@ async def scrape(
 
         # Scrape the target
         if target_type == "profile":
-            await scraper.scrape_profile(target_name)
+            data = await scraper.scrape_profile(target_name)
         else:  # company
 
-            await scraper.scrape_company(target_name)
+            data = await scraper.scrape_company(target_name)
+
+        if isinstance(data, dict) and "error" in data:
+            error(f"Scraping {target_type} failed: {data['error']}")
+            return
+        if validators is not None and PARTIAL_KEY not in data:
+            # A partial record is retried on the next run, not taken as fresh
+            validators.checked(key, record_hash(data))
 
         debug(f"Scraping {target_type} completed successfully")
 
@@ -54,23 +82,68 @@ async def scrape(
     finally:
         # Clean up resources
         await scraper.cleanup()
+        if validators is not None:
+            validators.close()
 
 
-async def scrape_html(type: Literal["profile", "company"], name: str):
-    scraper = LinkedInScraper(headless=True)
+async def scrape_html(
+    type: Literal["profile", "company"],
+    name: str,
+    force: bool = False,
+    extract: Optional[Callable[[str], Any]] = None,
+):
+    """
+    Fetch a target's page through the fetch tiers and clean its main region.
+
+    Args:
+        type: "profile" or "company"
+        name: The profile or company name/identifier
+        force: Fetch even if the target is fresh or unchanged
+        extract: Function run on the cleaned HTML, e.g. the LLM extractor;
+            the target only counts as checked once it has succeeded
+
+    Returns:
+        The cleaned HTML, or what extract returned; None when the target is
+        unchanged and "" when it could not be fetched or processed
+    """
+    # Cache and plain HTTP are tried first; the browser tier only launches
+    # Chromium and logs in when neither has a usable page
+    orchestrator = build_orchestrator(
+        headless=True, revalidate=REVALIDATE and not force
+    )
     try:
-        # Initialize browser
-        await scraper.initialize_browser()
-        # Login to LinkedIn
-        login_success = await scraper.login()
-        if not login_success:
-            error("Login failed, cannot continue")
+        result = await orchestrator.fetch(Target(type, name))
+        if result is None:
+            error(f"Could not fetch {type} {name}")
+            return ""
+        if result.unchanged:
+            # Nothing new to clean or extract
+            debug(f"{type} {name} unchanged since its last fetch")
+            return None
+        debug(f"Fetched {type} {name} from the {result.tier} tier")
+        output = extract_main_html(result.html)
+        if extract is not None:
+            output = await asyncio.to_thread(extract, output)
+        orchestrator.commit(result)
+        return output
+    except Exception as e:
+        error(f"Error occurred during scraping: {e}")
+        return ""
+    finally:
+        await orchestrator.close()
 
-        # Scrape the target
-        if type == "profile":
-            html = await scraper.scrape_profile_html(name)
-        else:
-            html = await scraper.scrape_company_html(name)
+
+def extract_main_html(html: str) -> str:
+    """
+    Clean a page and keep only its <main> region for LLM extraction.
+
+    Args:
+        html: Raw page HTML
+
+    Returns:
+        str: Cleaned, single-line HTML of the main region
+    """
+    with stage("clean"):
         html = clean_html(html)
         # bs4  main
         soup = BeautifulSoup(html, "html.parser")
@@ -78,9 +151,6 @@ async def scrape_html(type: Literal["profile", "company"], name: str):
         main = soup.find("main")
         # print(main.prettify())
         return main.prettify().replace("\n", "")
-    except Exception as e:
-        error(f"Error occurred during scraping: {e}")
-        return ""
 
 
 if __name__ == "__main__":
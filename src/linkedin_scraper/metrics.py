@@ -0,0 +1,450 @@
+"""
+LinkedIn Scraper - Metrics Module
+In-process counters, gauges and histograms rendered in the Prometheus text
+format. Updates are a dict lookup and an add under a lock, so the registry
+stays on permanently; values that are expensive to read (browser RSS, queue
+depth) are gauges computed only when the endpoint is scraped.
+"""
+
+import math
+import asyncio
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .config import METRICS_HOST
+from .logging import get_logger
+from .utils.http_server import HTTPServer, Request, Response, text_response
+from .utils.procstats import browser_rss, is_supported, python_rss
+
+logger = get_logger()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds, covering a cache hit up to a slow scroll or LLM call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+# (name, kind, documentation, [(sample name, labels, value), ...])
+Family = Tuple[str, str, str, List[Tuple[str, Dict[str, str], float]]]
+
+
+def render_family(family: Family) -> str:
+    """A collected metric family in the Prometheus text format."""
+    name, kind, documentation, samples = family
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for sample, labels, value in samples:
+        lines.append(f"{sample}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines)
+
+
+def merge_families(snapshots: Iterable[List[Family]]) -> List[Family]:
+    """
+    Sum the samples of several processes' snapshots
+
+    Samples with the same name and labels are added up, which is the
+    process-wide total for counters, histograms and the gauges this
+    package keeps (open contexts, jobs in progress, RSS).
+
+    Args:
+        snapshots: MetricsRegistry.collect() results
+
+    Returns:
+        list: Merged families, in order of first appearance
+    """
+    merged: Dict[str, list] = {}
+    for families in snapshots:
+        for name, kind, documentation, samples in families:
+            entry = merged.setdefault(name, [kind, documentation, {}])
+            for sample, labels, value in samples:
+                key = (sample, tuple(labels.items()))
+                entry[2][key] = entry[2].get(key, 0) + value
+    return [
+        (
+            name,
+            kind,
+            documentation,
+            [
+                (sample, dict(labels), value)
+                for (sample, labels), value in values.items()
+            ],
+        )
+        for name, (kind, documentation, values) in merged.items()
+    ]
+
+
+class Metric:
+    """
+    Base class for a metric family with a fixed set of label names
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize the metric
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Names of the labels every sample carries
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...], **extra) -> Dict[str, str]:
+        labels = dict(zip(self.labelnames, key))
+        labels.update(extra)
+        return labels
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        """(name, labels, value) of every sample."""
+        return iter(())
+
+    def collect(self) -> Family:
+        """Snapshot of the family, picklable for other processes."""
+        return self.name, self.kind, self.documentation, list(self.samples())
+
+    def render(self) -> str:
+        """The metric family in the Prometheus text format."""
+        return render_family(self.collect())
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing count
+    """
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """Add `amount` to the sample with these labels."""
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Current value of the sample with these labels."""
+        return self.values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self.lock:
+            items = list(self.values.items())
+        for key, value in items:
+            yield self.name, self._labels(key), value
+
+
+class Gauge(Counter):
+    """
+    Value that goes up and down, optionally computed at scrape time
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.functions: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, **labels):
+        """Set the sample with these labels."""
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+
+    def dec(self, amount: float = 1, **labels):
+        """Subtract `amount` from the sample with these labels."""
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Optional[Callable[[], float]], **labels):
+        """
+        Compute the sample when scraped instead of storing it
+
+        Args:
+            function: Callable returning the current value, None to remove it
+            labels: Labels of the sample
+        """
+        key = self._key(labels)
+        with self.lock:
+            if function is None:
+                self.functions.pop(key, None)
+            else:
+                self.functions[key] = function
+
+    def samples(self):
+        yield from super().samples()
+        with self.lock:
+            functions = list(self.functions.items())
+        for key, function in functions:
+            try:
+                value = function()
+            except Exception as e:
+                logger.debug(f"Error computing {self.name}: {e}")
+                continue
+            yield self.name, self._labels(key), value
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values in cumulative buckets
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (+Inf last), sum]
+        self.values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        """Record one observation."""
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def count(self, **labels) -> int:
+        """Number of observations with these labels."""
+        state = self.values.get(self._key(labels))
+        return sum(state[0]) if state else 0
+
+    def samples(self):
+        with self.lock:
+            items = [
+                (key, list(counts), total)
+                for key, (counts, total) in self.values.items()
+            ]
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket",
+                    self._labels(key, le=_format_value(bound)),
+                    cumulative,
+                )
+            yield f"{self.name}_sum", self._labels(key), total
+            yield f"{self.name}_count", self._labels(key), cumulative
+
+
+class MetricsRegistry:
+    """
+    Named metrics of one process
+    """
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        self.lock = threading.Lock()
+
+    def _register(self, cls, name, documentation, labelnames, **options):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **options)
+                self.metrics[name] = metric
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered differently")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        """Get or create a gauge."""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def collect(self) -> List[Family]:
+        """Snapshot of every metric, see merge_families()."""
+        with self.lock:
+            metrics = list(self.metrics.values())
+        return [metric.collect() for metric in metrics]
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        return "\n".join(render_family(family) for family in self.collect()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+PAGES_FETCHED = REGISTRY.counter(
+    "linkedin_scraper_pages_fetched_total", "Pages served, by fetch tier", ("tier",)
+)
+FETCH_ERRORS = REGISTRY.counter(
+    "linkedin_scraper_fetch_errors_total", "Fetch tier calls that raised", ("tier",)
+)
+RETRIES = REGISTRY.counter(
+    "linkedin_scraper_retries_total",
+    "Fetches passed on to the next tier after this one failed or fell short",
+    ("tier",),
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "linkedin_scraper_cache_lookups_total",
+    "Local tier lookups, by tier and hit or miss",
+    ("tier", "result"),
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "linkedin_scraper_stage_duration_seconds", "Duration of job stages", ("stage",)
+)
+JOBS = REGISTRY.counter(
+    "linkedin_scraper_jobs_total",
+    "Finished jobs, by type and status",
+    ("type", "status"),
+)
+JOBS_IN_PROGRESS = REGISTRY.gauge(
+    "linkedin_scraper_jobs_in_progress", "Jobs currently running"
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "linkedin_scraper_queue_depth", "Jobs waiting for a worker"
+)
+LLM_TOKENS = REGISTRY.counter(
+    "linkedin_scraper_llm_tokens_total",
+    "LLM tokens used, by prompt or completion",
+    ("kind",),
+)
+BROWSER_CONTEXTS = REGISTRY.gauge(
+    "linkedin_scraper_browser_contexts", "Open browser contexts"
+)
+CONTEXT_RECYCLES = REGISTRY.counter(
+    "linkedin_scraper_context_recycles_total",
+    "Browser contexts replaced, by reason (jobs, rss, crash, closed, hung)",
+    ("reason",),
+)
+PACING_SECONDS = REGISTRY.counter(
+    "linkedin_scraper_pacing_seconds_total",
+    "Seconds spent in pacing delays, by action class",
+    ("action",),
+)
+SINK_RECORDS = REGISTRY.counter(
+    "linkedin_scraper_sink_records_total", "Records written, by result sink", ("sink",)
+)
+WRITER_PENDING = REGISTRY.gauge(
+    "linkedin_scraper_writer_pending", "Documents queued for the file writer"
+)
+WRITER_BATCHES = REGISTRY.counter(
+    "linkedin_scraper_writer_batches_total", "Batches written by the file writer"
+)
+WRITER_FILES = REGISTRY.counter(
+    "linkedin_scraper_writer_files_total", "Files replaced by the file writer"
+)
+WRITER_BACKPRESSURE_SECONDS = REGISTRY.counter(
+    "linkedin_scraper_writer_backpressure_seconds_total",
+    "Seconds spent waiting for room in the file writer's queue",
+)
+WORKER_RESTARTS = REGISTRY.counter(
+    "linkedin_scraper_worker_restarts_total", "Worker processes restarted after dying"
+)
+BROWSER_RSS = REGISTRY.gauge(
+    "linkedin_scraper_browser_rss_bytes",
+    "Resident memory of the browser processes started by this process",
+)
+PROCESS_RSS = REGISTRY.gauge(
+    "linkedin_scraper_process_rss_bytes", "Resident memory of this process"
+)
+if is_supported():
+    BROWSER_RSS.set_function(browser_rss)
+    PROCESS_RSS.set_function(python_rss)
+
+
+async def metrics_response(registry: MetricsRegistry = REGISTRY) -> Response:
+    """Response with the registry's metrics, for a GET /metrics route."""
+    # Walking /proc for the RSS gauges blocks, keep it off the loop
+    text = await asyncio.to_thread(registry.render)
+    return text_response(text, content_type=CONTENT_TYPE)
+
+
+class MetricsServer(HTTPServer):
+    """
+    Serves GET /metrics for a registry
+    """
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY):
+        super().__init__()
+        self.registry = registry
+        self.route("GET", "/metrics", self.handle_metrics)
+
+    async def handle_metrics(self, request: Request) -> Response:
+        return await metrics_response(self.registry)
+
+
+def serve_metrics(port: int, host=METRICS_HOST, registry=REGISTRY) -> int:
+    """
+    Serve /metrics from a background thread with its own event loop
+
+    Running apart from the scrapers' loop keeps the endpoint responsive
+    while jobs hog theirs, and works for scripts that call asyncio.run()
+    more than once.
+
+    Args:
+        port: TCP port, 0 picks a free one
+        host: Host to bind
+        registry: Registry to expose
+
+    Returns:
+        int: The bound port
+    """
+    bound = threading.Event()
+    errors = []
+    server = MetricsServer(registry)
+
+    def run():
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(server.start(host=host, port=port))
+        except OSError as e:
+            errors.append(e)
+            return
+        finally:
+            bound.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, name="metrics-server", daemon=True).start()
+    bound.wait()
+    if errors:
+        raise errors[0]
+    logger.debug(f"Metrics on http://{host}:{server.port}/metrics")
+    return server.port
@@ -0,0 +1,196 @@
+"""
+LinkedIn Scraper - Pacing Module
+Human-like delays come from one policy instead of a global slow_mo and
+sleeps scattered through the scrapers. Delays are drawn per action class,
+capped by a per-job budget and counted in the metrics; pure reads
+(evaluate, count, text_content) are never delayed. The "none" profile turns
+every delay off for fixtures, replays and benchmarks
+"""
+
+import asyncio
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from .config import PACING_JOB_BUDGET, PACING_PROFILE
+from .logging import get_logger
+from .metrics import PACING_SECONDS
+
+logger = get_logger()
+
+# Seconds (min, max) per action class; classes left out are not delayed
+PACING_PROFILES: Dict[str, Dict[str, Tuple[float, float]]] = {
+    "human": {
+        # Before opening the next page
+        "navigation": (1.0, 3.0),
+        # After clicking and before reading what it opened
+        "click": (0.5, 1.5),
+        # Between typed characters
+        "input": (0.05, 0.15),
+        # Between scroll steps, reading the page
+        "scroll": (0.5, 2.0),
+        # Between mouse moves
+        "pointer": (0.05, 0.2),
+    },
+    "fast": {
+        "navigation": (0.2, 0.5),
+        "click": (0.1, 0.3),
+        "input": (0.01, 0.03),
+        "scroll": (0.1, 0.3),
+        "pointer": (0.01, 0.03),
+    },
+    "none": {},
+}
+
+
+class Pacer:
+    """
+    Draws and sleeps the delays of one job
+    """
+
+    def __init__(self, profile: Optional[str] = None, budget=PACING_JOB_BUDGET):
+        """
+        Initialize the pacer
+
+        Args:
+            profile: Key in PACING_PROFILES, the configured profile by default
+            budget: Most seconds of delay for the job, 0 for no limit
+
+        Raises:
+            ValueError: If the profile is unknown
+        """
+        profile = profile or _default_profile
+        if profile not in PACING_PROFILES:
+            raise ValueError(
+                f"Unknown pacing profile {profile!r}, "
+                f"expected one of {', '.join(PACING_PROFILES)}"
+            )
+        self.profile = profile
+        self.delays = PACING_PROFILES[profile]
+        self.budget = budget
+        self.spent = 0.0
+
+    def delay_for(self, action: str) -> float:
+        """
+        Draw the delay for an action, cut short by what is left of the budget
+
+        Args:
+            action: Action class (navigation, click, input, scroll, pointer)
+
+        Returns:
+            float: Seconds to wait
+        """
+        low, high = self.delays.get(action, (0.0, 0.0))
+        if high <= 0:
+            return 0.0
+        delay = random.uniform(low, high)
+        if self.budget:
+            delay = min(delay, max(0.0, self.budget - self.spent))
+        return delay
+
+    async def pause(self, action: str) -> float:
+        """
+        Wait before or after an action
+
+        Args:
+            action: Action class
+
+        Returns:
+            float: Seconds waited
+        """
+        delay = self.delay_for(action)
+        if delay <= 0:
+            return 0.0
+        self.spent += delay
+        if self.budget and self.spent >= self.budget:
+            logger.debug(f"Pacing budget of {self.budget}s used up")
+        PACING_SECONDS.inc(delay, action=action)
+        await asyncio.sleep(delay)
+        return delay
+
+
+def _env_profile(profile: str) -> str:
+    """The PACING_PROFILE setting, or "human" if it names no profile."""
+    if profile in PACING_PROFILES:
+        return profile
+    # Raising at import would break every entry point, --help included
+    logger.warning(
+        f"Unknown PACING_PROFILE {profile!r}, expected one of "
+        f"{', '.join(PACING_PROFILES)}; using 'human'"
+    )
+    return "human"
+
+
+_default_profile = _env_profile(PACING_PROFILE)
+# Pacer for actions outside a job (login, browser start-up), without budget
+_session_pacer = Pacer(_default_profile, budget=0)
+_current_pacer: ContextVar[Optional[Pacer]] = ContextVar("current_pacer", default=None)
+
+
+def configure_pacing(profile: str):
+    """
+    Set the pacing profile used by jobs that do not choose their own
+
+    Args:
+        profile: Key in PACING_PROFILES
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    global _default_profile, _session_pacer
+    _session_pacer = Pacer(profile, budget=0)
+    _default_profile = profile
+
+
+def job_pacer(budget=PACING_JOB_BUDGET) -> Pacer:
+    """
+    Pacer for a job started from here, e.g. one whose page is prefetched
+
+    Args:
+        budget: Most seconds of delay for the job, 0 for no limit
+
+    Returns:
+        Pacer: With the current job's profile, or the configured one
+    """
+    current = _current_pacer.get()
+    return Pacer(current.profile if current else _default_profile, budget)
+
+
+@contextmanager
+def pacing_job(
+    profile: Optional[str] = None,
+    budget=PACING_JOB_BUDGET,
+    pacer: Optional[Pacer] = None,
+):
+    """
+    Give the actions in this context their own delay budget
+
+    Args:
+        profile: Key in PACING_PROFILES, the configured profile by default
+        budget: Most seconds of delay for the job, 0 for no limit
+        pacer: Pacer of a job to carry on with, instead of a new one
+    """
+    pacer = pacer or Pacer(profile or _default_profile, budget)
+    token = _current_pacer.set(pacer)
+    try:
+        yield pacer
+    finally:
+        _current_pacer.reset(token)
+
+
+async def pace(action: str) -> float:
+    """
+    Wait the delay the current policy gives an action
+
+        await pace("navigation")
+        await page.goto(url)
+
+    Args:
+        action: Action class (navigation, click, input, scroll, pointer)
+
+    Returns:
+        float: Seconds waited
+    """
+    pacer = _current_pacer.get() or _session_pacer
+    return await pacer.pause(action)
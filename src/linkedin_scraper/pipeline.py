@@ -0,0 +1,256 @@
+"""
+LinkedIn Scraper - Prefetch Pipeline Module
+Overlaps page loads with extraction inside one worker: while target N is
+scrolled, extracted and saved on the scraper's page, the next targets are
+already loading on spare pages of the same context. When target N+1 comes
+up its page is swapped in and the scraper picks up the navigation already
+under way instead of starting a new one
+"""
+
+import asyncio
+import weakref
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from playwright.async_api import Page
+
+from .config import DEFAULT_TIMEOUT, LINKEDIN_URL, PREFETCH_DEPTH
+from .logging import get_logger
+from .pacing import Pacer, job_pacer, pace, pacing_job
+from .readiness import wait_until_ready
+from .utils.stages import stage
+
+logger = get_logger()
+
+# Navigations started ahead of time, by page: (url, task)
+_prefetched: "weakref.WeakKeyDictionary[Page, Tuple[str, asyncio.Task]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def target_url(target_type: str, name: str) -> str:
+    """
+    URL of a profile or company page
+
+    Args:
+        target_type: "profile" or "company"
+        name: Public profile or company page name
+
+    Returns:
+        str: Page URL
+    """
+    if target_type == "profile":
+        return f"{LINKEDIN_URL}/in/{name}"
+    return f"{LINKEDIN_URL}/company/{name}/"
+
+
+async def navigate(page: Page, url: str, page_type: str) -> bool:
+    """
+    Open a URL, committing early and waiting for the page type's readiness
+
+    Args:
+        page: Playwright page object
+        url: Page URL
+        page_type: Key in PAGE_READINESS
+
+    Returns:
+        bool: Whether the page became ready within the readiness budget
+    """
+    await pace("navigation")
+    with stage("goto"):
+        await page.goto(url, timeout=DEFAULT_TIMEOUT, wait_until="commit")
+    return await wait_until_ready(page, page_type)
+
+
+def _log_failure(task: asyncio.Task):
+    # Retrieve the exception even when the navigation is never picked up
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug(f"Prefetch navigation failed: {task.exception()}")
+
+
+def start_prefetch(page: Page, url: str, page_type: str) -> asyncio.Task:
+    """
+    Start navigating a page in the background, for open_page() to pick up
+
+    Args:
+        page: Spare page in the scraper's context
+        url: Page URL
+        page_type: Key in PAGE_READINESS
+
+    Returns:
+        asyncio.Task: The navigation
+    """
+    cancel_prefetch(page)
+    task = asyncio.create_task(navigate(page, url, page_type))
+    task.add_done_callback(_log_failure)
+    _prefetched[page] = (url, task)
+    return task
+
+
+def cancel_prefetch(page: Page):
+    """Stop a page's background navigation, if it has one."""
+    pending = _prefetched.pop(page, None)
+    if pending is not None:
+        pending[1].cancel()
+
+
+async def open_page(page: Page, url: str, page_type: str) -> bool:
+    """
+    Navigate to a URL, reusing a navigation prefetched on this page
+
+    Args:
+        page: Playwright page object
+        url: Page URL
+        page_type: Key in PAGE_READINESS
+
+    Returns:
+        bool: Whether the page became ready within the readiness budget
+    """
+    pending = _prefetched.pop(page, None)
+    if pending is not None:
+        prefetched_url, task = pending
+        if prefetched_url == url:
+            # Only the part of the load that extraction did not hide is left
+            with stage("prefetched"):
+                try:
+                    return await task
+                except Exception as e:
+                    logger.debug(f"Prefetch of {url} failed, navigating again: {e}")
+        else:
+            task.cancel()
+    return await navigate(page, url, page_type)
+
+
+async def scrape_subpages(
+    new_page: Callable[[], Awaitable[Page]],
+    subpages: Dict[str, Tuple[str, str, Callable[[Page], Awaitable[Any]]]],
+) -> Dict[str, Any]:
+    """
+    Open pages concurrently, each on a page of its own, and extract them
+
+    Args:
+        new_page: Coroutine function opening a page in the job's context
+        subpages: Name -> (url, page type, extractor); extractors are
+            coroutine functions taking the loaded page
+
+    Returns:
+        dict: Name -> extracted value, without the sub-pages that failed
+    """
+
+    async def scrape(name, url, page_type, extract):
+        page = await new_page()
+        try:
+            with stage("subpage", subpage=name):
+                await open_page(page, url, page_type)
+                return await extract(page)
+        finally:
+            await page.close()
+
+    names = list(subpages)
+    results = await asyncio.gather(
+        *(scrape(name, *subpages[name]) for name in names), return_exceptions=True
+    )
+    scraped = {}
+    for name, result in zip(names, results):
+        if isinstance(result, BaseException):
+            logger.debug(f"Sub-page {name} failed: {result}")
+        else:
+            scraped[name] = result
+    return scraped
+
+
+class Prefetcher:
+    """
+    Loads a worker's upcoming targets on spare pages of its scraper's context
+
+    Every prefetched target is one more page loading in the browser, so the
+    depth adds to the worker's share of concurrent pages. Each prefetch
+    navigation is paced by a pacer of its own job, which the scraper carries
+    on with when the job runs, so the delay counts against the job's budget.
+    """
+
+    def __init__(self, scraper, depth=PREFETCH_DEPTH):
+        """
+        Initialize the prefetcher
+
+        Args:
+            scraper: Initialized LinkedInScraper the worker runs jobs on
+            depth: Targets loaded ahead of the one being scraped, 0 to disable
+        """
+        self.scraper = scraper
+        self.depth = max(0, depth)
+        if self.depth and scraper.har.enabled:
+            # Recorded and replayed jobs get a context of their own per job
+            self.depth = 0
+        self.ahead: Deque[Tuple[Any, Page, Pacer]] = deque()
+        self.spare: List[Page] = []
+
+    def wants_more(self) -> bool:
+        """Whether another target may be prefetched now."""
+        return len(self.ahead) < self.depth
+
+    def held(self) -> List[Any]:
+        """Jobs prefetched but not handed out yet."""
+        return [job for job, _, _ in self.ahead]
+
+    def _usable(self, page: Page) -> bool:
+        # Pages of a recycled context were closed with it
+        return not page.is_closed() and page.context is self.scraper.context
+
+    async def _spare_page(self) -> Page:
+        while self.spare:
+            page = self.spare.pop()
+            if self._usable(page):
+                return page
+        return await self.scraper.new_page()
+
+    async def prefetch(self, job, target_type: str, name: str):
+        """
+        Start loading a job's target on a spare page
+
+        Args:
+            job: Job handed back by next() once it is up
+            target_type: "profile" or "company"
+            name: Target name
+        """
+        page = await self._spare_page()
+        pacer = job_pacer()
+        # The navigation task copies the context, and with it the job's pacer
+        with pacing_job(pacer=pacer):
+            start_prefetch(page, target_url(target_type, name), target_type)
+        self.ahead.append((job, page, pacer))
+
+    def next(self) -> Optional[Any]:
+        """
+        Hand out the oldest prefetched job, making its page the scraper's page
+        and its pacer the one the scraper's next job carries on with
+
+        Returns:
+            The job, None when nothing is prefetched
+        """
+        if not self.ahead:
+            if self.depth:
+                self.scraper.prefetch_pacer = None
+            return None
+        job, page, pacer = self.ahead.popleft()
+        self.scraper.prefetch_pacer = pacer
+        if self._usable(page):
+            self.spare.append(self.scraper.page)
+            self.scraper.page = page
+        else:
+            # The job navigates again on the scraper's current page
+            cancel_prefetch(page)
+        return job
+
+    async def close(self):
+        """Cancel pending navigations and close the spare pages."""
+        pages = self.spare + [page for _, page, _ in self.ahead]
+        self.ahead.clear()
+        self.spare = []
+        for page in pages:
+            cancel_prefetch(page)
+            if page is not self.scraper.page and not page.is_closed():
+                try:
+                    await page.close()
+                except Exception as e:
+                    logger.debug(f"Error closing spare page: {e}")
@@ -0,0 +1,101 @@
+"""
+LinkedIn Scraper - Page Readiness Module
+Each page type declares the DOM conditions that mean its content has
+rendered. Navigation commits early and then waits only until those hold
+or the readiness budget runs out, instead of sleeping for fixed times
+"""
+
+import json
+from typing import Dict, Sequence
+
+from playwright.async_api import Page
+
+from .config import READINESS_BUDGET
+from .logging import get_logger
+from .utils.stages import stage
+
+logger = get_logger()
+
+
+class Readiness:
+    """
+    DOM predicate for one page type
+    """
+
+    def __init__(self, all_of: Sequence[str] = (), any_of: Sequence[str] = ()):
+        """
+        Initialize the predicate
+
+        Args:
+            all_of: CSS selectors that must all match an element
+            any_of: CSS selectors of which at least one must match, ignored
+                when empty
+        """
+        self.all_of = tuple(all_of)
+        self.any_of = tuple(any_of)
+
+    def expression(self) -> str:
+        """JavaScript function that returns true once the page is ready."""
+        return (
+            "() => {"
+            f"const all = {json.dumps(self.all_of)};"
+            f"const any = {json.dumps(self.any_of)};"
+            "const has = (s) => document.querySelector(s) !== null;"
+            "return all.every(has) && (any.length === 0 || any.some(has));"
+            "}"
+        )
+
+
+# Top card name plus one section anchor (or a second card) for profiles, the
+# org module card heading for companies, and the module each company sub-page
+# or profile detail page is about, or its empty state
+PAGE_READINESS: Dict[str, Readiness] = {
+    "profile": Readiness(
+        all_of=["main h1"],
+        any_of=[
+            "#about",
+            "#experience",
+            "#education",
+            "main section.artdeco-card ~ section.artdeco-card",
+        ],
+    ),
+    "company": Readiness(all_of=[".org-module-card__margin-bottom h1"]),
+    "company_about": Readiness(all_of=["main dl dt"]),
+    "company_jobs": Readiness(
+        any_of=[
+            ".org-jobs-recently-posted-jobs-module",
+            ".org-jobs-empty-jobs-module",
+        ]
+    ),
+    "company_people": Readiness(
+        any_of=[".org-people-profile-card", ".org-people__header-spacing-carousel"]
+    ),
+}
+for _section in ("experience", "education", "skills", "certifications", "languages"):
+    PAGE_READINESS[f"profile_{_section}"] = Readiness(
+        any_of=["main section ul.pvs-list > li", "main .artdeco-empty-state"]
+    )
+
+
+async def wait_until_ready(
+    page: Page, page_type: str, budget: int = READINESS_BUDGET
+) -> bool:
+    """
+    Wait until a page's readiness predicate holds, timed as the "ready" stage
+
+    Args:
+        page: Playwright page object, navigated with wait_until="commit"
+        page_type: Key in PAGE_READINESS
+        budget: Most milliseconds to wait
+
+    Returns:
+        bool: True when the page became ready, False when the budget ran out
+    """
+    readiness = PAGE_READINESS[page_type]
+    with stage("ready", page_type=page_type):
+        try:
+            await page.wait_for_function(readiness.expression(), timeout=budget)
+            return True
+        except Exception as e:
+            logger.debug(f"{page_type} page not ready within {budget}ms: {e}")
+            return False
@@ -0,0 +1,206 @@
+"""
+LinkedIn Scraper - Offline Reprocessing Module
+Re-runs the cleaning and LLM extraction stages over HTML that was already
+fetched (files on disk or the HTML archive), without a browser
+"""
+
+import os
+import glob
+import time
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator, Optional
+
+from .config import REPROCESS_CONCURRENCY
+from .logging import get_logger
+from .storage.writer import get_writer
+
+logger = get_logger()
+
+
+@dataclass
+class SourcePage:
+    """A stored page to reprocess; either `path` or `html` is set."""
+
+    type: str
+    name: str
+    path: Optional[str] = None
+    html: Optional[str] = None
+
+
+def _infer_target(path, default_type=None):
+    """Guess type and name from `profile_<name>.html` or `profile/<name>.html`."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    for target_type in ("profile", "company"):
+        if stem.startswith(f"{target_type}_"):
+            return target_type, stem[len(target_type) + 1 :]
+    parent = os.path.basename(os.path.dirname(path))
+    if parent in ("profile", "company"):
+        return parent, stem
+    return default_type, stem
+
+
+def iter_html_files(pattern, default_type=None) -> Iterator[SourcePage]:
+    """
+    List stored HTML pages from a file, a directory or a glob pattern
+
+    Args:
+        pattern: File path, directory (searched recursively) or glob
+        default_type: Target type for files whose name does not tell
+
+    Yields:
+        SourcePage: One page per HTML file
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "**", "*.html")
+    for path in sorted(glob.iglob(pattern, recursive=True)):
+        target_type, name = _infer_target(path, default_type)
+        if target_type is None:
+            logger.debug(f"Skipping {path}: unknown target type")
+            continue
+        yield SourcePage(type=target_type, name=name, path=path)
+
+
+async def iter_archive_pages(
+    archive, target_type=None, name=None, since=None
+) -> AsyncIterator[SourcePage]:
+    """
+    List the newest archived page of each matching target
+
+    Pages are read and decompressed in a worker thread, one at a time as
+    they are consumed.
+
+    Args:
+        archive: HtmlArchive to read from
+        target_type: Only this target type
+        name: Only targets matching this glob
+        since: Only pages fetched at or after this timestamp
+
+    Yields:
+        SourcePage: One page per archived target
+    """
+    pages = await asyncio.to_thread(
+        archive.query,
+        target_type=target_type,
+        name_pattern=name,
+        since=since,
+        latest_only=True,
+    )
+    for page in pages:
+        html = await asyncio.to_thread(archive.get, page.sha256)
+        yield SourcePage(type=page.target_type, name=page.target_name, html=html)
+
+
+async def _iterate(pages) -> AsyncIterator[SourcePage]:
+    if hasattr(pages, "__aiter__"):
+        async for page in pages:
+            yield page
+    else:
+        for page in pages:
+            yield page
+
+
+def clean_page(path=None, html=None):
+    """
+    Cleaning stage, run in a worker process
+
+    Returns:
+        tuple: (main HTML, seconds spent cleaning)
+    """
+    from .main import extract_main_html
+
+    if html is None:
+        with open(path, "r", encoding="utf-8") as f:
+            html = f.read()
+    start = time.perf_counter()
+    main_html = extract_main_html(html)
+    return main_html, time.perf_counter() - start
+
+
+async def reprocess(
+    pages,
+    output_dir,
+    llm=True,
+    workers=None,
+    concurrency=REPROCESS_CONCURRENCY,
+):
+    """
+    Stream stored pages through cleaning and (optionally) LLM extraction
+
+    Cleaning runs in a process pool across cores; LLM calls run with at
+    most `concurrency` requests in flight.
+
+    Args:
+        pages: Iterable or async iterable of SourcePage
+        output_dir: Directory for `<type>_<name>.json` results
+        llm: Run LLM extraction, otherwise write the cleaned main HTML
+        workers: Cleaning processes, defaults to the number of cores
+        concurrency: Maximum concurrent LLM calls
+
+    Returns:
+        dict: Page counts and time spent per stage
+    """
+    from .llm_extractor import extract_company, extract_profile
+
+    os.makedirs(output_dir, exist_ok=True)
+    loop = asyncio.get_running_loop()
+    writer = get_writer()
+    workers = workers or os.cpu_count() or 1
+    llm_slots = asyncio.Semaphore(concurrency)
+    # Bound pages in flight so large inputs are streamed, not loaded at once
+    in_flight = asyncio.Semaphore(max(workers, concurrency) * 2)
+    stats = {
+        "pages": 0,
+        "written": 0,
+        "failed": 0,
+        "clean_seconds": 0.0,
+        "llm_seconds": 0.0,
+    }
+    start = time.perf_counter()
+
+    async def process(pool, page: SourcePage):
+        try:
+            main_html, clean_seconds = await loop.run_in_executor(
+                pool, clean_page, page.path, page.html
+            )
+            stats["clean_seconds"] += clean_seconds
+
+            if llm:
+                extract = extract_profile if page.type == "profile" else extract_company
+                async with llm_slots:
+                    llm_start = time.perf_counter()
+                    result = await asyncio.to_thread(extract, main_html)
+                    stats["llm_seconds"] += time.perf_counter() - llm_start
+            else:
+                result = {"main_html": main_html}
+
+            output_file = os.path.join(output_dir, f"{page.type}_{page.name}.json")
+            await writer.write_json(output_file, result, indent=True, wait=True)
+            stats["written"] += 1
+        except Exception as e:
+            logger.debug(f"Error reprocessing {page.type} {page.name}: {e}")
+            stats["failed"] += 1
+        finally:
+            in_flight.release()
+
+    # Spawned, not forked: this process already runs threads (the file
+    # writer, to_thread workers) whose locks a fork would copy mid-use
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=spawn) as pool:
+        tasks = set()
+        async for page in _iterate(pages):
+            await in_flight.acquire()
+            stats["pages"] += 1
+            task = asyncio.create_task(process(pool, page))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+
+    stats["wall_seconds"] = time.perf_counter() - start
+    logger.debug(
+        f"Reprocessed {stats['written']}/{stats['pages']} page(s) in "
+        f"{stats['wall_seconds']:.2f}s ({stats['failed']} failed)"
+    )
+    return stats
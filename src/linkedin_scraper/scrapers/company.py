@@ -1,14 +1,98 @@
 import os
-import json
 import random
 import asyncio
 from playwright.async_api import Page
+from ..config import COMPANY_SUBPAGES
 from ..logging import get_logger
-
-from ..config import LINKEDIN_URL
+from ..pacing import pace
+from ..pipeline import open_page, scrape_subpages, target_url
+from ..storage.archive import archive_page
+from ..storage.deltas import PARTIAL_KEY
+from ..storage.sinks import JsonFileSink
+from ..utils.stages import stage
 
 logger = get_logger()
 
+# Label/value pairs of the about page's details list, keyed by label
+ABOUT_DETAILS_SCRIPT = """() => {
+    const list = document.querySelector("main dl");
+    if (!list) return {};
+    const section = list.closest("section");
+    const overview = section && section.querySelector("p");
+    const details = {overview: overview ? overview.innerText.trim() : ""};
+    let label = null;
+    for (const node of list.children) {
+        const text = node.innerText.trim();
+        if (node.tagName === "DT") {
+            label = text;
+        } else if (node.tagName === "DD" && label && !(label in details)) {
+            details[label] = text;
+        }
+    }
+    return details;
+}"""
+
+JOBS_SCRIPT = """() => Array.from(
+    document.querySelectorAll(".org-jobs-recently-posted-jobs-module li")
+).map((card) => {
+    const title = card.querySelector(".job-card-square__title");
+    const location = card.querySelector(".job-card-container__metadata-wrapper");
+    return {
+        title: title ? title.innerText.trim() : "",
+        location: location ? location.innerText.trim() : "",
+        url: title && title.href ? title.href : "",
+    };
+})"""
+
+PEOPLE_SCRIPT = """() => {
+    const header = document.querySelector(".org-people__header-spacing-carousel");
+    const people = Array.from(
+        document.querySelectorAll(".org-people-profile-card")
+    ).map((card) => {
+        const name = card.querySelector(".org-people-profile-card__profile-title");
+        const headline = card.querySelector(".artdeco-entity-lockup__subtitle");
+        return {
+            name: name ? name.innerText.trim() : "",
+            headline: headline ? headline.innerText.trim() : "",
+        };
+    });
+    return {employees: header ? header.innerText.trim() : "", people: people};
+}"""
+
+# About page labels and the record fields they fill
+ABOUT_FIELDS = {
+    "overview": "overview",
+    "Website": "website",
+    "Industry": "industry",
+    "Company size": "company_size",
+    "Headquarters": "headquarters",
+    "Founded": "founded",
+    "Specialties": "specialties",
+}
+
+
+def split_specialties(text: str) -> list:
+    """
+    Split the about page's specialties into a list
+
+    Only commas separate items: "Research and Development" is one specialty,
+    and the "and" before the last item of "a, b, and c" is dropped.
+
+    Args:
+        text: Specialties as listed on the about page
+
+    Returns:
+        list: Specialties, without empty items
+    """
+    specialties = []
+    for item in text.split(","):
+        item = item.strip()
+        if item.lower().startswith("and "):
+            item = item[4:].strip()
+        if item:
+            specialties.append(item)
+    return specialties
+
 
 class CompanyScraper:
     """
@@ -16,23 +100,67 @@ class CompanyScraper:
     Focuses on scraping LinkedIn company profiles
     """
 
-    def __init__(self, data_dir):
+    # Sub-page name -> extractor method; the page is /company/<name>/<sub-page>/
+    # and its readiness predicate is PAGE_READINESS["company_<sub-page>"]
+    SUBPAGES = {
+        "about": "_extract_about",
+        "jobs": "_extract_jobs",
+        "people": "_extract_people",
+    }
+    # Record fields each sub-page fills
+    SUBPAGE_FIELDS = {
+        "about": list(ABOUT_FIELDS.values()),
+        "jobs": ["jobs"],
+        "people": ["employees_on_linkedin", "people"],
+    }
+
+    def __init__(
+        self,
+        data_dir,
+        subpages=COMPANY_SUBPAGES,
+        new_page=None,
+        deltas=None,
+        sink=None,
+        archive=None,
+    ):
         """
         Initialize the company profile scraper
 
         Args:
             data_dir: Directory to save data
+            subpages: Sub-pages (about, jobs, people) scraped concurrently with
+                the main page, a list or a comma separated string
+            new_page: Coroutine function opening a page in the job's context,
+                by default a bare page in the main page's context
+            deltas: DeltaStore recording what each scrape changed
+            sink: ResultSink the records are written to, by default one
+                JSON file per company in data_dir
+            archive: HtmlArchive the rendered company page is kept in
         """
         self.data_dir = data_dir
+        if isinstance(subpages, str):
+            subpages = [s.strip() for s in subpages.split(",") if s.strip()]
+        unknown = set(subpages) - set(self.SUBPAGES)
+        if unknown:
+            raise ValueError(f"Unknown company sub-pages: {', '.join(unknown)}")
+        self.subpages = list(subpages)
+        self.new_page = new_page
+        self.deltas = deltas
+        self.sink = sink or JsonFileSink(data_dir)
+        self.archive = archive
         os.makedirs(data_dir, exist_ok=True)
 
-    async def scrape_company_html(self, page: Page, company_name: str):
+    async def scrape_company_html(
+        self, page: Page, company_name: str, is_unchanged=None
+    ):
         """
         Scrape LinkedIn company profile
 
         Args:
             page: Playwright page object
             company_url: Company profile URL
+            is_unchanged: Optional check on the first screen's HTML; when it
+                returns True the page is not scrolled and None is returned
 
         Returns:
             str: Scraped company profile HTML
@@ -41,18 +169,22 @@ class CompanyScraper:
 
         # try:
         # Visit company page
-        company_url = f"{LINKEDIN_URL}/company/{company_name}/"
+        company_url = target_url("company", company_name)
 
-        await page.goto(company_url)
-        # await page.wait_for_load_state("networkidle")
+        # Commit early and wait for the top card rather than a fixed time
+        await open_page(page, company_url, "company")
 
-        # Ensure JavaScript execution completes
-        await page.wait_for_selector("body")
+        if is_unchanged is not None:
+            if is_unchanged(await page.content()):
+                logger.debug(f"Company {company_name} unchanged, skipping")
+                return None
 
         # Scroll the page to load more content
-        await self._scroll_page(page)
+        with stage("scroll"):
+            await self._scroll_page(page)
         # Get page content
-        page_content = await page.content()
+        with stage("content"):
+            page_content = await page.content()
         return page_content
 
     async def scrape_company(self, page: Page, company_name: str):
@@ -70,18 +202,33 @@ class CompanyScraper:
 
         # try:
         # Visit company page
-        company_url = f"{LINKEDIN_URL}/company/{company_name}/"
-
-        await page.goto(company_url)
-        # await page.wait_for_load_state("networkidle")
-
-        await self._random_sleep(1, 2)
-
-        # Ensure JavaScript execution completes
-        await page.wait_for_selector("body")
-
-        # Scroll the page to load more content
-        await self._scroll_page(page)
+        company_url = target_url("company", company_name)
+
+        async def scrape_main_page():
+            # Commit early and wait for the top card rather than a fixed time
+            await open_page(page, company_url, "company")
+            if not self.subpages:
+                # Scroll the page to load more content
+                with stage("scroll"):
+                    await self._scroll_page(page)
+            with stage("extract"):
+                return await self._extract_company_data(page)
+
+        # The sub-pages load next to the main page, each on a page of its own
+        subpage_task = asyncio.create_task(self._scrape_subpages(page, company_url))
+        try:
+            company_data = await scrape_main_page()
+        except BaseException:
+            # Without the main page there is no record; stop the sub-pages
+            subpage_task.cancel()
+            await asyncio.gather(subpage_task, return_exceptions=True)
+            raise
+        subpages = await subpage_task
+        for name in self.subpages:
+            company_data.update(subpages.get(name, {}))
+        failed = [name for name in self.subpages if name not in subpages]
+        if failed:
+            company_data[PARTIAL_KEY] = failed
         # Get page content
         # await self._random_sleep(0.5, 1)
         # await page.wait_for_selector("div#ember41", state="visible")
@@ -100,22 +247,112 @@ class CompanyScraper:
         # Print the obtained content
         # logger.debug(f"HTML Content: {html_content}")
 
-        await self._random_sleep(1.5, 2)
         # page_content = await page.content()
         # print(page_content)
 
-        # Extract company profile data
-        company_data = await self._extract_company_data(page)
-
         # Save data
         company_id = company_url.split("/company/")[-1].split("/")[0]
-        output_file = os.path.join(self.data_dir, f"company_{company_id}.json")
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(company_data, f, ensure_ascii=False, indent=2)
-
-        logger.debug(f"Company profile data saved to: {output_file}")
+        with stage("write"):
+            await self.sink.awrite("company", company_id, company_data)
+            if self.archive is not None:
+                await archive_page(self.archive, "company", company_id, page)
+
+        logger.debug(f"Company profile data saved to the {self.sink.name} sink")
+
+        if self.deltas is not None:
+            try:
+                with stage("write"):
+                    # Failed sub-pages keep their last known values
+                    await asyncio.to_thread(
+                        self.deltas.put,
+                        "company",
+                        company_id,
+                        company_data,
+                        partial=[
+                            field
+                            for name in failed
+                            for field in self.SUBPAGE_FIELDS[name]
+                        ],
+                    )
+            except Exception as e:
+                logger.debug(f"Error recording company changes: {e}")
         return company_data
 
+    async def _scrape_subpages(self, page: Page, company_url: str) -> dict:
+        """
+        Scrape the configured sub-pages concurrently
+
+        Args:
+            page: Main page, whose context the sub-pages open in
+            company_url: Company page URL, ending in a slash
+
+        Returns:
+            dict: Sub-page name -> fields it adds to the company record
+        """
+        if not self.subpages:
+            return {}
+        new_page = self.new_page or page.context.new_page
+        return await scrape_subpages(
+            new_page,
+            {
+                name: (
+                    f"{company_url}{name}/",
+                    f"company_{name}",
+                    getattr(self, self.SUBPAGES[name]),
+                )
+                for name in self.subpages
+            },
+        )
+
+    async def _extract_about(self, page: Page) -> dict:
+        """
+        Extract the about page's overview and details
+
+        Args:
+            page: Playwright page on /company/<name>/about/
+
+        Returns:
+            dict: Overview, website, industry, size, headquarters, founding
+                year and specialties, where listed
+        """
+        details = await page.evaluate(ABOUT_DETAILS_SCRIPT)
+        about = {
+            field: details[label]
+            for label, field in ABOUT_FIELDS.items()
+            if details.get(label)
+        }
+        if "specialties" in about:
+            about["specialties"] = split_specialties(about["specialties"])
+        return about
+
+    async def _extract_jobs(self, page: Page) -> dict:
+        """
+        Extract the recently posted jobs
+
+        Args:
+            page: Playwright page on /company/<name>/jobs/
+
+        Returns:
+            dict: Jobs with title, location and URL
+        """
+        return {"jobs": await page.evaluate(JOBS_SCRIPT)}
+
+    async def _extract_people(self, page: Page) -> dict:
+        """
+        Extract the employee count and the people listed
+
+        Args:
+            page: Playwright page on /company/<name>/people/
+
+        Returns:
+            dict: Employees on LinkedIn and people with name and headline
+        """
+        people = await page.evaluate(PEOPLE_SCRIPT)
+        return {
+            "employees_on_linkedin": people["employees"],
+            "people": people["people"],
+        }
+
     async def _extract_company_data(self, page: Page):
         """
         Extract data from LinkedIn company page
@@ -222,7 +459,7 @@ class CompanyScraper:
                 )
 
                 # Random pause to simulate reading
-                await self._random_sleep(0.5, 2)
+                await pace("scroll")
 
                 # Occasionally scroll up a bit to simulate reviewing content
                 if random.random() < 0.3 and i > 0:
@@ -234,7 +471,7 @@ class CompanyScraper:
                         }}
                     }}"""
                     )
-                    await self._random_sleep(0.5, 1.5)
+                    await pace("scroll")
                     await page.evaluate(
                         f"""() => {{
                         if (typeof window.scrollTo === 'function') {{
@@ -242,7 +479,7 @@ class CompanyScraper:
                         }}
                     }}"""
                     )
-                    await self._random_sleep(0.5, 1.5)
+                    await pace("scroll")
 
             # Scroll back to top
             await page.evaluate(
@@ -252,17 +489,7 @@ class CompanyScraper:
                 }
             }"""
             )
-            await self._random_sleep(1, 2)
+            await pace("scroll")
         except Exception as e:
             logger.debug(f"Error scrolling page: {e}")
             # Continue execution, do not let scroll error affect overall scraping
-
-    async def _random_sleep(self, min_seconds=1, max_seconds=5):
-        """
-        Randomly wait for a period of time to simulate human behavior
-
-        Args:
-            min_seconds: Minimum wait seconds
-            max_seconds: Maximum wait seconds
-        """
-        await asyncio.sleep(random.uniform(min_seconds, max_seconds))
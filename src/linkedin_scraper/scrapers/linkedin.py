@@ -1,5 +1,6 @@
-import json
-import httpx
+import asyncio
+from contextlib import asynccontextmanager
+
 from playwright.async_api import async_playwright
 
 from ..config import (
@@ -10,13 +11,22 @@ from ..config import (
     PROXY,
     DEFAULT_TIMEOUT,
     DATA_DIR,
-    LINKEDIN_COOKIES,
     HEADLESS,
     LINKEDIN_URL,
     COOKIES_PATH,
+    HAR_MODE,
+    RECORD_DELTAS,
+    RESULT_SINK,
+    ARCHIVE_PAGES,
 )
 from ..auth_handler import LinkedInAuthHandler
 from ..anti_detection import AntiDetectionHandler
+from ..session import SessionStore, get_env_cookies
+from ..har import HarSession
+from ..lifecycle import ContextLifecycle, PageCrashed
+from ..metrics import BROWSER_CONTEXTS, CONTEXT_RECYCLES, RETRIES
+from ..pacing import pacing_job
+from ..storage.sinks import ResultSink, open_sink
 from .profile import ProfileScraper
 from .company import CompanyScraper
 from ..logging import debug, error
@@ -25,12 +35,27 @@ from ..logging import debug, error
 class LinkedInScraper:
     """Main LinkedIn scraper class that orchestrates the scraping process."""
 
-    def __init__(self, headless=None) -> None:
-        """Initialize the LinkedIn scraper."""
+    def __init__(
+        self, headless=None, har_mode=None, deltas=None, sink=None, archive=None
+    ) -> None:
+        """
+        Initialize the LinkedIn scraper.
+
+        Args:
+            headless: Run the browser headless, defaults to HEADLESS
+            har_mode: "off", "record" or "replay", defaults to HAR_MODE
+            deltas: DeltaStore for scraped records, one is opened when
+                RECORD_DELTAS is set
+            sink: ResultSink for scraped records, or the name of one to open
+                (json, ndjson, parquet, sqlite), defaults to RESULT_SINK
+            archive: HtmlArchive the rendered pages are kept in, one is
+                opened when ARCHIVE_PAGES is set
+        """
         self.playwright = None
         self.browser = None
         self.context = None
         self.page = None
+        self.owns_browser = True
         self.headless = headless if headless is not None else HEADLESS
         self.anti_detection = AntiDetectionHandler()
         self.auth_handler = LinkedInAuthHandler(
@@ -38,26 +63,69 @@ class LinkedInScraper:
             password=LINKEDIN_PASSWORD,
             cookies_path=COOKIES_PATH,
         )
+        self.session = SessionStore()
+        self.har = HarSession(mode=har_mode or HAR_MODE)
+        self.lifecycle = ContextLifecycle()
+        # Pacer of a job whose page a Prefetcher already started loading
+        self.prefetch_pacer = None
+        self.owns_deltas = deltas is None and RECORD_DELTAS
+        if self.owns_deltas:
+            from ..storage.deltas import DeltaStore
 
-    async def initialize_browser(self) -> None:
-        """Initialize browser and apply stealth techniques."""
-        # Initialize Playwright
-        self.playwright = await async_playwright().start()
+            deltas = DeltaStore()
+        self.deltas = deltas
+        self.owns_sink = not isinstance(sink, ResultSink)
+        if self.owns_sink:
+            sink = open_sink(sink or RESULT_SINK, DATA_DIR)
+        self.sink = sink
+        self.owns_archive = archive is None and ARCHIVE_PAGES
+        if self.owns_archive:
+            from ..storage.archive import open_archive
 
-        # Get browser launch options
-        browser_options = self.anti_detection.get_browser_launch_options(
-            use_proxy=bool(PROXY), proxy_url=PROXY
-        )
+            archive = open_archive()
+        self.archive = archive
 
-        # Launch browser
-        self.browser = await self.playwright.chromium.launch(
-            headless=self.headless,
-            slow_mo=SLOW_MO,  # Control browser operation delay (ms)
-            args=browser_options.get("args", []),
-        )
+    async def initialize_browser(self, browser=None) -> None:
+        """
+        Initialize browser and apply stealth techniques.
+
+        Args:
+            browser: Already launched browser to open the context in; it
+                stays owned by the caller and is not closed by cleanup()
+        """
+        if browser is not None:
+            self.browser = browser
+            self.owns_browser = False
+        else:
+            # Initialize Playwright
+            self.playwright = await async_playwright().start()
+
+            # Get browser launch options
+            browser_options = self.anti_detection.get_browser_launch_options(
+                use_proxy=bool(PROXY), proxy_url=PROXY
+            )
 
+            # Launch browser
+            self.browser = await self.playwright.chromium.launch(
+                headless=self.headless,
+                slow_mo=SLOW_MO,  # Control browser operation delay (ms)
+                args=browser_options.get("args", []),
+            )
+
+        self.context, self.page = await self.new_context()
+
+    async def new_context(self, **options):
+        """
+        Create a browser context and page with the scraper's settings.
+
+        Args:
+            options: Extra browser.new_context() options
+
+        Returns:
+            tuple: (context, page)
+        """
         # Create browser context
-        self.context = await self.browser.new_context(
+        context = await self.browser.new_context(
             user_agent=USER_AGENT,
             viewport={"width": 1920, "height": 1080},
             screen={"width": 1920, "height": 1080},
@@ -66,144 +134,281 @@ class LinkedInScraper:
             has_touch=False,
             locale="zh-CN",
             timezone_id="Asia/Shanghai",
+            # Start already authenticated when a session has been saved
+            **self.session.context_options(),
+            **options,
         )
 
         # Set default timeout
         # self.context.set_default_timeout(DEFAULT_TIMEOUT)
         # debug(f"DEFAULT_TIMEOUT: {DEFAULT_TIMEOUT}")
-        self.context.set_default_timeout(DEFAULT_TIMEOUT)
+        context.set_default_timeout(DEFAULT_TIMEOUT)
+        BROWSER_CONTEXTS.inc()
+        context.on("close", lambda _: BROWSER_CONTEXTS.dec())
 
         # Create new page
-        self.page = await self.context.new_page()
+        page = await context.new_page()
+        self.lifecycle.watch(page)
 
         # Apply stealth techniques
-        await self.apply_stealth_techniques()
+        await self.apply_stealth_techniques(context, page)
+        return context, page
+
+    async def new_page(self):
+        """
+        Open another page in the current context, set up like the first.
+
+        Returns:
+            Page: The new page
+        """
+        page = await self.context.new_page()
+        self.lifecycle.watch(page)
+        await self.apply_stealth_techniques(self.context, page)
+        return page
+
+    @asynccontextmanager
+    async def job(self, job_name: str):
+        """
+        Run one scrape job, in its own context when recording or replaying.
+
+        In record mode the job's traffic is written to its HAR when the
+        context closes; in replay mode the context is served from that HAR.
+
+        Args:
+            job_name: Job identifier, also names the HAR file
+        """
+        if not self.har.enabled:
+            yield self.page
+            return
+        previous = (self.context, self.page)
+        context, page = await self.new_context(**self.har.context_options(job_name))
+        self.context, self.page = context, page
+        try:
+            await self.har.attach(context, job_name)
+            yield page
+        finally:
+            self.context, self.page = previous
+            await context.close()
+
+    async def recycle_context(self, reason: str) -> None:
+        """
+        Replace the scraper's context and page with fresh ones.
+
+        Args:
+            reason: Why, e.g. "jobs", "rss" or "crash"
+        """
+        debug(f"Recycling browser context after {self.lifecycle.jobs} jobs ({reason})")
+        CONTEXT_RECYCLES.inc(reason=reason)
+        worn_out = reason in ("jobs", "rss")
+        if worn_out and self.session.exists():
+            # Carry over the cookies LinkedIn refreshed during this context
+            try:
+                await self.session.save(self.context, validated=False)
+            except Exception as e:
+                debug(f"Could not save storage state before recycling: {e}")
+        try:
+            await self.context.close()
+        except Exception as e:
+            debug(f"Error closing recycled context: {e}")
+        self.context, self.page = await self.new_context()
+        self.lifecycle.reset()
+
+    async def run_job(self, job_name: str, run):
+        """
+        Run a scrape job, replacing worn out contexts and broken pages.
+
+        Before the job the context is recycled when it has served too many
+        jobs or the browser is over its memory limit. When the page crashed
+        or hung during the job, it is replaced and the job runs again.
+
+        Args:
+            job_name: Job identifier
+            run: Coroutine function taking the page, returning the result
+
+        Returns:
+            The result of `run`
 
-    async def apply_stealth_techniques(self) -> None:
+        Raises:
+            PageCrashed: The page failed on every attempt
+        """
+        attempts = self.lifecycle.max_attempts
+        # Replayed jobs answer from recordings, delays would only slow them
+        profile = "none" if self.har.mode == "replay" else None
+        pacer, self.prefetch_pacer = self.prefetch_pacer, None
+        with pacing_job(profile, pacer=pacer):
+            for attempt in range(1, attempts + 1):
+                # Jobs recorded or replayed get a context of their own anyway
+                if not self.har.enabled:
+                    reason = await self.lifecycle.recycle_reason()
+                    if reason:
+                        await self.recycle_context(reason)
+
+                result, exception = None, None
+                async with self.job(job_name) as page:
+                    try:
+                        result = await run(page)
+                    except Exception as e:
+                        exception = e
+                    failure = await self.lifecycle.page_failed(page)
+
+                if failure is None:
+                    self.lifecycle.job_done()
+                    if exception is not None:
+                        raise exception
+                    return result
+
+                if not self.har.enabled:
+                    await self.recycle_context(failure)
+                if attempt == attempts:
+                    raise PageCrashed(
+                        f"Page {failure} during {job_name} "
+                        f"on all {attempts} attempts"
+                    ) from exception
+                RETRIES.inc(tier="browser")
+                debug(
+                    f"Page {failure} during {job_name}, requeueing on a fresh page"
+                )
+
+    async def apply_stealth_techniques(self, context=None, page=None) -> None:
         """Apply stealth techniques to evade detection."""
         from undetected_playwright import stealth_async
 
+        context = context or self.context
+        page = page or self.page
         # Apply stealth mode to bypass anti-bot detection
-        await stealth_async(self.page)
+        await stealth_async(page)
         # Apply additional anti-detection techniques
-        await self.anti_detection.apply_stealth_techniques(self.context, self.page)
+        await self.anti_detection.apply_stealth_techniques(context, page)
 
     async def login(self) -> bool:
         """Handle LinkedIn login process."""
         login_success = False
 
-        # Try to login with cookies from environment variable first
-        if LINKEDIN_COOKIES:
+        # Replayed jobs get their logged-in pages from the recording
+        if self.har.mode == "replay":
+            debug("Replaying recorded HARs, skipping login")
+            return True
+
+        # A recently validated storage state needs no round trip at all
+        if self.session.is_fresh():
+            debug("Reusing fresh session from storage state")
+            return True
+
+        # A stale storage state is already loaded in the context, check it
+        if self.session.exists():
+            await self.page.goto(LINKEDIN_URL, wait_until="domcontentloaded")
+            if await self.auth_handler.is_logged_in(self.page):
+                debug("Login successful using saved storage state")
+                await self.session.save(self.context)
+                return True
+            debug("Saved storage state is no longer logged in")
+            self.session.invalidate()
+
+        # Try to login with cookies from environment variable next
+        env_cookies = get_env_cookies()
+        if env_cookies:
             debug(
                 "Detected environment variable LINKEDIN_COOKIES, "
                 "will try to use it for login..."
             )
             try:
-                # Handle both JSON format and cookie string format
-                try:
-                    # Try parsing as JSON first
-                    cookies = json.loads(LINKEDIN_COOKIES)
-                except json.JSONDecodeError:
-                    # If not JSON, parse as cookie string
-                    cookies = []
-                    cookie_pairs = LINKEDIN_COOKIES.split(";")
-                    for pair in cookie_pairs:
-                        if "=" in pair:
-                            name, value = pair.strip().split("=", 1)
-                            if value.startswith('"') and value.endswith('"'):
-                                value = value[1:-1]
-                            cookies.append(
-                                {
-                                    "name": name,
-                                    "value": value,
-                                    "domain": ".linkedin.com",
-                                    "path": "/",
-                                }
-                            )
-
-                await self.context.add_cookies(cookies)
-
-                await self.page.goto(LINKEDIN_URL, waitUntil="domcontentloaded")
+                await self.context.add_cookies(env_cookies)
+
+                await self.page.goto(LINKEDIN_URL, wait_until="domcontentloaded")
 
                 if await self.auth_handler.is_logged_in(self.page):
                     debug("Login successful using environment variable cookies")
+                    await self.session.save(self.context)
                     login_success = True
                 else:
                     debug(
                         "Environment variable cookies are invalid, "
                         "will try account password login"
                     )
-                login_success = True
             except Exception as e:
                 error_msg = (
                     f"Environment variable cookies format error or "
                     f"injection failed: {e}"
                 )
-                debug(f"{error_msg}, cookies: {cookies}")
+                debug(f"{error_msg}, cookies: {env_cookies}")
                 error(f"{error_msg}, will try account password login")
 
         # If cookies login failed, try account login
         if not login_success:
             # debug("Will use account password login")
             login_success = await self.auth_handler.login(self.page, self.context)
+            if login_success:
+                await self.session.save(self.context)
 
         return login_success
 
-    async def scrape_profile(self, profile_name: str) -> None:
-        """Scrape a LinkedIn profile."""
-        profile_scraper = ProfileScraper(data_dir=DATA_DIR)
-        await profile_scraper.scrape_profile(self.page, profile_name)
+    async def scrape_profile(self, profile_name: str) -> dict:
+        """Scrape a LinkedIn profile and its section detail pages."""
+        profile_scraper = ProfileScraper(
+            data_dir=DATA_DIR,
+            new_page=self.new_page,
+            deltas=self.deltas,
+            sink=self.sink,
+            archive=self.archive,
+        )
+        return await self.run_job(
+            f"profile_{profile_name}",
+            lambda page: profile_scraper.scrape_profile(page, profile_name),
+        )
 
-    async def scrape_profile_html(self, profile_name: str) -> str:
+    async def scrape_profile_html(self, profile_name: str, is_unchanged=None) -> str:
         """Scrape a LinkedIn profile."""
         profile_scraper = ProfileScraper(data_dir=DATA_DIR)
-        return await profile_scraper.scrape_profile_html(self.page, profile_name)
+        return await self.run_job(
+            f"profile_{profile_name}",
+            lambda page: profile_scraper.scrape_profile_html(
+                page, profile_name, is_unchanged
+            ),
+        )
 
-    async def scrape_company(self, company_name: str) -> None:
-        """Scrape a LinkedIn company profile."""
-        company_scraper = CompanyScraper(data_dir=DATA_DIR)
-        await company_scraper.scrape_company(self.page, company_name)
+    async def scrape_company(self, company_name: str) -> dict:
+        """Scrape a LinkedIn company profile and its sub-pages."""
+        company_scraper = CompanyScraper(
+            data_dir=DATA_DIR,
+            new_page=self.new_page,
+            deltas=self.deltas,
+            sink=self.sink,
+            archive=self.archive,
+        )
+        return await self.run_job(
+            f"company_{company_name}",
+            lambda page: company_scraper.scrape_company(page, company_name),
+        )
 
-    async def scrape_company_html(self, company_name: str) -> str:
+    async def scrape_company_html(self, company_name: str, is_unchanged=None) -> str:
         """Scrape a LinkedIn company profile."""
         company_scraper = CompanyScraper(data_dir=DATA_DIR)
-        return await company_scraper.scrape_company_html(self.page, company_name)
+        return await self.run_job(
+            f"company_{company_name}",
+            lambda page: company_scraper.scrape_company_html(
+                page, company_name, is_unchanged
+            ),
+        )
 
     async def cleanup(self) -> None:
         """Close browser and Playwright."""
+        if self.owns_deltas:
+            self.deltas.close()
+            self.owns_deltas = False
+        if self.owns_sink:
+            # Buffered records are written out before the process goes away,
+            # waiting on the writer thread without blocking the event loop
+            await asyncio.to_thread(self.sink.close)
+        if self.owns_archive and self.archive is not None:
+            self.archive.close()
+            self.owns_archive = False
+        if not self.owns_browser:
+            # Only the context belongs to us when the browser is shared
+            if self.context:
+                await self.context.close()
+            return
         if self.browser:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
 
-
-def get_profile_html(profile_name: str) -> str:
-    """Get the HTML content of a LinkedIn profile."""
-    url = f"https://www.linkedin.com/in/{profile_name}"
-    # load cookies from file
-    with open(COOKIES_PATH, "r") as f:
-        cookies = json.load(f)
-
-    # Create cookie jar and client
-    cookies_jar = httpx.Cookies()
-    for cookie in cookies:
-        cookies_jar.set(
-            cookie["name"],
-            cookie["value"],
-            domain=cookie["domain"],
-            path=cookie.get("path", "/"),
-        )
-
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,"
-        "image/webp,image/apng,*/*;q=0.8,"
-        "application/signed-exchange;v=b3;q=0.9",
-        "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6",
-    }
-
-    # Create client with cookies
-    client = httpx.Client(cookies=cookies_jar, headers=headers)
-    response = client.get(url)
-
-    return response.text
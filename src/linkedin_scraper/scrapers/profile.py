@@ -1,13 +1,35 @@
-import json
 import os
+import time
 import random
 import asyncio
+from functools import partial
 from playwright.async_api import Page
 from ..logging import get_logger
-from ..config import LINKEDIN_URL, DEFAULT_TIMEOUT
+from ..pacing import pace
+from ..tracing import span
+from ..pipeline import open_page, scrape_subpages, target_url
+from ..storage.archive import archive_page
+from ..storage.deltas import PARTIAL_KEY
+from ..storage.sinks import JsonFileSink
+from ..utils.stages import stage
+from ..config import DEFAULT_TIMEOUT, PROFILE_DETAIL_SECTIONS, SECTION_TIMEOUT
 
 logger = get_logger()
 
+# Detail pages list a section without the anchor the profile page gives it;
+# put the id back on the list's section so the section extractors apply as is
+ANCHOR_DETAIL_SECTION_SCRIPT = """
+(id) => {
+    const list = document.querySelector("main section ul.pvs-list");
+    const section = list
+        ? list.closest("section")
+        : document.querySelector("main section");
+    if (section && !section.id) {
+        section.id = id;
+    }
+}
+"""
+
 
 class ProfileScraper:
     """
@@ -15,42 +37,116 @@ class ProfileScraper:
     Focuses on scraping LinkedIn user and company profiles
     """
 
-    def __init__(self, data_dir):
+    # Values used for a section whose extractor failed or timed out
+    SECTION_DEFAULTS = {
+        "basic_info": {
+            "name": "Name not found",
+            "headline": "Position not found",
+            "location": "Location not found",
+            "company": "",
+            "education": "",
+        },
+        "contact_info": {"contact_info": {}},
+        "about": {"about": "About information not found"},
+        "experience": {"experiences": []},
+        "education": {"educations": []},
+        "skills": {"skills": []},
+        "certifications": {"certifications": []},
+        "languages": {"languages": []},
+    }
+
+    # Sections with a detail page of their own, by section: extractor
+    DETAIL_SECTIONS = {
+        "experience": "_extract_experience",
+        "education": "_extract_education",
+        "skills": "_extract_skills",
+        "certifications": "_extract_certifications",
+        "languages": "_extract_languages",
+    }
+
+    def __init__(
+        self,
+        data_dir,
+        concurrent_sections=True,
+        section_timeout=None,
+        detail_sections=PROFILE_DETAIL_SECTIONS,
+        new_page=None,
+        deltas=None,
+        sink=None,
+        archive=None,
+    ):
         """
         Initialize the profile scraper
 
         Args:
             data_dir: Directory to save data
+            concurrent_sections: Run the section extractors concurrently
+            section_timeout: Per-section timeout in milliseconds
+            detail_sections: Sections read from their detail pages, loaded
+                concurrently with the profile page, a list or a comma
+                separated string
+            new_page: Coroutine function opening a page in the job's context,
+                by default a bare page in the profile page's context
+            deltas: DeltaStore recording what each scrape changed
+            sink: ResultSink the records are written to, by default one
+                JSON file per profile in data_dir
+            archive: HtmlArchive the rendered profile page is kept in
         """
         self.data_dir = data_dir
         self.profile_name = None
+        self.concurrent_sections = concurrent_sections
+        self.section_timeout = (
+            section_timeout if section_timeout is not None else SECTION_TIMEOUT
+        )
+        if isinstance(detail_sections, str):
+            detail_sections = [
+                s.strip() for s in detail_sections.split(",") if s.strip()
+            ]
+        unknown = set(detail_sections) - set(self.DETAIL_SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown profile detail sections: {', '.join(unknown)}")
+        self.detail_sections = list(detail_sections)
+        # Sections of the current scrape that timed out or failed
+        self.failed_sections = set()
+        self.new_page = new_page
+        self.deltas = deltas
+        self.sink = sink or JsonFileSink(data_dir)
+        self.archive = archive
         os.makedirs(data_dir, exist_ok=True)
 
-    async def scrape_profile_html(self, page: Page, profile_name: str):
+    async def scrape_profile_html(
+        self, page: Page, profile_name: str, is_unchanged=None
+    ):
         """
         Scrape LinkedIn profile data
 
         Args:
             page: Playwright page object
             profile_url: Profile URL
+            is_unchanged: Optional check on the first screen's HTML; when it
+                returns True the profile is not scrolled and None is returned
 
         Returns:
             str: Scraped    HTML
         """
         self.profile_name = profile_name
-        profile_url = f"{LINKEDIN_URL}/in/{profile_name}"
+        profile_url = target_url("profile", profile_name)
         try:
             logger.debug("step1: goto")
-            await page.goto(
-                profile_url, timeout=DEFAULT_TIMEOUT, wait_until="domcontentloaded"
-            )
-            # await self._random_sleep(1, 2)
+            await open_page(page, profile_url, "profile")
+
+            if is_unchanged is not None:
+                if is_unchanged(await page.content()):
+                    logger.debug(f"Profile {profile_name} unchanged, skipping")
+                    return None
 
             logger.debug("step3: scroll page")
-            await self._scroll_page(page)
+            with stage("scroll"):
+                await self._scroll_page(page)
 
             logger.debug("step5: save data")
-            html = await page.content()
+            with stage("content"):
+                html = await page.content()
             return html
 
         except Exception as e:
@@ -69,13 +165,16 @@ class ProfileScraper:
             dict: Scraped profile data
         """
         self.profile_name = profile_name
-        profile_url = f"{LINKEDIN_URL}/in/{profile_name}"
+        self.failed_sections = set()
+        profile_url = target_url("profile", profile_name)
+        details = None
         try:
+            if self.detail_sections:
+                # The detail pages load next to the profile page
+                details = asyncio.ensure_future(self._scrape_details(page))
+
             logger.debug("step1: goto")
-            await page.goto(
-                profile_url, timeout=DEFAULT_TIMEOUT, wait_until="domcontentloaded"
-            )
-            # await self._random_sleep(1, 2)
+            await open_page(page, profile_url, "profile")
 
             # Check if page loaded successfully
             if await page.title() == "":
@@ -88,12 +187,17 @@ class ProfileScraper:
 
             #     return {"error": "Need to log in to LinkedIn first"}
 
-            logger.debug("step3: scroll page")
-            await self._scroll_page(page)
+            if details is None:
+                logger.debug("step3: scroll page")
+                with stage("scroll"):
+                    await self._scroll_page(page)
 
             logger.debug("step4: extract profile data")
 
-            profile_data = await self._extract_profile_data(page)
+            profile_data = await self._extract_profile_data(page, details)
+            if self.archive is not None:
+                with stage("write"):
+                    await archive_page(self.archive, "profile", profile_name, page)
 
             logger.debug("step5: save data")
             logger.debug(profile_data)
@@ -102,56 +206,176 @@ class ProfileScraper:
         except Exception as e:
             logger.debug(f"Error scraping profile: {e}")
             return {"error": str(e)}
+        finally:
+            if details is not None and not details.done():
+                details.cancel()
 
-    async def _extract_profile_data(self, page: Page):
+    async def _extract_profile_data(self, page: Page, details=None):
         """
         Extract profile data from LinkedIn profile page
 
         Args:
             page: Playwright page object
+            details: Awaitable of the detail sections from _scrape_details;
+                those sections are then not read from the profile page
 
         Returns:
             dict: Extracted profile data
         """
         profile_data = {}
 
-        # Extract basic information
-        await self._extract_basic_info(page, profile_data)
-
-        # Extract about information
-        # await self._extract_about_info(page, profile_data)
-
-        # Extract work experience
-        # await self._extract_experience(page, profile_data)
-
-        # # Extract education
-        # await self._extract_education(page, profile_data)
+        sections = [
+            ("basic_info", self._extract_basic_info),
+            ("about", self._extract_about_info),
+            ("experience", self._extract_experience),
+            ("education", self._extract_education),
+            ("skills", self._extract_skills),
+            ("certifications", self._extract_certifications),
+            ("languages", self._extract_languages),
+        ]
+        if details is not None:
+            sections = [s for s in sections if s[0] not in self.detail_sections]
+
+        # Every section reads from the same page, so they can run side by
+        # side; each one is bounded and isolated by _run_section
+        with stage("extract"):
+            if self.concurrent_sections:
+                results = await asyncio.gather(
+                    *(self._run_section(page, name, fn) for name, fn in sections)
+                )
+            else:
+                results = [
+                    await self._run_section(page, name, fn) for name, fn in sections
+                ]
+            # Opening the contact dialog covers the page, so it comes last
+            results.append(
+                await self._run_section(
+                    page, "contact_info", self._extract_contact_info
+                )
+            )
 
-        # # Extract skills
-        # await self._extract_skills(page, profile_data)
+        if details is not None:
+            # Whatever the detail pages still need after the main extraction
+            with stage("details"):
+                detail_data = await details
+            for name in self.detail_sections:
+                if name not in detail_data:
+                    self.failed_sections.add(name)
+                results.append(
+                    detail_data.get(name) or dict(self.SECTION_DEFAULTS[name])
+                )
 
-        # # Extract certifications
-        # await self._extract_certifications(page, profile_data)
+        for section_data in results:
+            profile_data.update(section_data)
+        if self.failed_sections:
+            profile_data[PARTIAL_KEY] = sorted(self.failed_sections)
 
-        # # Extract languages
-        # await self._extract_languages(page, profile_data)
         # Save data
         try:
-            # Extract profile ID from URL
-            output_file = os.path.join(
-                self.data_dir, f"profile_{self.profile_name}.json"
-            )
-            logger.debug(f"Creating output file path: {output_file}")
-
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(profile_data, f, ensure_ascii=False, indent=2)
-            logger.debug(f"Profile data saved to: {output_file}")
+            with stage("write"):
+                await self.sink.awrite("profile", self.profile_name, profile_data)
+            logger.debug(f"Profile data saved to the {self.sink.name} sink")
 
         except Exception as e:
             logger.debug(f"Error saving profile data: {e}")
 
+        if self.deltas is not None:
+            try:
+                with stage("write"):
+                    # Failed sections keep their last known values
+                    await asyncio.to_thread(
+                        self.deltas.put,
+                        "profile",
+                        self.profile_name,
+                        profile_data,
+                        partial=[
+                            field
+                            for name in self.failed_sections
+                            for field in self.SECTION_DEFAULTS[name]
+                        ],
+                    )
+            except Exception as e:
+                logger.debug(f"Error recording profile changes: {e}")
+
         return profile_data
 
+    async def _scrape_details(self, page: Page) -> dict:
+        """
+        Scrape the configured detail pages concurrently
+
+        Args:
+            page: Profile page, whose context the detail pages open in
+
+        Returns:
+            dict: Section name -> section data, without the pages that failed
+        """
+        new_page = self.new_page or page.context.new_page
+        profile_url = target_url("profile", self.profile_name)
+        return await scrape_subpages(
+            new_page,
+            {
+                name: (
+                    f"{profile_url}/details/{name}/",
+                    f"profile_{name}",
+                    partial(self._extract_detail, name),
+                )
+                for name in self.detail_sections
+            },
+        )
+
+    async def _extract_detail(self, name: str, page: Page) -> dict:
+        """
+        Extract one section from its detail page
+
+        Args:
+            name: Section name, a key of DETAIL_SECTIONS
+            page: Playwright page on /in/<name>/details/<section>/
+
+        Returns:
+            dict: Extracted section data, completed with defaults
+        """
+        await page.evaluate(ANCHOR_DETAIL_SECTION_SCRIPT, name)
+        extractor = getattr(self, self.DETAIL_SECTIONS[name])
+        return await self._run_section(page, name, extractor)
+
+    async def _run_section(self, page: Page, name: str, extractor):
+        """
+        Run one section extractor with a timeout and failure isolation
+
+        Args:
+            page: Playwright page object
+            name: Section name, used as key into SECTION_DEFAULTS
+            extractor: Coroutine function filling a section data dictionary
+
+        Returns:
+            dict: Extracted section data, completed with defaults
+        """
+        section_data = {}
+        start = time.perf_counter()
+        with span(f"extract.{name}") as section_span:
+            try:
+                await asyncio.wait_for(
+                    extractor(page, section_data), timeout=self.section_timeout / 1000
+                )
+            except asyncio.TimeoutError:
+                self.failed_sections.add(name)
+                logger.debug(f"Section {name} timed out after {self.section_timeout}ms")
+                if section_span is not None:
+                    section_span.set_attribute("timed_out", True)
+            except Exception as e:
+                self.failed_sections.add(name)
+                logger.debug(f"Error extracting section {name}: {e}")
+                if section_span is not None:
+                    section_span.add_event("error", message=str(e))
+
+        # Keep whatever was extracted before a failure, fill in the rest
+        for key, value in self.SECTION_DEFAULTS.get(name, {}).items():
+            section_data.setdefault(key, value)
+
+        elapsed = time.perf_counter() - start
+        logger.debug(f"Section {name} extracted in {elapsed:.2f}s")
+        return section_data
+
     async def _extract_basic_info(self, page: Page, profile_data: dict):
         """
         Extract basic information
@@ -255,12 +479,24 @@ class ProfileScraper:
         except Exception as e:
             logger.debug(f"Error extracting education information: {e}")
             profile_data["education"] = "Education information not found"
+
+    async def _extract_contact_info(self, page: Page, profile_data: dict):
+        """
+        Extract contact information from its dialog
+
+        The dialog overlays the profile page, so this runs on its own once
+        the other sections have been read.
+
+        Args:
+            page: Playwright page object
+            profile_data: Profile data dictionary
+        """
         try:
             # Click "Contact Information" button
             contact_button = page.locator('a[href="#contact-info"]')
             if await contact_button.count() > 0:
                 await contact_button.click()
-                await self._random_sleep(1, 2)
+                await pace("click")
 
                 # Extract contact information
                 contact_info = {}
@@ -308,7 +544,7 @@ class ProfileScraper:
                 )
                 if await close_button.count() > 0:
                     await close_button.click()
-                    await self._random_sleep(1, 2)
+                    await pace("click")
         except Exception as e:
             logger.debug(f"Error extracting contact information: {e}")
             profile_data["contact_info"] = {}
@@ -934,7 +1170,7 @@ class ProfileScraper:
                 )
 
                 # Random pause, simulating reading
-                await self._random_sleep(0.5, 2)
+                await pace("scroll")
 
                 # Occasionally scroll up a little, simulating looking back at content
                 if random.random() < 0.3 and i > 0:
@@ -946,7 +1182,7 @@ class ProfileScraper:
                         }}
                     }}"""
                     )
-                    await self._random_sleep(0.5, 1.5)
+                    await pace("scroll")
                     await page.evaluate(
                         f"""() => {{
                         if (typeof window.scrollTo === 'function') {{
@@ -954,7 +1190,7 @@ class ProfileScraper:
                         }}
                     }}"""
                     )
-                    await self._random_sleep(0.5, 1.5)
+                    await pace("scroll")
 
             # Scroll back to top
             await page.evaluate(
@@ -964,17 +1200,7 @@ class ProfileScraper:
                 }
             }"""
             )
-            await self._random_sleep(1, 2)
+            await pace("scroll")
         except Exception as e:
             logger.debug(f"Error scrolling page: {e}")
             # Continue execution, do not let scroll error affect overall scraping
-
-    async def _random_sleep(self, min_seconds=1, max_seconds=5):
-        """
-        Randomly wait for a while, simulating human behavior
-
-        Args:
-            min_seconds: Minimum wait seconds
-            max_seconds: Maximum wait seconds
-        """
-        await asyncio.sleep(random.uniform(min_seconds, max_seconds))
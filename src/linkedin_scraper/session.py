@@ -0,0 +1,152 @@
+"""
+LinkedIn Scraper - Session Store Module
+Persists Playwright storage state (cookies plus localStorage) between runs
+"""
+
+import os
+import json
+import time
+from functools import lru_cache
+from pathlib import Path
+from playwright.async_api import BrowserContext
+from .config import (
+    LINKEDIN_COOKIE_DOMAIN,
+    LINKEDIN_COOKIES,
+    SESSION_TTL,
+    STORAGE_STATE_PATH,
+)
+from .logging import get_logger
+
+logger = get_logger()
+
+
+@lru_cache(maxsize=None)
+def parse_cookies(raw_cookies: str):
+    """
+    Parse cookies given as a JSON list or as a "name=value; ..." string
+
+    Args:
+        raw_cookies: Raw cookie configuration
+
+    Returns:
+        tuple: Cookie dictionaries accepted by BrowserContext.add_cookies
+    """
+    try:
+        return tuple(json.loads(raw_cookies))
+    except json.JSONDecodeError:
+        cookies = []
+        for pair in raw_cookies.split(";"):
+            if "=" in pair:
+                name, value = pair.strip().split("=", 1)
+                if value.startswith('"') and value.endswith('"'):
+                    value = value[1:-1]
+                cookies.append(
+                    {
+                        "name": name,
+                        "value": value,
+                        "domain": LINKEDIN_COOKIE_DOMAIN,
+                        "path": "/",
+                    }
+                )
+        return tuple(cookies)
+
+
+def get_env_cookies():
+    """
+    Get the cookies configured through LINKEDIN_COOKIES, parsed once
+
+    Returns:
+        list: Cookie dictionaries, empty if the variable is not set
+    """
+    if not LINKEDIN_COOKIES:
+        return []
+    return list(parse_cookies(LINKEDIN_COOKIES))
+
+
+class SessionStore:
+    """
+    Stores an authenticated storage state and when it was last validated
+    """
+
+    def __init__(self, path=STORAGE_STATE_PATH, ttl=SESSION_TTL):
+        """
+        Initialize session store
+
+        Args:
+            path: File path of the Playwright storage state
+            ttl: Seconds a validated session stays fresh
+        """
+        self.path = path
+        self.meta_path = os.path.splitext(path)[0] + ".meta.json"
+        self.ttl = ttl
+
+    def exists(self):
+        """
+        Check whether a storage state has been saved
+
+        Returns:
+            bool: Whether the storage state file exists
+        """
+        return Path(self.path).exists()
+
+    def context_options(self):
+        """
+        Get browser context options that start the context authenticated
+
+        Returns:
+            dict: Keyword arguments for Browser.new_context
+        """
+        if self.exists():
+            return {"storage_state": self.path}
+        return {}
+
+    def validated_at(self):
+        """
+        Get the time the session was last validated against LinkedIn
+
+        Returns:
+            float: Unix timestamp, or None if never validated
+        """
+        try:
+            with open(self.meta_path, "r") as f:
+                return json.load(f).get("validated_at")
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self):
+        """
+        Check whether the session can be used without validation navigation
+
+        Returns:
+            bool: Whether the session was validated within the TTL
+        """
+        validated_at = self.validated_at()
+        if not self.exists() or validated_at is None:
+            return False
+        return time.time() - validated_at < self.ttl
+
+    async def save(self, context: BrowserContext, validated=True):
+        """
+        Save the storage state of a context
+
+        Args:
+            context: Playwright browser context
+            validated: Whether the session was just confirmed as logged in
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        await context.storage_state(path=self.path)
+        if validated:
+            self.mark_validated()
+        logger.debug(f"Storage state saved to {self.path}")
+
+    def mark_validated(self):
+        """Record that the session has just been validated."""
+        with open(self.meta_path, "w") as f:
+            json.dump({"validated_at": time.time()}, f)
+
+    def invalidate(self):
+        """Forget the validation so the next run checks the session again."""
+        try:
+            os.remove(self.meta_path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,14 @@
+"""
+LinkedIn Scraper - Stand-in Server
+Local imitation of the LinkedIn pages the scrapers visit, for load tests
+"""
+
+from .fixtures import Fixtures, synthetic_company, synthetic_profile
+from .server import StandInServer
+
+__all__ = [
+    "Fixtures",
+    "StandInServer",
+    "synthetic_company",
+    "synthetic_profile",
+]
@@ -0,0 +1,216 @@
+"""
+Fixture data for the stand-in server
+A few hand-written profiles and companies, plus deterministic synthetic
+ones for any other name so load tests can use as many targets as they like
+"""
+
+import json
+import random
+from typing import Dict, Optional
+
+PROFILE_SECTIONS = (
+    "about",
+    "experience",
+    "education",
+    "skills",
+    "certifications",
+    "languages",
+)
+
+PROFILES = {
+    "hqman": {
+        "name": "Hq Man",
+        "headline": "Software Engineer | Python, Scraping, LLMs",
+        "location": "Shanghai, China",
+        "about": "Builds data pipelines and the tools around them.",
+        "experience": [
+            {
+                "title": "Senior Software Engineer",
+                "company": "Acme Data",
+                "duration": "Jan 2021 - Present",
+                "location": "Shanghai",
+                "description": "Crawling and extraction platform.",
+            },
+            {
+                "title": "Software Engineer",
+                "company": "Example Corp",
+                "duration": "Jul 2017 - Dec 2020",
+                "location": "Hangzhou",
+                "description": "Backend services.",
+            },
+        ],
+        "education": [
+            {
+                "school": "Fudan University",
+                "degree": "BSc, Computer Science",
+                "duration": "2013 - 2017",
+            }
+        ],
+        "skills": ["Python", "Playwright", "asyncio", "SQL"],
+        "certifications": [
+            {"name": "AWS Solutions Architect", "issuer": "Amazon", "date": "2022"}
+        ],
+        "languages": [
+            {"name": "Chinese", "proficiency": "Native"},
+            {"name": "English", "proficiency": "Professional working"},
+        ],
+    },
+}
+
+COMPANIES = {
+    "relevanceai": {
+        "name": "Relevance AI",
+        "tagline": "The home of the AI workforce",
+        "industry": "Software Development",
+        "headquarters": "San Francisco, California",
+        "followers": "52,000 followers",
+        "about": "Relevance AI lets teams build and run AI agents.",
+        "website": "https://relevanceai.com",
+        "size": "51-200 employees",
+        "founded": "2020",
+        "specialties": ["AI agents", "Automation", "Machine learning"],
+        "posts": [
+            "We just shipped multi-agent workflows.",
+            "Join us at our next meetup.",
+        ],
+        "jobs": [
+            {"title": "Senior Backend Engineer", "location": "San Francisco, CA"},
+            {"title": "Solutions Engineer", "location": "Sydney, Australia"},
+        ],
+        "employees": "180 associated members",
+        "people": [
+            {"name": "Jacky Koh", "headline": "Co-founder"},
+            {"name": "Daniel Vassilev", "headline": "Co-founder"},
+        ],
+    },
+}
+
+FIRST_NAMES = ("Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie")
+LAST_NAMES = ("Chen", "Smith", "Garcia", "Wang", "Müller", "Kim", "Singh", "Rossi")
+TITLES = ("Engineer", "Data Scientist", "Product Manager", "Designer", "Analyst")
+CITIES = ("Berlin", "Shanghai", "London", "San Francisco", "Singapore", "Toronto")
+SKILLS = ("Python", "SQL", "Go", "Kubernetes", "React", "Statistics", "Figma", "Rust")
+INDUSTRIES = ("Software Development", "Financial Services", "Retail", "Biotech")
+
+
+def synthetic_profile(name: str, items: int = 5) -> dict:
+    """
+    Profile generated from a name; the same name always gives the same data
+
+    Args:
+        name: Public profile name
+        items: Entries per list section
+
+    Returns:
+        dict: Profile fixture
+    """
+    rng = random.Random(f"profile:{name}")
+    full_name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    city = rng.choice(CITIES)
+    return {
+        "name": full_name,
+        "headline": f"{rng.choice(TITLES)} at Company {rng.randint(1, 500)}",
+        "location": city,
+        "about": f"{full_name} works on " + ", ".join(rng.sample(SKILLS, 3)) + ".",
+        "experience": [
+            {
+                "title": rng.choice(TITLES),
+                "company": f"Company {rng.randint(1, 500)}",
+                "duration": f"{2024 - 2 * i - 2} - {2024 - 2 * i}",
+                "location": rng.choice(CITIES),
+                "description": "Worked on " + rng.choice(SKILLS) + " systems.",
+            }
+            for i in range(items)
+        ],
+        "education": [
+            {
+                "school": f"University of {rng.choice(CITIES)}",
+                "degree": "BSc",
+                "duration": "2008 - 2012",
+            }
+        ],
+        "skills": rng.sample(SKILLS, min(items, len(SKILLS))),
+        "certifications": [
+            {"name": f"{skill} Certified", "issuer": "Cert Org", "date": "2023"}
+            for skill in rng.sample(SKILLS, 2)
+        ],
+        "languages": [{"name": "English", "proficiency": "Native or bilingual"}],
+    }
+
+
+def synthetic_company(name: str, items: int = 5) -> dict:
+    """
+    Company generated from a name; the same name always gives the same data
+
+    Args:
+        name: Company page name
+        items: Number of posts, jobs and people
+
+    Returns:
+        dict: Company fixture
+    """
+    rng = random.Random(f"company:{name}")
+    title = name.replace("-", " ").title()
+    founded = rng.randint(1950, 2022)
+    return {
+        "name": title,
+        "tagline": f"{title} makes things for {rng.choice(INDUSTRIES).lower()}",
+        "industry": rng.choice(INDUSTRIES),
+        "headquarters": rng.choice(CITIES),
+        "followers": f"{rng.randint(100, 900000):,} followers",
+        "about": f"{title} was founded in {founded}.",
+        "website": f"https://www.{name}.example.com",
+        "size": rng.choice(("11-50", "51-200", "201-500", "1,001-5,000"))
+        + " employees",
+        "founded": str(founded),
+        "specialties": rng.sample(SKILLS, 3),
+        "posts": [f"Update {i + 1} from {title}." for i in range(items)],
+        "jobs": [
+            {"title": rng.choice(TITLES), "location": rng.choice(CITIES)}
+            for _ in range(items)
+        ],
+        "employees": f"{rng.randint(10, 9000):,} associated members",
+        "people": [
+            {
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "headline": f"{rng.choice(TITLES)} at {title}",
+            }
+            for _ in range(items)
+        ],
+    }
+
+
+class Fixtures:
+    """
+    Profiles and companies served by the stand-in server
+    """
+
+    def __init__(self, path: Optional[str] = None, synthetic: bool = True):
+        """
+        Initialize the fixtures
+
+        Args:
+            path: JSON file with "profiles" and "companies" objects keyed by
+                name, merged over the built-in fixtures
+            synthetic: Generate data for unknown names instead of 404s
+        """
+        self.profiles: Dict[str, dict] = dict(PROFILES)
+        self.companies: Dict[str, dict] = dict(COMPANIES)
+        self.synthetic = synthetic
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.profiles.update(data.get("profiles", {}))
+            self.companies.update(data.get("companies", {}))
+
+    def profile(self, name: str) -> Optional[dict]:
+        """Profile fixture by name, None when unknown."""
+        if name in self.profiles:
+            return self.profiles[name]
+        return synthetic_profile(name) if self.synthetic else None
+
+    def company(self, name: str) -> Optional[dict]:
+        """Company fixture by name, None when unknown."""
+        if name in self.companies:
+            return self.companies[name]
+        return synthetic_company(name) if self.synthetic else None
@@ -0,0 +1,387 @@
+"""
+HTML of the stand-in server's pages
+Markup follows the classes and ids the scrapers and the auth handler look
+for; profile and company sections below the top card are lazy-loaded by a
+small script once they scroll into view, like on the real site
+"""
+
+from html import escape
+
+# Fetches each placeholder's section when it comes near the viewport
+LAZY_SCRIPT = """
+(function () {
+  var observer = new IntersectionObserver(function (entries) {
+    entries.forEach(function (entry) {
+      if (!entry.isIntersecting) return;
+      var placeholder = entry.target;
+      observer.unobserve(placeholder);
+      fetch(placeholder.dataset.src, {credentials: "same-origin"})
+        .then(function (r) { if (!r.ok) throw new Error(r.status); return r.text(); })
+        .then(function (html) { placeholder.outerHTML = html; })
+        .catch(function () { placeholder.classList.add("standin-lazy--failed"); });
+    });
+  }, {rootMargin: "200px"});
+  document.querySelectorAll(".standin-lazy").forEach(function (placeholder) {
+    observer.observe(placeholder);
+  });
+})();
+"""
+
+GLOBAL_NAV = """
+<header class="global-nav">
+  <a href="/feed/">Home</a>
+  <div class="global-nav__me"><img class="global-nav__me-photo" alt="Me"
+    width="24" height="24" src="data:image/gif;base64,R0lGODlhAQABAAAAACw=">Me</div>
+</header>
+"""
+
+
+def _document(title: str, body: str, logged_in: bool = True) -> str:
+    nav = GLOBAL_NAV if logged_in else ""
+    return (
+        "<!DOCTYPE html>\n"
+        f'<html lang="en"><head><meta charset="utf-8"><title>{escape(title)}'
+        "</title></head>\n"
+        f'<body><div id="profile-content">{nav}{body}</div>'
+        f"<script>{LAZY_SCRIPT}</script></body></html>"
+    )
+
+
+def _placeholder(src: str) -> str:
+    # Tall enough that sections only come into view while scrolling
+    return (
+        f'<div class="standin-lazy" data-src="{escape(src)}" '
+        'style="min-height: 900px"></div>'
+    )
+
+
+def _span(css_class: str, text) -> str:
+    if not text:
+        return ""
+    return f'<span class="{css_class}">{escape(str(text))}</span>'
+
+
+def login_page(error: str = None) -> str:
+    """Sign-in form with the ids the auth handler fills in."""
+    error_html = f'<div class="form__error">{escape(error)}</div>' if error else ""
+    body = f"""
+<main class="login__main">
+  <h1>Sign in</h1>
+  {error_html}
+  <form method="post" action="/login">
+    <input id="username" name="session_key" type="text">
+    <input id="password" name="session_password" type="password">
+    <button type="submit">Sign in</button>
+  </form>
+</main>
+"""
+    return _document("LinkedIn Login", body, logged_in=False)
+
+
+def guest_page() -> str:
+    """Logged-out home page."""
+    body = (
+        "<main><h1>Welcome to your professional community</h1>"
+        '<a href="/login">Sign in</a></main>'
+    )
+    return _document("LinkedIn", body, logged_in=False)
+
+
+def authwall_page() -> str:
+    """Page served instead of member content without a session."""
+    body = (
+        "<main><h1>Sign in to view this page</h1>" '<a href="/login">Sign in</a></main>'
+    )
+    return _document("Sign Up | LinkedIn", body, logged_in=False)
+
+
+def feed_page(posts=()) -> str:
+    """Logged-in home feed."""
+    items = "".join(
+        f'<div class="feed-shared-update-v2"><p>{escape(post)}</p></div>'
+        for post in posts
+    )
+    body = (
+        '<main class="scaffold-layout__main">'
+        f'<h1 class="visually-hidden">Feed</h1>{items}</main>'
+    )
+    return _document("Feed | LinkedIn", body)
+
+
+def profile_page(name: str, profile: dict, lazy_sections=()) -> str:
+    """
+    Profile page: top card and about inline, other sections lazy-loaded
+
+    Args:
+        name: Public profile name used in the URL
+        profile: Profile fixture
+        lazy_sections: Sections loaded from /in/<name>/sections/<section>
+    """
+    placeholders = "".join(
+        _placeholder(f"/in/{name}/sections/{section}") for section in lazy_sections
+    )
+    body = f"""
+<main class="scaffold-layout__main">
+  <section class="artdeco-card pv-top-card">
+    <span class="ember-view"></span>
+    <h1 class="text-heading-xlarge">{escape(profile["name"])}</h1>
+    <div class="text-body-medium">{escape(profile.get("headline", ""))}</div>
+    <span class="text-body-small">{escape(profile.get("location", ""))}</span>
+  </section>
+  {profile_section(profile, "about")}
+  {placeholders}
+</main>
+"""
+    return _document(f"{profile['name']} | LinkedIn", body)
+
+
+def _list_section(section_id, title: str, items: str) -> str:
+    if section_id is None:
+        # Detail pages: one list without an anchor, or an empty state
+        if not items:
+            return (
+                f'<section class="artdeco-card"><h2>{title}</h2>'
+                '<div class="artdeco-empty-state">Nothing to see for now</div>'
+                "</section>"
+            )
+        return (
+            f'<section class="artdeco-card"><h2>{title}</h2>'
+            f'<ul class="pvs-list">{items}</ul></section>'
+        )
+    return (
+        f'<section id="{section_id}" class="artdeco-card"><h2>{title}</h2>'
+        f'<ul class="pvs-list">{items}</ul></section>'
+    )
+
+
+def profile_details_page(profile: dict, section: str) -> str:
+    """
+    Profile detail page (/in/<name>/details/<section>/) listing every entry
+    of one section
+
+    Args:
+        profile: Profile fixture
+        section: experience, education, skills, certifications or languages
+
+    Returns:
+        str: Page HTML, empty when the section has no detail page
+    """
+    if section == "about":
+        return ""
+    html = profile_section(profile, section, anchored=False)
+    if not html:
+        return ""
+    body = f'<main class="scaffold-layout__main">{html}</main>'
+    return _document(f"{profile['name']} | LinkedIn", body)
+
+
+def profile_section(profile: dict, section: str, anchored: bool = True) -> str:
+    """
+    HTML of one profile section
+
+    Args:
+        profile: Profile fixture
+        section: about, experience, education, skills, certifications
+            or languages
+        anchored: Give list sections the id the profile page links to
+
+    Returns:
+        str: Section HTML, empty when the section is unknown
+    """
+    section_id = section if anchored else None
+    if section == "about":
+        return (
+            '<section class="artdeco-card"><div id="about"></div>'
+            '<div class="display-flex"><span aria-hidden="true">'
+            f'{escape(profile.get("about", ""))}</span></div></section>'
+        )
+    if section == "experience":
+        items = "".join(
+            "<li>"
+            + _span("mr1 t-bold", item.get("title"))
+            + _span("t-14 t-normal", item.get("company"))
+            + _span("pv-entity__date-range", item.get("duration"))
+            + _span("pv-entity__location", item.get("location"))
+            + (
+                '<div class="pvs-entity__description">'
+                f'{escape(item["description"])}</div>'
+                if item.get("description")
+                else ""
+            )
+            + "</li>"
+            for item in profile.get("experience", [])
+        )
+        return _list_section(section_id, "Experience", items)
+    if section == "education":
+        items = "".join(
+            "<li>"
+            + _span("mr1 t-bold", item.get("school"))
+            + _span("t-14 t-normal", item.get("degree"))
+            + _span("pv-entity__date-range", item.get("duration"))
+            + "</li>"
+            for item in profile.get("education", [])
+        )
+        return _list_section(section_id, "Education", items)
+    if section == "skills":
+        items = "".join(
+            f"<li>{_span('mr1 t-bold', skill)}</li>"
+            for skill in profile.get("skills", [])
+        )
+        return _list_section(section_id, "Skills", items)
+    if section == "certifications":
+        items = "".join(
+            "<li>"
+            + _span("mr1 t-bold", item.get("name"))
+            + _span("t-14 t-normal", item.get("issuer"))
+            + _span("pv-certifications__date-range", item.get("date"))
+            + "</li>"
+            for item in profile.get("certifications", [])
+        )
+        return _list_section(section_id, "Licenses &amp; certifications", items)
+    if section == "languages":
+        items = "".join(
+            "<li>"
+            + _span("mr1 t-bold", item.get("name"))
+            + _span("t-14 t-normal", item.get("proficiency"))
+            + "</li>"
+            for item in profile.get("languages", [])
+        )
+        return _list_section(section_id, "Languages", items)
+    return ""
+
+
+def company_page(name: str, company: dict, lazy_sections=()) -> str:
+    """
+    Company page: top card inline, other modules lazy-loaded
+
+    Args:
+        name: Company page name used in the URL
+        company: Company fixture
+        lazy_sections: Sections loaded from /company/<name>/sections/<section>
+    """
+    placeholders = "".join(
+        _placeholder(f"/company/{name}/sections/{section}") for section in lazy_sections
+    )
+    body = f"""
+<main class="scaffold-layout__main">
+  {_company_top_card(company)}
+  {placeholders}
+</main>
+"""
+    return _document(f"{company['name']} | LinkedIn", body)
+
+
+def _company_top_card(company: dict) -> str:
+    info = "".join(
+        _span("org-top-card-summary-info-list__info-item", company.get(field))
+        for field in ("industry", "headquarters", "followers")
+    )
+    return f"""<section class="artdeco-card org-top-card">
+    <div class="org-module-card__margin-bottom">
+      <h1>{escape(company["name"])}</h1>
+      <p>{escape(company.get("tagline", ""))}</p>
+      <div class="org-top-card-summary-info-list">{info}</div>
+    </div>
+  </section>"""
+
+
+def company_subpage(company: dict, subpage: str) -> str:
+    """
+    Company sub-page: the top card followed by the about details, the open
+    jobs or the people working there
+
+    Args:
+        company: Company fixture
+        subpage: about, jobs or people
+
+    Returns:
+        str: Page HTML, empty when the sub-page is unknown
+    """
+    if subpage == "about":
+        details = [
+            ("Website", company.get("website")),
+            ("Industry", company.get("industry")),
+            ("Company size", company.get("size")),
+            ("Headquarters", company.get("headquarters")),
+            ("Founded", company.get("founded")),
+            ("Specialties", ", ".join(company.get("specialties", []))),
+        ]
+        items = "".join(
+            f"<dt><h3>{label}</h3></dt><dd>{escape(str(value))}</dd>"
+            for label, value in details
+            if value
+        )
+        module = (
+            '<section class="artdeco-card org-page-details-module__card-spacing">'
+            f'<h2>Overview</h2><p class="break-words">'
+            f'{escape(company.get("about", ""))}</p>'
+            f'<dl class="overflow-hidden">{items}</dl></section>'
+        )
+    elif subpage == "jobs":
+        jobs = company.get("jobs", [])
+        cards = "".join(
+            '<li class="job-card-square">'
+            f'<a class="job-card-square__title" href="/jobs/view/{index}/">'
+            f'{escape(job["title"])}</a>'
+            + _span("job-card-container__metadata-wrapper", job.get("location"))
+            + "</li>"
+            for index, job in enumerate(jobs)
+        )
+        module = (
+            '<section class="artdeco-card org-jobs-recently-posted-jobs-module">'
+            f"<h2>Recently posted jobs</h2><ul>{cards}</ul></section>"
+            if jobs
+            else '<section class="artdeco-card org-jobs-empty-jobs-module">'
+            "<h2>There are no jobs right now.</h2></section>"
+        )
+    elif subpage == "people":
+        cards = "".join(
+            '<li class="org-people-profile-card">'
+            + _span("org-people-profile-card__profile-title", person.get("name"))
+            + _span("artdeco-entity-lockup__subtitle", person.get("headline"))
+            + "</li>"
+            for person in company.get("people", [])
+        )
+        module = (
+            '<section class="artdeco-card">'
+            '<div class="org-people__header-spacing-carousel">'
+            f'<h2>{escape(company.get("employees", ""))}</h2></div>'
+            f"<ul>{cards}</ul></section>"
+        )
+    else:
+        return ""
+    body = f"""
+<main class="scaffold-layout__main">
+  {_company_top_card(company)}
+  {module}
+</main>
+"""
+    return _document(f"{company['name']} | LinkedIn", body)
+
+
+def company_section(company: dict, section: str) -> str:
+    """
+    HTML of one company module
+
+    Args:
+        company: Company fixture
+        section: about or posts
+
+    Returns:
+        str: Section HTML, empty when the section is unknown
+    """
+    if section == "about":
+        return (
+            '<section class="artdeco-card org-about-module">'
+            f'<h2>Overview</h2><p>{escape(company.get("about", ""))}</p></section>'
+        )
+    if section == "posts":
+        posts = "".join(
+            f'<div class="feed-shared-update-v2"><p>{escape(post)}</p></div>'
+            for post in company.get("posts", [])
+        )
+        return (
+            '<section class="artdeco-card org-posts-module">'
+            f"<h2>Posts</h2>{posts}</section>"
+        )
+    return ""
@@ -0,0 +1,328 @@
+"""
+LinkedIn stand-in server
+Serves login, feed, profile and company pages built from fixtures, with
+cookie auth, lazy-loaded sections and injected latency and errors, so the
+real scrapers can be load-tested end to end without touching LinkedIn.
+
+Point the scrapers at it with LINKEDIN_URL=http://127.0.0.1:<port>.
+"""
+
+import time
+import random
+import asyncio
+import argparse
+import secrets
+from collections import Counter
+from typing import Optional
+from urllib.parse import parse_qs, quote
+
+from ..config import (
+    STANDIN_ERROR_RATE,
+    STANDIN_HOST,
+    STANDIN_JITTER,
+    STANDIN_LATENCY,
+    STANDIN_PORT,
+)
+from ..logging import get_logger
+from ..utils.http_server import (
+    HTTPServer,
+    Request,
+    Response,
+    json_response,
+    text_response,
+)
+from . import pages
+from .fixtures import PROFILE_SECTIONS, Fixtures
+
+logger = get_logger()
+
+HTML = "text/html; charset=utf-8"
+SESSION_COOKIE = "li_at"
+# Sections below the top card, fetched by the page script while scrolling
+LAZY_PROFILE_SECTIONS = tuple(s for s in PROFILE_SECTIONS if s != "about")
+LAZY_COMPANY_SECTIONS = ("about", "posts")
+
+
+def parse_cookie_header(header: str) -> dict:
+    """Cookies sent in a Cookie request header."""
+    cookies = {}
+    for pair in header.split(";"):
+        name, sep, value = pair.strip().partition("=")
+        if sep:
+            cookies[name] = value
+    return cookies
+
+
+def redirect(location: str, headers=None) -> Response:
+    """302 redirect."""
+    response_headers = {"Location": location}
+    response_headers.update(headers or {})
+    return Response(status=302, headers=response_headers)
+
+
+class StandInServer(HTTPServer):
+    """
+    HTTP server mimicking the parts of LinkedIn the scrapers use
+    """
+
+    def __init__(
+        self,
+        fixtures: Optional[Fixtures] = None,
+        latency=STANDIN_LATENCY,
+        jitter=STANDIN_JITTER,
+        error_rate=STANDIN_ERROR_RATE,
+        error_status=503,
+        username=None,
+        password=None,
+        strict_auth=False,
+    ):
+        """
+        Initialize the stand-in server
+
+        Args:
+            fixtures: Profiles and companies to serve
+            latency: Delay added to every response (milliseconds)
+            jitter: Random extra delay of up to this many milliseconds
+            error_rate: Fraction of requests answered with `error_status`
+            error_status: Status code of injected errors
+            username: Only this username may sign in, any when None
+            password: Only this password may sign in, any when None
+            strict_auth: Only accept session cookies issued by this server;
+                otherwise any non-empty li_at cookie counts as signed in
+        """
+        super().__init__()
+        self.fixtures = fixtures or Fixtures()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.username = username
+        self.password = password
+        self.strict_auth = strict_auth
+        self.sessions = set()
+        self.requests = Counter()
+        self.statuses = Counter()
+        self.started_at = time.time()
+        self.host = STANDIN_HOST
+
+        self.route("GET", "/", self.handle_home)
+        self.route("GET", "/login", self.handle_login_page)
+        self.route("POST", "/login", self.handle_login)
+        self.route("GET", "/authwall", self.handle_authwall)
+        self.route("GET", "/feed/", self.handle_feed)
+        self.route("GET", "/in/{name}", self.handle_profile)
+        self.route("GET", "/in/{name}/", self.handle_profile)
+        self.route("GET", "/in/{name}/sections/{section}", self.handle_profile_section)
+        self.route("GET", "/in/{name}/details/{section}/", self.handle_profile_details)
+        self.route("GET", "/company/{name}", self.handle_company)
+        self.route("GET", "/company/{name}/", self.handle_company)
+        self.route(
+            "GET", "/company/{name}/sections/{section}", self.handle_company_section
+        )
+        self.route("GET", "/company/{name}/{subpage}/", self.handle_company_subpage)
+        self.route("GET", "/_standin/stats", self.handle_stats)
+
+    @property
+    def base_url(self) -> str:
+        """URL to use as LINKEDIN_URL."""
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self, host=STANDIN_HOST, port=STANDIN_PORT, socket_path=None):
+        """Start listening; port 0 picks a free one."""
+        self.host = host
+        return await super().start(host=host, port=port, socket_path=socket_path)
+
+    async def dispatch(self, request: Request) -> Response:
+        """Route a request with latency and error injection applied."""
+        route = request.path.split("/")[1] or "home"
+        if route == "_standin":
+            return await super().dispatch(request)
+        self.requests[route] += 1
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate and random.random() < self.error_rate:
+            response = text_response("Injected error", status=self.error_status)
+        else:
+            response = await super().dispatch(request)
+        self.statuses[response.status] += 1
+        return response
+
+    def is_signed_in(self, request: Request) -> bool:
+        """Whether the request carries an accepted session cookie."""
+        token = parse_cookie_header(request.headers.get("cookie", "")).get(
+            SESSION_COOKIE
+        )
+        if not token:
+            return False
+        return token in self.sessions or not self.strict_auth
+
+    def _authwall(self, request: Request) -> Response:
+        return redirect(f"/authwall?sessionRedirect={quote(request.path)}")
+
+    async def handle_home(self, request: Request) -> Response:
+        if self.is_signed_in(request):
+            return redirect("/feed/")
+        return text_response(pages.guest_page(), content_type=HTML)
+
+    async def handle_login_page(self, request: Request) -> Response:
+        return text_response(pages.login_page(), content_type=HTML)
+
+    async def handle_login(self, request: Request) -> Response:
+        form = parse_qs(request.body.decode("utf-8"))
+        username = form.get("session_key", [""])[0]
+        password = form.get("session_password", [""])[0]
+        valid = bool(username and password)
+        if self.username is not None and username != self.username:
+            valid = False
+        if self.password is not None and password != self.password:
+            valid = False
+        if not valid:
+            html = pages.login_page(error="Wrong email or password. Try again.")
+            return text_response(html, status=401, content_type=HTML)
+
+        token = secrets.token_urlsafe(24)
+        self.sessions.add(token)
+        return redirect(
+            "/feed/",
+            headers={"Set-Cookie": f"{SESSION_COOKIE}={token}; Path=/; HttpOnly"},
+        )
+
+    async def handle_authwall(self, request: Request) -> Response:
+        return text_response(pages.authwall_page(), content_type=HTML)
+
+    async def handle_feed(self, request: Request) -> Response:
+        if not self.is_signed_in(request):
+            return redirect("/login")
+        posts = [f"Post {i + 1} in your feed" for i in range(5)]
+        return text_response(pages.feed_page(posts), content_type=HTML)
+
+    async def handle_profile(self, request: Request) -> Response:
+        if not self.is_signed_in(request):
+            return self._authwall(request)
+        name = request.params["name"]
+        profile = self.fixtures.profile(name)
+        if profile is None:
+            return text_response("Profile not found", status=404)
+        html = pages.profile_page(name, profile, LAZY_PROFILE_SECTIONS)
+        return text_response(html, content_type=HTML)
+
+    async def handle_profile_section(self, request: Request) -> Response:
+        if not self.is_signed_in(request):
+            return text_response("Unauthorized", status=401)
+        profile = self.fixtures.profile(request.params["name"])
+        html = (
+            pages.profile_section(profile, request.params["section"]) if profile else ""
+        )
+        if not html:
+            return text_response("Section not found", status=404)
+        return text_response(html, content_type=HTML)
+
+    async def handle_profile_details(self, request: Request) -> Response:
+        if not self.is_signed_in(request):
+            return self._authwall(request)
+        profile = self.fixtures.profile(request.params["name"])
+        html = (
+            pages.profile_details_page(profile, request.params["section"])
+            if profile
+            else ""
+        )
+        if not html:
+            return text_response("Page not found", status=404)
+        return text_response(html, content_type=HTML)
+
+    async def handle_company(self, request: Request) -> Response:
+        if not self.is_signed_in(request):
+            return self._authwall(request)
+        name = request.params["name"]
+        company = self.fixtures.company(name)
+        if company is None:
+            return text_response("Company not found", status=404)
+        html = pages.company_page(name, company, LAZY_COMPANY_SECTIONS)
+        return text_response(html, content_type=HTML)
+
+    async def handle_company_section(self, request: Request) -> Response:
+        if not self.is_signed_in(request):
+            return text_response("Unauthorized", status=401)
+        company = self.fixtures.company(request.params["name"])
+        html = (
+            pages.company_section(company, request.params["section"]) if company else ""
+        )
+        if not html:
+            return text_response("Section not found", status=404)
+        return text_response(html, content_type=HTML)
+
+    async def handle_company_subpage(self, request: Request) -> Response:
+        if not self.is_signed_in(request):
+            return self._authwall(request)
+        company = self.fixtures.company(request.params["name"])
+        html = (
+            pages.company_subpage(company, request.params["subpage"]) if company else ""
+        )
+        if not html:
+            return text_response("Page not found", status=404)
+        return text_response(html, content_type=HTML)
+
+    async def handle_stats(self, request: Request) -> Response:
+        return json_response(
+            {
+                "uptime": time.time() - self.started_at,
+                "requests": dict(self.requests),
+                "statuses": {str(k): v for k, v in self.statuses.items()},
+                "sessions": len(self.sessions),
+            }
+        )
+
+
+async def serve(args):
+    fixtures = Fixtures(path=args.fixtures, synthetic=not args.no_synthetic)
+    server = StandInServer(
+        fixtures=fixtures,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+    )
+    await server.start(host=args.host, port=args.port)
+    print(f"Stand-in server listening on {server.base_url}")
+    print(f"  export LINKEDIN_URL={server.base_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LinkedIn stand-in server")
+    parser.add_argument("--host", default=STANDIN_HOST)
+    parser.add_argument("--port", type=int, default=STANDIN_PORT)
+    parser.add_argument(
+        "--latency", type=int, default=STANDIN_LATENCY, help="milliseconds"
+    )
+    parser.add_argument(
+        "--jitter", type=int, default=STANDIN_JITTER, help="milliseconds"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=STANDIN_ERROR_RATE,
+        help="fraction of requests failing",
+    )
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument(
+        "--fixtures", help="JSON file with extra profiles and companies"
+    )
+    parser.add_argument(
+        "--no-synthetic",
+        action="store_true",
+        help="404 for names missing from the fixtures instead of generating them",
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+LinkedIn Scraper - Storage
+Persistent stores for fetched pages and scraped records
+"""
+
+from .archive import ArchivedPage, HtmlArchive
+from .deltas import Delta, DeltaStore, apply_changes, diff_records
+from .sinks import (
+    JsonFileSink,
+    NdjsonSink,
+    ParquetSink,
+    ResultSink,
+    open_sink,
+)
+from .results import ResultStore, SqliteSink, StoredResult
+from .writer import FileWriter, get_writer
+
+__all__ = [
+    "ArchivedPage",
+    "HtmlArchive",
+    "Delta",
+    "DeltaStore",
+    "apply_changes",
+    "diff_records",
+    "ResultSink",
+    "JsonFileSink",
+    "NdjsonSink",
+    "ParquetSink",
+    "open_sink",
+    "ResultStore",
+    "SqliteSink",
+    "StoredResult",
+    "FileWriter",
+    "get_writer",
+]
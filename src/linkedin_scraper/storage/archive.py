@@ -0,0 +1,485 @@
+"""
+Raw HTML archive
+Stores every fetched page as a zstd-compressed, content-addressed blob,
+indexed in SQLite by target, type and fetch time
+"""
+
+import os
+import mmap
+import time
+import asyncio
+import sqlite3
+import hashlib
+import argparse
+import threading
+from dataclasses import dataclass
+from typing import List, Optional
+
+from ..config import (
+    ARCHIVE_DIR,
+    ARCHIVE_LEVEL,
+    ARCHIVE_MAX_AGE,
+    ARCHIVE_MAX_BYTES,
+)
+from ..logging import get_logger
+
+logger = get_logger()
+
+# Retention is enforced after this many stored pages
+PRUNE_EVERY = 100
+# Size of a trained dictionary; zstd's default for its trainer
+DICT_SIZE = 112640
+# Tier recorded for pages archived by structured (data mode) scrapes
+STRUCTURED_TIER = "structured"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    compressed_size INTEGER NOT NULL,
+    dict_id INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    target_type TEXT NOT NULL,
+    target_name TEXT NOT NULL,
+    url TEXT,
+    tier TEXT,
+    fetched_at REAL NOT NULL,
+    sha256 TEXT NOT NULL REFERENCES blobs(sha256)
+);
+CREATE TABLE IF NOT EXISTS dictionaries (
+    dict_id INTEGER PRIMARY KEY,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_target
+    ON pages(target_type, target_name, fetched_at);
+CREATE INDEX IF NOT EXISTS pages_fetched_at ON pages(fetched_at);
+CREATE INDEX IF NOT EXISTS pages_sha256 ON pages(sha256);
+"""
+
+
+@dataclass
+class ArchivedPage:
+    """Index entry of an archived page."""
+
+    id: int
+    target_type: str
+    target_name: str
+    url: Optional[str]
+    tier: Optional[str]
+    fetched_at: float
+    sha256: str
+
+
+class HtmlArchive:
+    """
+    Content-addressed, dictionary-compressed store of raw pages
+    """
+
+    def __init__(
+        self,
+        archive_dir=ARCHIVE_DIR,
+        level=ARCHIVE_LEVEL,
+        max_bytes=ARCHIVE_MAX_BYTES,
+        max_age=ARCHIVE_MAX_AGE,
+    ):
+        """
+        Initialize the archive
+
+        Args:
+            archive_dir: Directory holding the index, blobs and dictionaries
+            level: zstd compression level
+            max_bytes: Compressed bytes kept before the oldest pages are dropped
+            max_age: Seconds a page is kept, 0 keeps pages regardless of age
+        """
+        # Optional dependency, only needed when the archive is used
+        import zstandard
+
+        self.zstd = zstandard
+        self.archive_dir = archive_dir
+        self.blob_dir = os.path.join(archive_dir, "blobs")
+        self.dict_dir = os.path.join(archive_dir, "dicts")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.dict_dir, exist_ok=True)
+
+        self.level = level
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        # zstd compressors are not thread-safe; compressing holds this lock
+        # instead of the index lock, so lookups never wait on compression
+        self.compress_lock = threading.Lock()
+        self.puts_since_prune = 0
+
+        self.db = sqlite3.connect(
+            os.path.join(archive_dir, "index.sqlite"), check_same_thread=False
+        )
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+        self.dicts = {}
+        self.current_dict_id = 0
+        for (dict_id,) in self.db.execute(
+            "SELECT dict_id FROM dictionaries ORDER BY created_at"
+        ):
+            self._load_dict(dict_id)
+            self.current_dict_id = dict_id
+        self.compressor = self._make_compressor()
+
+    def _dict_path(self, dict_id):
+        return os.path.join(self.dict_dir, f"{dict_id}.dict")
+
+    def _blob_path(self, sha256):
+        return os.path.join(self.blob_dir, sha256[:2], f"{sha256}.zst")
+
+    def _load_dict(self, dict_id):
+        with open(self._dict_path(dict_id), "rb") as f:
+            self.dicts[dict_id] = self.zstd.ZstdCompressionDict(f.read())
+
+    def _make_compressor(self):
+        dict_data = self.dicts.get(self.current_dict_id)
+        return self.zstd.ZstdCompressor(level=self.level, dict_data=dict_data)
+
+    def put(self, target_type, target_name, html, url=None, tier=None, fetched_at=None):
+        """
+        Archive a fetched page
+
+        Args:
+            target_type: "profile" or "company"
+            target_name: Profile or company name
+            html: Raw page HTML
+            url: URL the page was fetched from
+            tier: Fetch tier that produced the page
+            fetched_at: Unix timestamp, defaults to now
+
+        Returns:
+            str: SHA-256 of the page, its content address
+        """
+        data = html.encode("utf-8")
+        sha256 = hashlib.sha256(data).hexdigest()
+        fetched_at = fetched_at or time.time()
+
+        with self.lock:
+            known = self.db.execute(
+                "SELECT 1 FROM blobs WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+            compressor, dict_id = self.compressor, self.current_dict_id
+        if not known:
+            with self.compress_lock:
+                compressed = compressor.compress(data)
+
+        with self.lock:
+            if not known:
+                # Identical pages share one blob; another put may have
+                # stored it while this one was compressing
+                known = self.db.execute(
+                    "SELECT 1 FROM blobs WHERE sha256 = ?", (sha256,)
+                ).fetchone()
+            if not known:
+                path = self._blob_path(sha256)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(compressed)
+                os.replace(tmp_path, path)
+                self.db.execute(
+                    "INSERT INTO blobs VALUES (?, ?, ?, ?, ?)",
+                    (
+                        sha256,
+                        len(data),
+                        len(compressed),
+                        dict_id,
+                        time.time(),
+                    ),
+                )
+            self.db.execute(
+                "INSERT INTO pages (target_type, target_name, url, tier, fetched_at, "
+                "sha256) VALUES (?, ?, ?, ?, ?, ?)",
+                (target_type, target_name, url, tier, fetched_at, sha256),
+            )
+            self.db.commit()
+            self.puts_since_prune += 1
+
+        if self.puts_since_prune >= PRUNE_EVERY:
+            self.prune()
+        return sha256
+
+    def get(self, sha256) -> str:
+        """
+        Read an archived page by content address
+
+        Args:
+            sha256: Content address returned by put()
+
+        Returns:
+            str: Page HTML
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT dict_id FROM blobs WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(sha256)
+        decompressor = self.zstd.ZstdDecompressor(dict_data=self.dicts.get(row[0]))
+        with open(self._blob_path(sha256), "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as blob:
+                return decompressor.decompress(blob).decode("utf-8")
+
+    def query(
+        self,
+        target_type=None,
+        target_name=None,
+        since=None,
+        until=None,
+        limit=None,
+        latest_only=False,
+        name_pattern=None,
+        exclude_tiers=(),
+    ) -> List[ArchivedPage]:
+        """
+        Find archived pages, newest first
+
+        Args:
+            target_type: Only pages of this type
+            target_name: Only pages of this target
+            since: Only pages fetched at or after this timestamp
+            until: Only pages fetched before this timestamp
+            limit: Maximum number of pages
+            latest_only: Only the newest page of each target
+            name_pattern: Only pages of targets matching this glob
+            exclude_tiers: Leave out pages archived by these tiers
+
+        Returns:
+            list: Matching index entries
+        """
+        clauses, params = [], []
+        if target_type:
+            clauses.append("target_type = ?")
+            params.append(target_type)
+        if target_name:
+            clauses.append("target_name = ?")
+            params.append(target_name)
+        if name_pattern:
+            clauses.append("target_name GLOB ?")
+            params.append(name_pattern)
+        if since is not None:
+            clauses.append("fetched_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("fetched_at < ?")
+            params.append(until)
+        if exclude_tiers:
+            marks = ", ".join("?" for _ in exclude_tiers)
+            clauses.append(f"(tier IS NULL OR tier NOT IN ({marks}))")
+            params.extend(exclude_tiers)
+        if latest_only:
+            clauses.append(
+                "fetched_at = (SELECT MAX(p.fetched_at) FROM pages p WHERE "
+                "p.target_type = pages.target_type AND "
+                "p.target_name = pages.target_name)"
+            )
+        sql = (
+            "SELECT id, target_type, target_name, url, tier, fetched_at, sha256 "
+            "FROM pages"
+        )
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY fetched_at DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self.lock:
+            rows = self.db.execute(sql, params).fetchall()
+        return [ArchivedPage(*row) for row in rows]
+
+    def latest(
+        self, target_type, target_name, exclude_tiers=()
+    ) -> Optional[ArchivedPage]:
+        """Newest archived page of a target, if any, see query()."""
+        pages = self.query(
+            target_type, target_name, limit=1, exclude_tiers=exclude_tiers
+        )
+        return pages[0] if pages else None
+
+    def train_dictionary(self, sample_limit=1000, dict_size=DICT_SIZE):
+        """
+        Train a shared dictionary on archived pages and compress with it
+
+        Pages stored before keep the dictionary they were written with.
+
+        Args:
+            sample_limit: Number of recent distinct pages to train on
+            dict_size: Dictionary size in bytes
+
+        Returns:
+            int: Id of the new dictionary
+        """
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT sha256 FROM blobs ORDER BY created_at DESC LIMIT ?",
+                (sample_limit,),
+            ).fetchall()
+        samples = [self.get(sha256).encode("utf-8") for (sha256,) in rows]
+        if len(samples) < 8:
+            raise ValueError("Need at least 8 archived pages to train a dictionary")
+
+        trained = self.zstd.train_dictionary(dict_size, samples, level=self.level)
+        dict_id = trained.dict_id()
+        with open(self._dict_path(dict_id), "wb") as f:
+            f.write(trained.as_bytes())
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO dictionaries VALUES (?, ?, ?)",
+                (dict_id, len(trained.as_bytes()), time.time()),
+            )
+            self.db.commit()
+            self.dicts[dict_id] = trained
+            self.current_dict_id = dict_id
+            self.compressor = self._make_compressor()
+        logger.debug(f"Trained archive dictionary {dict_id} on {len(samples)} pages")
+        return dict_id
+
+    def prune(self, max_bytes=None, max_age=None):
+        """
+        Apply the retention policy: drop pages past the maximum age, then the
+        oldest pages until the blobs fit in the byte budget
+
+        Args:
+            max_bytes: Override of the compressed byte budget
+            max_age: Override of the maximum page age in seconds
+
+        Returns:
+            int: Number of blobs removed from disk
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_age = self.max_age if max_age is None else max_age
+
+        with self.lock:
+            self.puts_since_prune = 0
+            if max_age:
+                self.db.execute(
+                    "DELETE FROM pages WHERE fetched_at < ?", (time.time() - max_age,)
+                )
+            if max_bytes:
+                total = self._referenced_bytes()
+                while total > max_bytes:
+                    oldest = self.db.execute(
+                        "SELECT id FROM pages ORDER BY fetched_at LIMIT 50"
+                    ).fetchall()
+                    if not oldest:
+                        break
+                    self.db.executemany("DELETE FROM pages WHERE id = ?", oldest)
+                    total = self._referenced_bytes()
+
+            orphans = self.db.execute(
+                "SELECT sha256 FROM blobs WHERE sha256 NOT IN "
+                "(SELECT DISTINCT sha256 FROM pages)"
+            ).fetchall()
+            for (sha256,) in orphans:
+                try:
+                    os.remove(self._blob_path(sha256))
+                except FileNotFoundError:
+                    pass
+            self.db.executemany("DELETE FROM blobs WHERE sha256 = ?", orphans)
+            self.db.commit()
+
+        if orphans:
+            logger.debug(f"Archive pruned {len(orphans)} blob(s)")
+        return len(orphans)
+
+    def _referenced_bytes(self):
+        row = self.db.execute(
+            "SELECT COALESCE(SUM(compressed_size), 0) FROM blobs WHERE sha256 IN "
+            "(SELECT DISTINCT sha256 FROM pages)"
+        ).fetchone()
+        return row[0]
+
+    def stats(self):
+        """Page and blob counts, sizes and compression ratio."""
+        with self.lock:
+            pages = self.db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            blobs, size, compressed = self.db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), "
+                "COALESCE(SUM(compressed_size), 0) FROM blobs"
+            ).fetchone()
+        return {
+            "pages": pages,
+            "blobs": blobs,
+            "bytes": size,
+            "compressed_bytes": compressed,
+            "ratio": size / compressed if compressed else 0.0,
+            "dict_id": self.current_dict_id,
+        }
+
+    def close(self):
+        """Close the index database."""
+        self.db.close()
+
+
+def open_archive(**kwargs) -> Optional[HtmlArchive]:
+    """
+    Open the archive, or do without it when zstandard is not installed
+
+    Args:
+        kwargs: HtmlArchive options
+
+    Returns:
+        HtmlArchive: The archive, None when it cannot be used
+    """
+    try:
+        return HtmlArchive(**kwargs)
+    except ImportError as e:
+        logger.warning(f"Not archiving pages, zstandard is not installed: {e}")
+        return None
+
+
+async def archive_page(archive: HtmlArchive, target_type, target_name, page):
+    """
+    Archive the HTML of a page rendered by a browser scrape
+
+    The page is stored under STRUCTURED_TIER: structured scrapes do not
+    scroll every section into view, so these pages are kept for
+    reprocessing but never served as a full render by the archive tier.
+    Failures are logged and swallowed; archiving never fails a scrape.
+
+    Args:
+        archive: HtmlArchive to store the page in
+        target_type: "profile" or "company"
+        target_name: Profile or company name
+        page: Playwright page showing the target
+    """
+    try:
+        html = await page.content()
+        await asyncio.to_thread(
+            archive.put,
+            target_type,
+            target_name,
+            html,
+            url=page.url,
+            tier=STRUCTURED_TIER,
+        )
+    except Exception as e:
+        logger.debug(f"Error archiving {target_type} {target_name}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LinkedIn raw HTML archive")
+    parser.add_argument("command", choices=["stats", "train", "prune"])
+    parser.add_argument("--dir", default=ARCHIVE_DIR, help="Archive directory")
+    args = parser.parse_args()
+
+    archive = HtmlArchive(archive_dir=args.dir)
+    try:
+        if args.command == "train":
+            archive.train_dictionary()
+        elif args.command == "prune":
+            archive.prune()
+        print(archive.stats())
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+"""
+Change-only record store
+Keeps the latest snapshot of every scraped record plus the field-level
+changes each scrape made to it, as JSON Patch operations with timestamps,
+so downstream consumers can ask what changed since a point in time
+"""
+
+import os
+import copy
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+import threading
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from ..config import DELTAS_PATH
+from ..logging import get_logger
+
+logger = get_logger()
+
+# Key listing the sections or sub-pages a scraped record is missing because
+# they failed to load or extract; their fields hold defaults, not data
+PARTIAL_KEY = "partial_sections"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    entity_type TEXT NOT NULL,
+    entity_name TEXT NOT NULL,
+    record TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    changed_at REAL NOT NULL,
+    checked_at REAL NOT NULL,
+    PRIMARY KEY (entity_type, entity_name)
+);
+CREATE TABLE IF NOT EXISTS deltas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity_type TEXT NOT NULL,
+    entity_name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    scraped_at REAL NOT NULL,
+    changes TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS deltas_scraped_at ON deltas(scraped_at, id);
+CREATE INDEX IF NOT EXISTS deltas_entity
+    ON deltas(entity_type, entity_name, version);
+"""
+
+
+def _pointer(path: str, key) -> str:
+    key = str(key).replace("~", "~0").replace("/", "~1")
+    return f"{path}/{key}"
+
+
+def _keys(pointer: str) -> List[str]:
+    return [key.replace("~1", "/").replace("~0", "~") for key in pointer.split("/")[1:]]
+
+
+def diff_records(old: Any, new: Any, path: str = "") -> List[dict]:
+    """
+    Field-level changes turning one record into another
+
+    Objects are compared key by key; lists and scalars are replaced whole
+    when they differ, so a reordered experience list is one operation.
+
+    Args:
+        old: Previous record
+        new: Current record
+        path: JSON pointer of the compared values
+
+    Returns:
+        list: JSON Patch (RFC 6902) add, replace and remove operations
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in old:
+            if key not in new:
+                changes.append({"op": "remove", "path": _pointer(path, key)})
+        for key, value in new.items():
+            if key not in old:
+                changes.append(
+                    {"op": "add", "path": _pointer(path, key), "value": value}
+                )
+            elif old[key] != value:
+                changes.extend(diff_records(old[key], value, _pointer(path, key)))
+        return changes
+    if old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_changes(record: Any, changes: List[dict]) -> Any:
+    """
+    Apply operations produced by diff_records
+
+    Args:
+        record: Record to start from, left unchanged
+        changes: JSON Patch operations
+
+    Returns:
+        The changed copy of the record
+    """
+    record = copy.deepcopy(record)
+    for change in changes:
+        keys = _keys(change["path"])
+        if not keys:
+            record = copy.deepcopy(change["value"])
+            continue
+        parent = record
+        for key in keys[:-1]:
+            parent = parent[key]
+        if change["op"] == "remove":
+            del parent[keys[-1]]
+        else:
+            parent[keys[-1]] = copy.deepcopy(change["value"])
+    return record
+
+
+def record_hash(record: dict) -> str:
+    """
+    Hash a scraped record independently of its key order
+
+    Args:
+        record: Scraped record
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    data = json.dumps(record, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Delta:
+    """Changes one scrape made to a record."""
+
+    id: int
+    entity_type: str
+    entity_name: str
+    version: int
+    scraped_at: float
+    changes: List[dict]
+
+    def to_dict(self) -> dict:
+        """Plain dictionary, as written by the CLI."""
+        return {
+            "id": self.id,
+            "entity_type": self.entity_type,
+            "entity_name": self.entity_name,
+            "version": self.version,
+            "scraped_at": self.scraped_at,
+            "changes": self.changes,
+        }
+
+
+class DeltaStore:
+    """
+    SQLite-backed latest snapshots with per-scrape field-level deltas
+
+    The first scrape of a record is stored as one operation adding the whole
+    record, so replaying a record's deltas in order rebuilds any version.
+    """
+
+    def __init__(self, path=DELTAS_PATH):
+        """
+        Initialize the delta store
+
+        Args:
+            path: SQLite database path
+        """
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def put(
+        self,
+        entity_type: str,
+        entity_name: str,
+        record: dict,
+        scraped_at=None,
+        partial=(),
+    ) -> Optional[Delta]:
+        """
+        Store a scraped record, keeping only what changed since the last one
+
+        Args:
+            entity_type: "profile" or "company"
+            entity_name: Profile or company name
+            record: Scraped record, PARTIAL_KEY is not stored
+            scraped_at: Unix timestamp, defaults to now
+            partial: Fields that failed to scrape this time; their last
+                stored values are carried forward instead of being recorded
+                as removed or replaced
+
+        Returns:
+            Delta: The changes recorded, None when the record is unchanged
+        """
+        scraped_at = scraped_at or time.time()
+        record = {key: value for key, value in record.items() if key != PARTIAL_KEY}
+        with self.lock:
+            row = self.db.execute(
+                "SELECT record, content_hash, version FROM snapshots "
+                "WHERE entity_type = ? AND entity_name = ?",
+                (entity_type, entity_name),
+            ).fetchone()
+            if row is not None and partial:
+                previous = json.loads(row[0])
+                for key in partial:
+                    if key in previous:
+                        record[key] = previous[key]
+                    else:
+                        record.pop(key, None)
+            content_hash = record_hash(record)
+            if row is not None and row[1] == content_hash:
+                self.db.execute(
+                    "UPDATE snapshots SET checked_at = ? "
+                    "WHERE entity_type = ? AND entity_name = ?",
+                    (scraped_at, entity_type, entity_name),
+                )
+                self.db.commit()
+                return None
+
+            if row is None:
+                version = 1
+                changes = [{"op": "add", "path": "", "value": record}]
+            else:
+                version = row[2] + 1
+                changes = diff_records(json.loads(row[0]), record)
+            cursor = self.db.execute(
+                "INSERT INTO deltas (entity_type, entity_name, version, scraped_at, "
+                "changes) VALUES (?, ?, ?, ?, ?)",
+                (
+                    entity_type,
+                    entity_name,
+                    version,
+                    scraped_at,
+                    json.dumps(changes, ensure_ascii=False),
+                ),
+            )
+            self.db.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entity_type,
+                    entity_name,
+                    json.dumps(record, ensure_ascii=False),
+                    content_hash,
+                    version,
+                    scraped_at,
+                    scraped_at,
+                ),
+            )
+            self.db.commit()
+        logger.debug(
+            f"{entity_type} {entity_name} v{version}: {len(changes)} change(s)"
+        )
+        return Delta(
+            cursor.lastrowid, entity_type, entity_name, version, scraped_at, changes
+        )
+
+    def latest(self, entity_type: str, entity_name: str) -> Optional[dict]:
+        """Latest snapshot of a record, if it was stored before."""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT record FROM snapshots "
+                "WHERE entity_type = ? AND entity_name = ?",
+                (entity_type, entity_name),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def changes_since(
+        self,
+        since: float = 0,
+        entity_type=None,
+        entity_name=None,
+        until=None,
+        after_id=None,
+        limit=None,
+    ) -> List[Delta]:
+        """
+        Deltas recorded from a point in time on, oldest first
+
+        Args:
+            since: Only deltas of scrapes at or after this timestamp
+            entity_type: Only deltas of this type
+            entity_name: Only deltas of this record
+            until: Only deltas of scrapes before this timestamp
+            after_id: Only deltas after this id, to resume from the last one
+                a consumer processed
+            limit: Maximum number of deltas
+
+        Returns:
+            list: Matching deltas
+        """
+        clauses, params = ["scraped_at >= ?"], [since]
+        if entity_type:
+            clauses.append("entity_type = ?")
+            params.append(entity_type)
+        if entity_name:
+            clauses.append("entity_name = ?")
+            params.append(entity_name)
+        if until is not None:
+            clauses.append("scraped_at < ?")
+            params.append(until)
+        if after_id is not None:
+            clauses.append("id > ?")
+            params.append(after_id)
+        sql = (
+            "SELECT id, entity_type, entity_name, version, scraped_at, changes "
+            "FROM deltas WHERE " + " AND ".join(clauses) + " ORDER BY scraped_at, id"
+        )
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self.lock:
+            rows = self.db.execute(sql, params).fetchall()
+        return [Delta(*row[:5], json.loads(row[5])) for row in rows]
+
+    def record_at(self, entity_type: str, entity_name: str, at=None) -> Optional[dict]:
+        """
+        Rebuild a record as it was after the last scrape before a timestamp
+
+        Args:
+            entity_type: "profile" or "company"
+            entity_name: Profile or company name
+            at: Unix timestamp, the latest version when omitted
+
+        Returns:
+            dict: The record, None when it had not been scraped yet
+        """
+        record = None
+        for delta in self.changes_since(
+            entity_type=entity_type, entity_name=entity_name, until=at
+        ):
+            record = apply_changes(record, delta.changes)
+        return record
+
+    def stats(self):
+        """Record and delta counts."""
+        with self.lock:
+            records = self.db.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+            deltas = self.db.execute("SELECT COUNT(*) FROM deltas").fetchone()[0]
+        return {"records": records, "deltas": deltas}
+
+    def close(self):
+        """Close the database."""
+        with self.lock:
+            self.db.close()
+
+
+def _timestamp(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LinkedIn record deltas")
+    parser.add_argument("command", choices=["changes", "show", "stats"])
+    parser.add_argument("--db", default=DELTAS_PATH, help="Delta database path")
+    parser.add_argument(
+        "--since", default="0", help="ISO date or Unix timestamp (changes)"
+    )
+    parser.add_argument("--after-id", type=int, help="Last delta id processed")
+    parser.add_argument("--type", choices=["profile", "company"])
+    parser.add_argument("--name", help="Profile or company name")
+    parser.add_argument("--limit", type=int)
+    args = parser.parse_args()
+
+    store = DeltaStore(path=args.db)
+    try:
+        if args.command == "changes":
+            for delta in store.changes_since(
+                _timestamp(args.since),
+                entity_type=args.type,
+                entity_name=args.name,
+                after_id=args.after_id,
+                limit=args.limit,
+            ):
+                print(json.dumps(delta.to_dict(), ensure_ascii=False))
+        elif args.command == "show":
+            if not args.type or not args.name:
+                parser.error("show needs --type and --name")
+            print(
+                json.dumps(
+                    store.latest(args.type, args.name), ensure_ascii=False, indent=2
+                )
+            )
+        else:
+            print(store.stats())
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,484 @@
+"""
+Indexed result store
+Latest scraped record of every profile and company in one SQLite table,
+keyed by entity type and slug and indexed by scrape time and content hash,
+so "do we have X, and since when" is a lookup instead of a directory scan
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import queue
+import sqlite3
+import argparse
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from ..config import (
+    DATA_DIR,
+    FRESHNESS_TTL_COMPANY,
+    FRESHNESS_TTL_PROFILE,
+    RESULTS_PATH,
+    SINK_BATCH_SIZE,
+)
+from ..logging import get_logger
+from .deltas import record_hash
+from .sinks import ResultSink
+
+logger = get_logger()
+
+# Seconds to wait before each retry of a batch the store rejected
+RETRY_DELAYS = (0.5, 2.0, 5.0)
+# Records read per lock acquisition while exporting
+EXPORT_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    entity_type TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    scraped_at REAL NOT NULL,
+    content_hash TEXT NOT NULL,
+    first_seen_at REAL NOT NULL,
+    changed_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (entity_type, slug)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_slug ON results(slug);
+CREATE INDEX IF NOT EXISTS results_scraped_at ON results(scraped_at);
+CREATE INDEX IF NOT EXISTS results_type_scraped_at
+    ON results(entity_type, scraped_at);
+CREATE INDEX IF NOT EXISTS results_changed_at ON results(changed_at);
+CREATE INDEX IF NOT EXISTS results_content_hash ON results(content_hash);
+"""
+
+# A row only replaces one scraped earlier, so batches arriving out of order
+# keep the newest record; changed_at moves only when the content differs
+UPSERT = """
+INSERT INTO results
+    (entity_type, slug, scraped_at, content_hash, first_seen_at, changed_at, data)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (entity_type, slug) DO UPDATE SET
+    scraped_at = excluded.scraped_at,
+    content_hash = excluded.content_hash,
+    changed_at = CASE
+        WHEN results.content_hash = excluded.content_hash THEN results.changed_at
+        ELSE excluded.scraped_at
+    END,
+    data = excluded.data
+WHERE excluded.scraped_at >= results.scraped_at
+"""
+
+COLUMNS = "entity_type, slug, scraped_at, content_hash, first_seen_at, changed_at"
+
+
+@dataclass
+class StoredResult:
+    """Index entry of a stored record."""
+
+    entity_type: str
+    slug: str
+    scraped_at: float
+    content_hash: str
+    first_seen_at: float
+    changed_at: float
+
+
+class ResultStore:
+    """
+    SQLite table of the latest record per profile and company
+
+    One connection is shared by the sink's writer thread and readers, so
+    every statement runs under `lock`.
+    """
+
+    def __init__(self, path=RESULTS_PATH, ttls=None):
+        """
+        Initialize the result store
+
+        Args:
+            path: SQLite database path
+            ttls: Seconds a record stays fresh, per entity type
+        """
+        self.ttls = ttls or {
+            "profile": FRESHNESS_TTL_PROFILE,
+            "company": FRESHNESS_TTL_COMPANY,
+        }
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def upsert_many(self, rows: Iterable[Tuple[str, str, dict, Optional[float]]]):
+        """
+        Insert or update records in one transaction
+
+        Args:
+            rows: (entity_type, slug, record, scraped_at) tuples; scraped_at
+                defaults to now
+
+        Returns:
+            int: Number of rows handed in
+        """
+        now = time.time()
+        params = []
+        for entity_type, slug, record, scraped_at in rows:
+            scraped_at = scraped_at or now
+            params.append(
+                (
+                    entity_type,
+                    slug,
+                    scraped_at,
+                    record_hash(record),
+                    scraped_at,
+                    scraped_at,
+                    json.dumps(record, ensure_ascii=False),
+                )
+            )
+        with self.lock:
+            with self.db:
+                self.db.executemany(UPSERT, params)
+        return len(params)
+
+    def upsert(self, entity_type: str, slug: str, record: dict, scraped_at=None):
+        """Insert or update one record."""
+        self.upsert_many([(entity_type, slug, record, scraped_at)])
+
+    def get(self, entity_type: str, slug: str) -> Optional[dict]:
+        """Stored record of a profile or company, if any."""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT data FROM results WHERE entity_type = ? AND slug = ?",
+                (entity_type, slug),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def info(self, entity_type: str, slug: str) -> Optional[StoredResult]:
+        """Index entry of a profile or company: when it was scraped and its hash."""
+        with self.lock:
+            row = self.db.execute(
+                f"SELECT {COLUMNS} FROM results WHERE entity_type = ? AND slug = ?",
+                (entity_type, slug),
+            ).fetchone()
+        return StoredResult(*row) if row else None
+
+    def is_fresh(self, entity_type: str, slug: str, max_age=None) -> bool:
+        """
+        Whether a record was scraped recently enough to skip it
+
+        Args:
+            entity_type: "profile" or "company"
+            slug: Profile or company name
+            max_age: Seconds, the entity type's freshness TTL by default
+
+        Returns:
+            bool: True when the record was scraped within max_age
+        """
+        max_age = self.ttls.get(entity_type, 0) if max_age is None else max_age
+        with self.lock:
+            row = self.db.execute(
+                "SELECT 1 FROM results WHERE entity_type = ? AND slug = ? "
+                "AND scraped_at >= ?",
+                (entity_type, slug, time.time() - max_age),
+            ).fetchone()
+        return row is not None
+
+    def _where(self, entity_type, slug, since, until, changed_since):
+        clauses, params = [], []
+        if entity_type:
+            clauses.append("entity_type = ?")
+            params.append(entity_type)
+        if slug:
+            clauses.append("slug GLOB ?")
+            params.append(slug)
+        if since is not None:
+            clauses.append("scraped_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("scraped_at < ?")
+            params.append(until)
+        if changed_since is not None:
+            clauses.append("changed_at >= ?")
+            params.append(changed_since)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(
+        self,
+        entity_type=None,
+        slug=None,
+        since=None,
+        until=None,
+        changed_since=None,
+        limit=None,
+    ) -> List[StoredResult]:
+        """
+        Find stored records, most recently scraped first
+
+        Args:
+            entity_type: Only records of this type
+            slug: Only records whose slug matches (glob patterns allowed)
+            since: Only records scraped at or after this timestamp
+            until: Only records scraped before this timestamp
+            changed_since: Only records whose content changed at or after
+                this timestamp
+            limit: Maximum number of records
+
+        Returns:
+            list: Matching index entries
+        """
+        where, params = self._where(entity_type, slug, since, until, changed_since)
+        sql = f"SELECT {COLUMNS} FROM results{where} ORDER BY scraped_at DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self.lock:
+            rows = self.db.execute(sql, params).fetchall()
+        return [StoredResult(*row) for row in rows]
+
+    def export(
+        self, entity_type=None, slug=None, since=None, until=None, changed_since=None
+    ) -> Iterator[dict]:
+        """
+        Stream stored records with their index fields, in slug order
+
+        Takes the same filters as query(). Records are read in chunks of
+        EXPORT_CHUNK, so the lock is not held while the caller consumes them.
+
+        Yields:
+            dict: entity_type, slug, scraped_at, content_hash and data
+        """
+        where, params = self._where(entity_type, slug, since, until, changed_since)
+        # Each chunk resumes after the last (entity_type, slug) of the previous
+        resume = " AND " if where else " WHERE "
+        resume += "(entity_type, slug) > (?, ?)"
+        after = ()
+        while True:
+            sql = (
+                "SELECT entity_type, slug, scraped_at, content_hash, data "
+                f"FROM results{where}{resume if after else ''} "
+                f"ORDER BY entity_type, slug LIMIT {EXPORT_CHUNK}"
+            )
+            with self.lock:
+                rows = self.db.execute(sql, params + list(after)).fetchall()
+            for entity_type, slug, scraped_at, content_hash, data in rows:
+                yield {
+                    "entity_type": entity_type,
+                    "slug": slug,
+                    "scraped_at": scraped_at,
+                    "content_hash": content_hash,
+                    "data": json.loads(data),
+                }
+            if len(rows) < EXPORT_CHUNK:
+                return
+            after = rows[-1][:2]
+
+    def import_dir(self, data_dir=DATA_DIR, batch_size=SINK_BATCH_SIZE) -> int:
+        """
+        Load `profile_*.json` and `company_*.json` files written by the JSON
+        sink, using their modification time as the scrape time
+
+        Args:
+            data_dir: Directory holding the files
+            batch_size: Records per transaction
+
+        Returns:
+            int: Number of records imported
+        """
+        batch, imported = [], 0
+        for entity_type in ("profile", "company"):
+            prefix = f"{entity_type}_"
+            for path in glob.glob(os.path.join(data_dir, f"{prefix}*.json")):
+                slug = os.path.basename(path)[len(prefix) : -len(".json")]
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        record = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.debug(f"Skipping {path}: {e}")
+                    continue
+                batch.append((entity_type, slug, record, os.path.getmtime(path)))
+                if len(batch) >= batch_size:
+                    imported += self.upsert_many(batch)
+                    batch = []
+        if batch:
+            imported += self.upsert_many(batch)
+        return imported
+
+    def stats(self):
+        """Record counts per entity type."""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT entity_type, COUNT(*) FROM results GROUP BY entity_type"
+            ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        """Close the database."""
+        with self.lock:
+            self.db.close()
+
+
+class SqliteSink(ResultSink):
+    """
+    Result sink upserting into a ResultStore from a writer thread
+
+    write() only queues the record; the writer takes whatever has queued up,
+    up to batch_size records, and upserts it in one transaction. A full
+    queue makes write() wait for the writer. A failed batch is retried after
+    RETRY_DELAYS, then written one record at a time, so only the records
+    the store keeps rejecting are lost (and counted in `errors`).
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        output_dir=DATA_DIR,
+        batch_size=SINK_BATCH_SIZE,
+        path=None,
+        retry_delays=RETRY_DELAYS,
+    ):
+        """
+        Initialize the sink
+
+        Args:
+            output_dir: Directory holding results.sqlite
+            batch_size: Most records per transaction
+            path: Database path, overriding output_dir
+            retry_delays: Seconds to wait before each retry of a failed batch
+        """
+        super().__init__(output_dir)
+        self.store = ResultStore(path or os.path.join(output_dir, "results.sqlite"))
+        self.batch_size = max(1, batch_size)
+        self.retry_delays = retry_delays
+        self.pending: queue.Queue = queue.Queue(maxsize=self.batch_size * 4)
+        self.batches = 0
+        self.errors = 0
+        self.writer = threading.Thread(
+            target=self._run, name="sqlite-sink", daemon=True
+        )
+        self.writer.start()
+
+    def _write(self, record_type, name, record):
+        self.pending.put((record_type, name, record, time.time()))
+
+    def _run(self):
+        closing = False
+        while not closing:
+            batch = [self.pending.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [row for row in batch if row is not None]
+            closing = len(rows) < len(batch)
+            try:
+                if rows:
+                    self._commit(rows)
+            finally:
+                for _ in batch:
+                    self.pending.task_done()
+
+    def _commit(self, rows):
+        for delay in (*self.retry_delays, None):
+            try:
+                self.store.upsert_many(rows)
+                self.batches += 1
+                return
+            except Exception as e:
+                if delay is None:
+                    logger.error(f"Upserting {len(rows)} result(s) failed: {e}")
+                    break
+                logger.warning(
+                    f"Upserting {len(rows)} result(s) failed, "
+                    f"retrying in {delay}s: {e}"
+                )
+                time.sleep(delay)
+
+        # Keep every record the store still accepts
+        for row in rows:
+            try:
+                self.store.upsert_many([row])
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Dropping result {row[0]} {row[1]}: {e}")
+
+    def flush(self):
+        """Wait until every queued record is committed."""
+        self.pending.join()
+
+    def close(self):
+        if self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
+            self.store.close()
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats.update(batches=self.batches, errors=self.errors)
+        return stats
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LinkedIn result store")
+    parser.add_argument(
+        "command", choices=["get", "fresh", "query", "export", "import", "stats"]
+    )
+    parser.add_argument("--db", default=RESULTS_PATH, help="Result database path")
+    parser.add_argument("--type", choices=["profile", "company"])
+    parser.add_argument("--slug", help="Profile or company name (glob for query)")
+    parser.add_argument("--since", help="Scraped since (ISO date or timestamp)")
+    parser.add_argument("--changed-since", help="Content changed since")
+    parser.add_argument("--max-age", type=int, help="Seconds a record is fresh")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--dir", default=DATA_DIR, help="JSON files to import")
+    args = parser.parse_args()
+
+    store = ResultStore(path=args.db)
+    filters = {
+        "entity_type": args.type,
+        "slug": args.slug,
+        "since": _timestamp(args.since),
+        "changed_since": _timestamp(args.changed_since),
+    }
+    try:
+        if args.command in ("get", "fresh"):
+            if not args.type or not args.slug:
+                parser.error(f"{args.command} needs --type and --slug")
+            if args.command == "get":
+                info = store.info(args.type, args.slug)
+                record = store.get(args.type, args.slug)
+                print(json.dumps({"info": info and info.__dict__, "data": record}))
+            else:
+                fresh = store.is_fresh(args.type, args.slug, args.max_age)
+                print("fresh" if fresh else "stale")
+                sys.exit(0 if fresh else 1)
+        elif args.command == "query":
+            for result in store.query(limit=args.limit, **filters):
+                print(json.dumps(result.__dict__))
+        elif args.command == "export":
+            for row in store.export(**filters):
+                print(json.dumps(row, ensure_ascii=False))
+        elif args.command == "import":
+            print(f"imported {store.import_dir(args.dir)} record(s)")
+        else:
+            print(store.stats())
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+Result sinks
+Where scraped records end up: one JSON file per target (the default), an
+append-only NDJSON stream rotated by size, Parquet files written every
+N records, or the indexed SQLite result store. Sinks are thread-safe and
+keep their own throughput counters
+"""
+
+import os
+import json
+import time
+import asyncio
+import argparse
+import itertools
+import threading
+from typing import List, Optional
+
+from ..config import DATA_DIR, SINK_BATCH_SIZE, SINK_ROTATE_BYTES
+from ..logging import get_logger
+from ..metrics import SINK_RECORDS
+from .writer import get_writer
+
+logger = get_logger()
+
+# Distinguishes the files of sinks opened by one process in the same second
+_sink_ids = itertools.count()
+
+
+def _stream_name() -> str:
+    stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+    return f"results-{stamp}-{os.getpid()}-{next(_sink_ids)}"
+
+
+class ResultSink:
+    """
+    Destination for scraped records. Subclasses implement _write() and, when
+    they buffer, flush(); write() serializes callers and counts throughput,
+    awrite() does the same off the event loop.
+    """
+
+    name = "sink"
+
+    def __init__(self, output_dir=DATA_DIR):
+        """
+        Initialize the sink
+
+        Args:
+            output_dir: Directory the sink writes into
+        """
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.records = 0
+        self.seconds = 0.0
+
+    def write(self, record_type: str, name: str, record: dict):
+        """
+        Hand a scraped record to the sink
+
+        Args:
+            record_type: "profile" or "company"
+            name: Profile or company name
+            record: Scraped record
+        """
+        start = time.perf_counter()
+        with self.lock:
+            self._write(record_type, name, record)
+        self._count(time.perf_counter() - start)
+
+    async def awrite(self, record_type: str, name: str, record: dict):
+        """write() for coroutines, run in a worker thread."""
+        await asyncio.to_thread(self.write, record_type, name, record)
+
+    def _count(self, seconds: float):
+        with self.lock:
+            self.seconds += seconds
+            self.records += 1
+        SINK_RECORDS.inc(sink=self.name)
+
+    def _write(self, record_type: str, name: str, record: dict):
+        raise NotImplementedError
+
+    def flush(self):
+        """Write out buffered records."""
+
+    def close(self):
+        """Flush and release the sink's files."""
+        self.flush()
+
+    def stats(self) -> dict:
+        """Records written and time spent writing them."""
+        return {
+            "sink": self.name,
+            "records": self.records,
+            "seconds": self.seconds,
+            "records_per_second": self.records / self.seconds if self.seconds else 0.0,
+        }
+
+
+class JsonFileSink(ResultSink):
+    """
+    One pretty-printed `<type>_<name>.json` per target, replaced atomically
+    on every scrape by the background file writer
+    """
+
+    name = "json"
+
+    def __init__(self, output_dir=DATA_DIR, writer=None):
+        """
+        Initialize the sink
+
+        Args:
+            output_dir: Directory the files are written into
+            writer: FileWriter to queue the files on, the process-wide one
+                by default
+        """
+        super().__init__(output_dir)
+        self.writer = writer or get_writer()
+
+    def path(self, record_type: str, name: str) -> str:
+        """File a target's record is written to."""
+        return os.path.join(self.output_dir, f"{record_type}_{name}.json")
+
+    def _write(self, record_type, name, record):
+        self.writer.submit(self.path(record_type, name), record, indent=True)
+
+    async def awrite(self, record_type, name, record):
+        start = time.perf_counter()
+        await self.writer.write_json(self.path(record_type, name), record, indent=True)
+        self._count(time.perf_counter() - start)
+
+    def flush(self):
+        """Wait until the writer has written the queued files."""
+        self.writer.flush()
+
+
+class NdjsonSink(ResultSink):
+    """
+    Append-only stream of one JSON line per scrape, started afresh once the
+    current file reaches the rotation size
+    """
+
+    name = "ndjson"
+
+    def __init__(self, output_dir=DATA_DIR, rotate_bytes=SINK_ROTATE_BYTES):
+        """
+        Initialize the sink
+
+        Args:
+            output_dir: Directory the stream files are written into
+            rotate_bytes: Size after which the next file is started
+        """
+        super().__init__(output_dir)
+        self.rotate_bytes = rotate_bytes
+        self.stream = _stream_name()
+        self.part = 0
+        self.file = None
+        self.files: List[str] = []
+
+    def _open(self):
+        self.part += 1
+        path = os.path.join(self.output_dir, f"{self.stream}-{self.part:05d}.ndjson")
+        self.file = open(path, "a", encoding="utf-8")
+        self.files.append(path)
+
+    def _write(self, record_type, name, record):
+        if self.file is None:
+            self._open()
+        line = json.dumps(
+            {
+                "type": record_type,
+                "name": name,
+                "scraped_at": time.time(),
+                "data": record,
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        self.file.write(line + "\n")
+        if self.rotate_bytes and self.file.tell() >= self.rotate_bytes:
+            self.file.close()
+            self.file = None
+
+    def flush(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.flush()
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+class ParquetSink(ResultSink):
+    """
+    Columnar files of type, name, scrape time and the record as JSON text,
+    one file per batch of records. Needs pyarrow.
+    """
+
+    name = "parquet"
+
+    def __init__(self, output_dir=DATA_DIR, batch_size=SINK_BATCH_SIZE):
+        """
+        Initialize the sink
+
+        Args:
+            output_dir: Directory the Parquet files are written into
+            batch_size: Records buffered before a file is written
+        """
+        # Optional dependency, only needed when the Parquet sink is used
+        import pyarrow
+        import pyarrow.parquet
+
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        super().__init__(output_dir)
+        self.batch_size = max(1, batch_size)
+        self.stream = _stream_name()
+        self.part = 0
+        self.rows = {"type": [], "name": [], "scraped_at": [], "data": []}
+        self.files: List[str] = []
+
+    def _write(self, record_type, name, record):
+        self.rows["type"].append(record_type)
+        self.rows["name"].append(name)
+        self.rows["scraped_at"].append(time.time())
+        self.rows["data"].append(json.dumps(record, ensure_ascii=False))
+        if len(self.rows["name"]) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self.rows["name"]:
+            return
+        table = self.pa.table(self.rows)
+        self.part += 1
+        path = os.path.join(self.output_dir, f"{self.stream}-{self.part:05d}.parquet")
+        tmp_path = f"{path}.tmp"
+        self.pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+        self.files.append(path)
+        self.rows = {key: [] for key in self.rows}
+        logger.debug(f"Wrote {table.num_rows} records to {path}")
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+
+def _sqlite_sink(output_dir, **kwargs) -> ResultSink:
+    # The result store builds on this module, so it is imported on use
+    from .results import SqliteSink
+
+    return SqliteSink(output_dir, **kwargs)
+
+
+SINKS = {
+    "json": JsonFileSink,
+    "ndjson": NdjsonSink,
+    "parquet": ParquetSink,
+    "sqlite": _sqlite_sink,
+}
+
+
+def open_sink(name: str, output_dir=DATA_DIR, **kwargs) -> ResultSink:
+    """
+    Open a result sink by name
+
+    Args:
+        name: "json", "ndjson", "parquet" or "sqlite"
+        output_dir: Directory the sink writes into
+        kwargs: Sink options (rotate_bytes, batch_size, retry_delays)
+
+    Returns:
+        ResultSink: The sink
+    """
+    if name not in SINKS:
+        raise ValueError(f"Unknown sink {name!r}, expected one of {', '.join(SINKS)}")
+    return SINKS[name](output_dir, **kwargs)
+
+
+def benchmark_sink(
+    name: str, output_dir: str, records: int = 10000, record: Optional[dict] = None
+) -> dict:
+    """
+    Write synthetic records through a sink and measure its throughput
+
+    Args:
+        name: Sink name
+        output_dir: Directory the sink writes into
+        records: Number of records
+        record: Record written each time, a typical profile by default
+
+    Returns:
+        dict: Records and records per second, closing included
+    """
+    record = record or {
+        "name": "Jane Doe",
+        "headline": "Staff Engineer",
+        "location": "Sydney",
+        "about": "Builds things. " * 20,
+        "experiences": [
+            {"title": f"Engineer {i}", "company": f"Company {i}"} for i in range(8)
+        ],
+        "skills": [f"Skill {i}" for i in range(20)],
+    }
+    sink = open_sink(name, output_dir)
+    start = time.perf_counter()
+    for i in range(records):
+        sink.write("profile", f"bench-{i}", record)
+    sink.close()
+    elapsed = time.perf_counter() - start
+    return {
+        "sink": name,
+        "records": records,
+        "seconds": elapsed,
+        "records_per_second": records / elapsed if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Result sink throughput")
+    parser.add_argument("--sink", choices=list(SINKS), action="append")
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument(
+        "--dir",
+        default=os.path.join(DATA_DIR, "bench", "sinks"),
+        help="Directory the sinks write into",
+    )
+    args = parser.parse_args()
+
+    for name in args.sink or list(SINKS):
+        output_dir = os.path.join(args.dir, name)
+        try:
+            result = benchmark_sink(name, output_dir, args.records)
+        except ImportError as e:
+            print(f"{name}: skipped ({e})")
+            continue
+        print(
+            f"{name}: {result['records_per_second']:.0f} records/s "
+            f"({result['records']} in {result['seconds']:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+Off-event-loop file writer
+Coroutines hand JSON documents to a bounded queue instead of opening files
+themselves; one background thread serializes them, takes them in batches
+and replaces each file atomically (temporary file plus rename), or appends
+them as lines to a JSON lines file. Queue depth,
+batches, files and time spent waiting on a full queue are in the metrics
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import asyncio
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config import WRITER_BATCH_SIZE, WRITER_QUEUE_SIZE
+from ..logging import get_logger
+from ..metrics import (
+    WRITER_BACKPRESSURE_SECONDS,
+    WRITER_BATCHES,
+    WRITER_FILES,
+    WRITER_PENDING,
+)
+
+logger = get_logger()
+
+try:
+    # Optional dependency, several times faster than json for large records
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(data: Any, indent: bool = False) -> bytes:
+    """
+    Serialize a document to UTF-8 JSON, with orjson when it is installed
+
+    Args:
+        data: JSON-serializable document
+        indent: Pretty-print with two spaces
+
+    Returns:
+        bytes: Encoded document
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    text = json.dumps(data, ensure_ascii=False, indent=2 if indent else None)
+    return text.encode("utf-8")
+
+
+class FileWriter:
+    """
+    Writes JSON files from a background thread
+
+    A document queued for a path that is queued again within the same batch
+    is written once, with the newer content. Appended lines are never
+    coalesced; the lines a batch holds for one file are appended in one
+    write, in the order they were queued.
+    """
+
+    def __init__(self, max_pending=WRITER_QUEUE_SIZE, batch_size=WRITER_BATCH_SIZE):
+        """
+        Initialize the writer and start its thread
+
+        Args:
+            max_pending: Documents queued before writers have to wait
+            batch_size: Most documents taken off the queue at once
+        """
+        self.pending: queue.Queue = queue.Queue(maxsize=max(1, max_pending))
+        self.batch_size = max(1, batch_size)
+        self.files = 0
+        self.bytes = 0
+        self.batches = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.thread = threading.Thread(
+            target=self._run, name="file-writer", daemon=True
+        )
+        self.thread.start()
+
+    def submit(
+        self,
+        path: str,
+        data: Any,
+        indent: bool = False,
+        done: Optional[Callable[[Optional[BaseException]], None]] = None,
+    ):
+        """
+        Queue a document, waiting while the queue is full; for threads
+
+        Args:
+            path: File to replace
+            data: JSON-serializable document
+            indent: Pretty-print the document
+            done: Called from the writer thread with None or the write error
+        """
+        self._put((path, data, indent, done, False))
+
+    def append(self, path: str, data: Any, block: bool = True) -> bool:
+        """
+        Queue a document to append as one line, waiting while the queue is
+        full; for threads and callbacks that cannot await
+
+        Args:
+            path: JSON lines file to append to
+            data: JSON-serializable document
+            block: Wait for room; when False a full queue drops the document
+
+        Returns:
+            False if the document was dropped, True otherwise
+        """
+        return self._put((path, data, False, None, True), block)
+
+    def _put(self, item, block: bool = True) -> bool:
+        if not self.thread.is_alive():
+            # Closed, e.g. by an atexit hook running before the caller's
+            self._write_batch([item])
+            return True
+        try:
+            self.pending.put_nowait(item)
+        except queue.Full:
+            if not block:
+                return False
+            start = time.perf_counter()
+            self.pending.put(item)
+            self._waited(time.perf_counter() - start)
+        return True
+
+    async def write_json(
+        self, path: str, data: Any, indent: bool = False, wait: bool = False
+    ):
+        """
+        Queue a document without blocking the event loop
+
+        Args:
+            path: File to replace
+            data: JSON-serializable document, not to be changed afterwards
+            indent: Pretty-print the document
+            wait: Return only once the file is written, raising its error
+        """
+        if not self.thread.is_alive():
+            # Closed, e.g. by an atexit hook: write it from a worker thread
+            errors = []
+            item = (path, data, indent, errors.append, False)
+            await asyncio.to_thread(self._write_batch, [item])
+            if wait and errors[0] is not None:
+                raise errors[0]
+            return
+
+        future = None
+        done = None
+        if wait:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+
+            def done(error):
+                loop.call_soon_threadsafe(_resolve, future, error)
+
+        item = (path, data, indent, done, False)
+        try:
+            self.pending.put_nowait(item)
+        except queue.Full:
+            # Backpressure: the coroutine waits, the event loop does not
+            start = time.perf_counter()
+            await asyncio.to_thread(self.pending.put, item)
+            self._waited(time.perf_counter() - start)
+        if future is not None:
+            await future
+
+    def _waited(self, seconds: float):
+        self.waits += 1
+        self.wait_seconds += seconds
+        WRITER_BACKPRESSURE_SECONDS.inc(seconds)
+
+    def _run(self):
+        closing = False
+        while not closing:
+            batch = [self.pending.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            closing = None in batch
+            try:
+                self._write_batch([item for item in batch if item is not None])
+            finally:
+                for _ in batch:
+                    self.pending.task_done()
+
+    def _write_batch(self, batch):
+        latest = {}
+        lines: Dict[str, List[bytes]] = {}
+        callbacks = []
+        for path, data, indent, done, append in batch:
+            if append:
+                lines.setdefault(path, []).append(data)
+                continue
+            if path in latest:
+                self.coalesced += 1
+            latest[path] = (data, indent)
+            if done is not None:
+                callbacks.append((path, done))
+        errors = {}
+        for path, (data, indent) in latest.items():
+            try:
+                self._replace(path, dumps(data, indent))
+            except Exception as e:
+                self.errors += 1
+                errors[path] = e
+                # The document is lost, e.g. a scrape output
+                logger.warning(f"Error writing {path}: {e}")
+        for path, documents in lines.items():
+            try:
+                self._append(path, b"".join(dumps(d) + b"\n" for d in documents))
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Error appending to {path}: {e}")
+        if latest or lines:
+            self.batches += 1
+            WRITER_BATCHES.inc()
+        for path, done in callbacks:
+            try:
+                done(errors.get(path))
+            except Exception as e:
+                logger.debug(f"Write callback for {path} failed: {e}")
+
+    def _replace(self, path: str, payload: bytes):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.files += 1
+        self.bytes += len(payload)
+        WRITER_FILES.inc()
+
+    def _append(self, path: str, payload: bytes):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "ab") as f:
+            f.write(payload)
+        self.bytes += len(payload)
+
+    def flush(self):
+        """Wait until every queued document is written."""
+        self.pending.join()
+
+    async def aflush(self):
+        """flush() without blocking the event loop."""
+        await asyncio.to_thread(self.flush)
+
+    def close(self):
+        """Write what is queued and stop the thread."""
+        if self.thread.is_alive():
+            self.pending.put(None)
+            self.thread.join()
+
+    def stats(self) -> dict:
+        """Queue depth, files, batches and backpressure so far."""
+        return {
+            "pending": self.pending.qsize(),
+            "files": self.files,
+            "bytes": self.bytes,
+            "batches": self.batches,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "backpressure_waits": self.waits,
+            "backpressure_seconds": self.wait_seconds,
+        }
+
+
+def _resolve(future: asyncio.Future, error: Optional[BaseException]):
+    if future.done():
+        return
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
+
+
+_writer: Optional[FileWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> FileWriter:
+    """
+    The process-wide writer, started on first use and drained at exit
+
+    Returns:
+        FileWriter: The writer
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = FileWriter()
+            WRITER_PENDING.set_function(_writer.pending.qsize)
+            atexit.register(_writer.close)
+        return _writer
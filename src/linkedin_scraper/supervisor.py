@@ -0,0 +1,474 @@
+"""
+LinkedIn Scraper - Supervisor Module
+Shards scrape jobs over worker processes so cleaning, JSON and Playwright
+marshalling are spread over several cores instead of one event loop. Each
+worker process owns a browser with a pool of warm contexts and asks the
+supervisor's backlog for work; the supervisor collects results and
+metrics, restarts workers that die (requeueing the jobs they held) and
+shuts down gracefully.
+
+    python -m src.linkedin_scraper.supervisor --profile --names names.txt \\
+        --processes 4 --concurrency 2 --output data/results.jsonl
+"""
+
+import os
+import json
+import time
+import uuid
+import signal
+import asyncio
+import argparse
+import multiprocessing
+from collections import deque
+from multiprocessing.connection import Connection, wait
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .config import (
+    JOB_MAX_ATTEMPTS,
+    METRICS_PORT,
+    SUPERVISOR_CONCURRENCY,
+    SUPERVISOR_METRICS_INTERVAL,
+    SUPERVISOR_PROCESSES,
+)
+from .logging import get_logger
+from .metrics import (
+    JOBS,
+    REGISTRY,
+    WORKER_RESTARTS,
+    merge_families,
+    render_family,
+    serve_metrics,
+)
+from .tracing import flush_traces, span
+
+logger = get_logger()
+
+
+def make_job(type: str, name: str, mode: str = "data", llm: bool = False) -> dict:
+    """Job spec sent to the workers; plain dicts pickle cheaply."""
+    return {
+        "id": uuid.uuid4().hex,
+        "type": type,
+        "name": name,
+        "mode": mode,
+        "llm": llm,
+        "attempts": 0,
+    }
+
+
+async def _work(index: int, scraper, inbox: asyncio.Queue, conn: Connection):
+    from .daemon import Job, run_job
+
+    while True:
+        spec = await inbox.get()
+        if spec is None:
+            return
+        job = Job(
+            type=spec["type"],
+            name=spec["name"],
+            mode=spec["mode"],
+            llm=spec["llm"],
+            id=spec["id"],
+        )
+        result, error = None, None
+        try:
+            with span("job", type=job.type, target=job.name, mode=job.mode):
+                result = await run_job(scraper, job)
+            if isinstance(result, dict) and "error" in result:
+                error = result["error"]
+        except Exception as e:
+            logger.debug(f"Worker {index} job {job.id} failed: {e}")
+            error = str(e)
+        status = "failed" if error else "done"
+        JOBS.inc(type=job.type, status=status)
+        conn.send(("result", spec["id"], status, result, error))
+
+
+async def _receive(conn: Connection, inbox: asyncio.Queue, workers: int):
+    # One reader for the pipe; a None from the supervisor, or the supervisor
+    # going away, stops every worker
+    while True:
+        try:
+            spec = await asyncio.to_thread(conn.recv)
+        except (EOFError, OSError):
+            spec = None
+        if spec is None:
+            for _ in range(workers):
+                inbox.put_nowait(None)
+            return
+        inbox.put_nowait(spec)
+
+
+async def _report_metrics(conn: Connection, interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        conn.send(("metrics", await asyncio.to_thread(REGISTRY.collect)))
+
+
+async def _serve(index, conn, concurrency, headless, scraper_factory):
+    from .daemon import start_scrapers
+
+    kwargs = {"scraper_factory": scraper_factory} if scraper_factory else {}
+    try:
+        scrapers = await start_scrapers(concurrency, headless, **kwargs)
+    except Exception as e:
+        conn.send(("error", str(e)))
+        return
+    conn.send(("ready", os.getpid()))
+    inbox: asyncio.Queue = asyncio.Queue()
+    receiver = asyncio.create_task(_receive(conn, inbox, len(scrapers)))
+    reporter = asyncio.create_task(_report_metrics(conn, SUPERVISOR_METRICS_INTERVAL))
+    try:
+        await asyncio.gather(*(_work(index, s, inbox, conn) for s in scrapers))
+    finally:
+        reporter.cancel()
+        # Shared contexts first, the browser owner last
+        for scraper in reversed(scrapers):
+            await scraper.cleanup()
+        conn.send(("metrics", REGISTRY.collect()))
+        flush_traces()
+        await receiver
+
+
+def run_worker(index, conn, concurrency, headless, scraper_factory):
+    """Entry point of a worker process."""
+    # Ctrl-C reaches the whole process group; the supervisor decides
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        asyncio.run(_serve(index, conn, concurrency, headless, scraper_factory))
+    except (EOFError, BrokenPipeError):
+        # The supervisor went away
+        pass
+
+
+class Worker:
+    """
+    Supervisor-side handle of a worker process
+    """
+
+    def __init__(self, index: int, process, conn: Connection):
+        self.index = index
+        self.process = process
+        self.conn = conn
+        self.ready = False
+        self.stopping = False
+        self.exited = False
+        # Job IDs sent to the worker and not finished yet
+        self.held = set()
+        self.snapshot: list = []
+
+
+class Supervisor:
+    """
+    Runs a backlog of jobs on K worker processes
+    """
+
+    def __init__(
+        self,
+        processes=SUPERVISOR_PROCESSES,
+        concurrency=SUPERVISOR_CONCURRENCY,
+        headless=True,
+        max_attempts=JOB_MAX_ATTEMPTS,
+        scraper_factory: Optional[Callable] = None,
+    ):
+        """
+        Initialize the supervisor
+
+        Args:
+            processes: Worker processes, one browser each
+            concurrency: Browser contexts (concurrent jobs) per process
+            headless: Run the browsers headless
+            max_attempts: Times a job is handed out when its worker dies
+            scraper_factory: Picklable callable returning a LinkedInScraper-like
+                object, LinkedInScraper by default
+        """
+        self.processes = processes
+        self.concurrency = concurrency
+        self.headless = headless
+        self.max_attempts = max(1, max_attempts)
+        self.scraper_factory = scraper_factory
+        # Spawned rather than forked: the parent may run threads, and each
+        # worker starts its own Playwright driver
+        self.mp = multiprocessing.get_context("spawn")
+        self.workers: Dict[int, Worker] = {}
+        self.backlog = deque()
+        self.specs: Dict[str, dict] = {}
+        self.results: Dict[str, dict] = {}
+        # Counters of workers that died, kept so totals never go backwards
+        self.retired: List[list] = []
+        self.restarts = 0
+        self.stopping = False
+        self.on_result: Optional[Callable[[dict], None]] = None
+
+    def _spawn(self, index: int):
+        parent_conn, child_conn = self.mp.Pipe()
+        process = self.mp.Process(
+            target=run_worker,
+            args=(
+                index,
+                child_conn,
+                self.concurrency,
+                self.headless,
+                self.scraper_factory,
+            ),
+            name=f"scraper-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        # Only the child keeps its end, so a dead child reads as EOF
+        child_conn.close()
+        self.workers[index] = Worker(index, process, parent_conn)
+
+    def start(self, timeout: float = 120.0):
+        """
+        Start the workers
+
+        The first worker logs in alone; the rest start once it is ready and
+        reuse the storage state it saved instead of logging in again.
+        """
+        self._spawn(0)
+        self._wait_ready([0], timeout)
+        for index in range(1, self.processes):
+            self._spawn(index)
+        self._wait_ready(list(range(1, self.processes)), timeout)
+        logger.debug(f"Supervisor started {len(self.workers)} worker processes")
+
+    def _wait_ready(self, indexes: List[int], timeout: float):
+        deadline = time.monotonic() + timeout
+        while not all(self.workers[i].ready for i in indexes):
+            if time.monotonic() > deadline:
+                raise RuntimeError("Timed out waiting for workers to start")
+            self.poll()
+            for i in indexes:
+                if self.workers[i].exited and not self.workers[i].ready:
+                    raise RuntimeError(f"Worker {i} failed to start")
+
+    @property
+    def outstanding(self) -> int:
+        """Jobs submitted and not finished yet."""
+        return len(self.specs)
+
+    def submit(self, spec: dict):
+        """Add a job spec (see make_job) to the backlog."""
+        self.specs[spec["id"]] = spec
+        self.backlog.append(spec)
+        self._dispatch()
+
+    def _dispatch(self):
+        # Keep every worker at `concurrency` jobs, so none sits idle while
+        # another holds a queue of work it may die with
+        for worker in self.workers.values():
+            if not worker.ready or worker.stopping or worker.exited:
+                continue
+            while self.backlog and len(worker.held) < self.concurrency:
+                spec = self.backlog.popleft()
+                spec["attempts"] += 1
+                worker.held.add(spec["id"])
+                try:
+                    worker.conn.send(spec)
+                except (BrokenPipeError, OSError):
+                    break
+
+    def poll(self, timeout: float = 0.5):
+        """Handle worker messages for up to `timeout` seconds."""
+        conns = {
+            worker.conn: worker for worker in self.workers.values() if not worker.exited
+        }
+        for conn in wait(list(conns), timeout):
+            worker = conns[conn]
+            try:
+                while conn.poll():
+                    self._handle(worker, conn.recv())
+            except (EOFError, OSError):
+                self._exited(worker)
+        self._dispatch()
+
+    def _handle(self, worker: Worker, message):
+        kind = message[0]
+        if kind == "ready":
+            worker.ready = True
+        elif kind == "error":
+            logger.debug(f"Worker {worker.index} could not start: {message[1]}")
+        elif kind == "metrics":
+            worker.snapshot = message[1]
+        elif kind == "result":
+            _, job_id, status, result, error = message
+            worker.held.discard(job_id)
+            self._finish(job_id, status, result, error, worker.index)
+
+    def _finish(self, job_id, status, result, error, worker=None):
+        spec = self.specs.pop(job_id, None)
+        if spec is None:
+            return
+        record = {
+            "id": job_id,
+            "type": spec["type"],
+            "name": spec["name"],
+            "status": status,
+            "attempts": spec["attempts"],
+            "worker": worker,
+            "result": result,
+            "error": error,
+        }
+        self.results[job_id] = record
+        if self.on_result is not None:
+            self.on_result(record)
+
+    def _exited(self, worker: Worker):
+        worker.exited = True
+        worker.conn.close()
+        worker.process.join(timeout=5)
+        # Keep what it counted, forget what it was holding
+        self.retired.append([f for f in worker.snapshot if f[1] != "gauge"])
+        worker.snapshot = []
+        if worker.stopping or not worker.ready:
+            return
+
+        logger.debug(
+            f"Worker {worker.index} (pid {worker.process.pid}) died with exit "
+            f"code {worker.process.exitcode}, restarting"
+        )
+        self.restarts += 1
+        WORKER_RESTARTS.inc()
+        for job_id in worker.held:
+            spec = self.specs.get(job_id)
+            if spec is None:
+                continue
+            if spec["attempts"] >= self.max_attempts:
+                self._finish(job_id, "failed", None, "worker died")
+            else:
+                logger.debug(f"Requeueing {spec['type']} {spec['name']}")
+                self.backlog.appendleft(spec)
+        if not self.stopping:
+            self._spawn(worker.index)
+
+    def run(self, specs: Iterable[dict], on_result=None) -> dict:
+        """
+        Run jobs to completion and stop the workers
+
+        Args:
+            specs: Job specs (see make_job)
+            on_result: Called with each finished job's record
+
+        Returns:
+            dict: Summary with counts, elapsed time and jobs per minute
+        """
+        self.on_result = on_result
+        start = time.perf_counter()
+        interrupted = False
+        try:
+            if not self.workers:
+                self.start()
+            for spec in specs:
+                self.submit(spec)
+            while self.outstanding:
+                self.poll()
+                if all(worker.exited for worker in self.workers.values()):
+                    raise RuntimeError("All worker processes died")
+        except KeyboardInterrupt:
+            interrupted = True
+            logger.debug("Interrupted, letting workers finish their current jobs")
+        finally:
+            self.stop()
+        elapsed = time.perf_counter() - start
+        statuses = [record["status"] for record in self.results.values()]
+        return {
+            "processes": self.processes,
+            "concurrency": self.concurrency,
+            "done": statuses.count("done"),
+            "failed": statuses.count("failed"),
+            "not_run": self.outstanding,
+            "restarts": self.restarts,
+            "interrupted": interrupted,
+            "elapsed": elapsed,
+            "jobs_per_minute": len(statuses) / elapsed * 60 if elapsed else 0.0,
+        }
+
+    def stop(self, timeout: float = 30.0):
+        """
+        Stop the workers once they finish the jobs they hold
+
+        Results and final metrics are still collected; workers that do not
+        exit within `timeout` seconds are terminated.
+        """
+        self.stopping = True
+        for worker in self.workers.values():
+            worker.stopping = True
+            if not worker.exited:
+                try:
+                    worker.conn.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+        deadline = time.monotonic() + timeout
+        while not all(worker.exited for worker in self.workers.values()):
+            if time.monotonic() > deadline:
+                break
+            self.poll(0.1)
+        for worker in self.workers.values():
+            if worker.process.is_alive():
+                logger.debug(f"Terminating worker pid {worker.process.pid}")
+                worker.process.terminate()
+                worker.process.join(timeout=5)
+
+    def render(self) -> str:
+        """Metrics of every worker plus the supervisor, summed."""
+        # Called from the metrics server thread too, iterate over copies
+        snapshots = [REGISTRY.collect(), *list(self.retired)]
+        snapshots.extend(worker.snapshot for worker in list(self.workers.values()))
+        families = merge_families(snapshots)
+        return "\n".join(render_family(family) for family in families) + "\n"
+
+
+def read_names(path: str) -> List[str]:
+    """Target names from a file, one per line, # comments ignored."""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = (line.split("#", 1)[0].strip() for line in f)
+        return [line for line in lines if line]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded scrape supervisor")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--profile", action="store_true", help="Scrape profiles")
+    group.add_argument("--company", action="store_true", help="Scrape companies")
+    parser.add_argument("--names", required=True, help="File with one name per line")
+    parser.add_argument("--mode", choices=("data", "html"), default="data")
+    parser.add_argument("--llm", action="store_true", help="LLM extraction (html)")
+    parser.add_argument("--processes", type=int, default=SUPERVISOR_PROCESSES)
+    parser.add_argument("--concurrency", type=int, default=SUPERVISOR_CONCURRENCY)
+    parser.add_argument("--headful", action="store_true")
+    parser.add_argument("--output", help="JSON lines file for the results")
+    parser.add_argument("--metrics-port", type=int, default=METRICS_PORT)
+    args = parser.parse_args()
+
+    target_type = "profile" if args.profile else "company"
+    specs = [
+        make_job(target_type, name, args.mode, args.llm)
+        for name in read_names(args.names)
+    ]
+    supervisor = Supervisor(
+        processes=args.processes,
+        concurrency=args.concurrency,
+        headless=not args.headful,
+    )
+    if args.metrics_port:
+        serve_metrics(args.metrics_port, registry=supervisor)
+
+    output = open(args.output, "a", encoding="utf-8") if args.output else None
+
+    def on_result(record):
+        if output is not None:
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"{record['status']:6} {record['type']} {record['name']}")
+
+    try:
+        summary = supervisor.run(specs, on_result=on_result)
+    finally:
+        if output is not None:
+            output.close()
+    print(json.dumps(summary, indent=2))
+    raise SystemExit(1 if summary["failed"] or summary["not_run"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+LinkedIn Scraper - Tracing Module
+Lightweight spans for scrape jobs: every job gets a trace ID carried in a
+ContextVar, nested spans time its stages, and finished spans are exported
+as OTLP/JSON lines. When tracing is disabled span() returns a shared no-op
+context manager, so instrumented code pays one global lookup per call
+"""
+
+import os
+import time
+import atexit
+import secrets
+import threading
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from .config import TRACE_BATCH_SIZE, TRACE_PATH, TRACING
+from .logging import get_logger
+
+logger = get_logger()
+
+SERVICE_NAME = "linkedin-scraper"
+SCOPE_NAME = "linkedin_scraper"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+_NOOP = nullcontext()
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict) -> List[dict]:
+    return [
+        {"key": key, "value": _otlp_value(value)} for key, value in attributes.items()
+    ]
+
+
+class Span:
+    """
+    One timed operation; a span without a parent starts a new trace
+    """
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "attributes",
+        "events",
+        "start_ns",
+        "end_ns",
+        "status_code",
+        "status_message",
+        "_token",
+    )
+
+    def __init__(self, name: str, attributes: Dict, parent: Optional["Span"]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.events = []
+        self.start_ns = 0
+        self.end_ns = 0
+        self.status_code = "STATUS_CODE_UNSET"
+        self.status_message = ""
+        self._token = None
+
+    def set_attribute(self, key: str, value):
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def add_event(self, name: str, **attributes):
+        """Record a point-in-time event inside the span."""
+        self.events.append((time.time_ns(), name, attributes))
+
+    @property
+    def duration(self) -> float:
+        """Seconds between start and end."""
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def __enter__(self):
+        self.start_ns = time.time_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.status_code = "STATUS_CODE_ERROR"
+            self.status_message = str(exc)
+            self.add_event(
+                "exception",
+                **{"exception.type": exc_type.__name__, "exception.message": str(exc)},
+            )
+        elif self.status_code == "STATUS_CODE_UNSET":
+            self.status_code = "STATUS_CODE_OK"
+        _tracer.export(self)
+        return False
+
+    def to_otlp(self) -> dict:
+        """The span in OTLP/JSON form."""
+        data = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": "SPAN_KIND_INTERNAL",
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status_code},
+        }
+        if self.parent_span_id:
+            data["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            data["status"]["message"] = self.status_message
+        if self.events:
+            data["events"] = [
+                {
+                    "timeUnixNano": str(ts),
+                    "name": name,
+                    "attributes": _otlp_attributes(attributes),
+                }
+                for ts, name, attributes in self.events
+            ]
+        return data
+
+
+class JsonlExporter:
+    """
+    Appends finished spans to a file, one OTLP/JSON export request per line
+    (the format read by the OpenTelemetry Collector's otlpjsonfile receiver)
+
+    Lines are appended by the background file writer, so spans finishing on
+    the event loop never wait for the disk: a batch that finds the writer's
+    queue full is dropped and counted in `dropped`.
+    """
+
+    def __init__(self, path=TRACE_PATH, batch_size=TRACE_BATCH_SIZE, writer=None):
+        """
+        Initialize the exporter
+
+        Args:
+            path: JSON lines file to append to
+            batch_size: Spans buffered before a line is written
+            writer: File writer to append through; the shared one by default
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.buffer: List[Span] = []
+        self.lock = threading.Lock()
+        self.dropped = 0
+        if writer is None:
+            # The storage package imports the metrics, which import this module
+            from .storage.writer import get_writer
+
+            writer = get_writer()
+        self.writer = writer
+
+    def export(self, span: Span):
+        """Buffer a finished span, writing the batch once it is full."""
+        with self.lock:
+            self.buffer.append(span)
+            if len(self.buffer) < self.batch_size:
+                return
+            batch, self.buffer = self.buffer, []
+        if self._write(batch, block=False):
+            return
+        with self.lock:
+            self.dropped += len(batch)
+            first = self.dropped == len(batch)
+        # Once is enough; a slow disk would otherwise log every batch
+        log = logger.warning if first else logger.debug
+        log(f"Trace writer is full, dropped {len(batch)} spans")
+
+    def flush(self):
+        """Write buffered spans now, waiting until they are on disk."""
+        with self.lock:
+            batch, self.buffer = self.buffer, []
+        if batch:
+            self._write(batch)
+        self.writer.flush()
+
+    def _write(self, batch: List[Span], block: bool = True) -> bool:
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes(
+                            {"service.name": SERVICE_NAME, "process.pid": os.getpid()}
+                        )
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": SCOPE_NAME},
+                            "spans": [span.to_otlp() for span in batch],
+                        }
+                    ],
+                }
+            ]
+        }
+        return self.writer.append(self.path, request, block=block)
+
+
+class Tracer:
+    """
+    Process-wide tracing switch and exporter
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.exporter = None
+
+    def configure(self, enabled=True, exporter=None):
+        """Enable or disable tracing, flushing the previous exporter."""
+        if self.exporter is not None:
+            self.exporter.flush()
+        self.exporter = (exporter or JsonlExporter()) if enabled else None
+        self.enabled = enabled
+
+    def export(self, span: Span):
+        if self.exporter is not None:
+            self.exporter.export(span)
+
+    def flush(self):
+        if self.exporter is not None:
+            self.exporter.flush()
+
+
+_tracer = Tracer()
+atexit.register(_tracer.flush)
+
+
+def configure_tracing(enabled: bool = True, exporter=None):
+    """
+    Turn tracing on or off
+
+    Args:
+        enabled: Whether spans are recorded
+        exporter: Where finished spans go, a JsonlExporter at TRACE_PATH
+            by default
+    """
+    _tracer.configure(enabled, exporter)
+
+
+def flush_traces():
+    """Write any buffered spans."""
+    _tracer.flush()
+
+
+def span(name: str, **attributes):
+    """
+    Context manager timing the enclosed block as a span
+
+    The span is a child of the span active in the current context, or the
+    root of a new trace when there is none (i.e. when a job starts).
+
+        with span("job", type="profile", name=name):
+            with span("goto"):
+                await page.goto(url)
+    """
+    if not _tracer.enabled:
+        return _NOOP
+    return Span(name, attributes, _current_span.get())
+
+
+def current_span() -> Optional[Span]:
+    """The active span, None outside spans or with tracing disabled."""
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    """Trace ID of the active job, if any."""
+    active = _current_span.get()
+    return active.trace_id if active else None
+
+
+if TRACING:
+    configure_tracing(True)
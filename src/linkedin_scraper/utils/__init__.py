@@ -2,6 +2,7 @@ from urllib.parse import urlparse
 
 import tiktoken
 from ..logging import debug
+from ..tracing import span
 
 # Import LinkedIn scraper utility functions
 # Keeping these imports commented as they might be needed in the future
@@ -20,8 +21,9 @@ MAX_PATH_CHARACTERS = 100
 
 
 def count_tokens(text):
-    enc = tiktoken.encoding_for_model("gpt-4o")
-    return len(enc.encode(text))
+    with span("count_tokens", chars=len(text)):
+        enc = tiktoken.encoding_for_model("gpt-4o")
+        return len(enc.encode(text))
 
 
 def process_single_url(link):
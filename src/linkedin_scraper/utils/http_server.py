@@ -0,0 +1,243 @@
+"""
+Minimal asyncio HTTP/1.1 server for local control endpoints.
+Serves JSON, plain text and streamed (chunked) responses over TCP or a
+Unix socket without pulling in a web framework.
+"""
+
+import re
+import json
+import asyncio
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ..logging import get_logger
+
+logger = get_logger()
+
+REASONS = {
+    200: "OK",
+    202: "Accepted",
+    204: "No Content",
+    302: "Found",
+    304: "Not Modified",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+MAX_BODY_SIZE = 1024 * 1024
+
+
+@dataclass
+class Request:
+    """An HTTP request read from a client connection."""
+
+    method: str
+    path: str
+    query: Dict[str, List[str]]
+    headers: Dict[str, str]
+    body: bytes = b""
+    params: Dict[str, str] = field(default_factory=dict)
+
+    def json(self):
+        """Decode the request body as a JSON object, empty bodies decode to {}."""
+        data = json.loads(self.body) if self.body else {}
+        if not isinstance(data, dict):
+            raise ValueError("request body must be a JSON object")
+        return data
+
+
+@dataclass
+class Response:
+    """An HTTP response; `stream` takes precedence over `body` when set."""
+
+    status: int = 200
+    body: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+    stream: Optional[AsyncIterator[bytes]] = None
+
+
+def json_response(data, status=200, headers=None):
+    """Build a JSON response."""
+    response_headers = {"Content-Type": "application/json"}
+    response_headers.update(headers or {})
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    return Response(status=status, body=body, headers=response_headers)
+
+
+def text_response(text, status=200, content_type="text/plain; charset=utf-8"):
+    """Build a plain text (or any textual content type) response."""
+    return Response(
+        status=status,
+        body=text.encode("utf-8"),
+        headers={"Content-Type": content_type},
+    )
+
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+class HTTPServer:
+    """
+    Route table plus connection handling for a small local HTTP API
+    """
+
+    def __init__(self):
+        """Initialize an empty route table."""
+        self.routes: List[Tuple[str, re.Pattern, Handler]] = []
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    def route(self, method: str, pattern: str, handler: Handler):
+        """
+        Register a handler
+
+        Args:
+            method: HTTP method
+            pattern: Path pattern, `{name}` segments become request params
+            handler: Coroutine function taking a Request, returning a Response
+        """
+        regex = re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", pattern)
+        self.routes.append((method.upper(), re.compile(f"^{regex}$"), handler))
+
+    async def start(self, host="127.0.0.1", port=0, socket_path=None):
+        """
+        Start listening on a TCP port or a Unix socket
+
+        Args:
+            host: TCP host to bind
+            port: TCP port to bind, 0 picks a free one
+            socket_path: Unix socket path, used instead of host/port when set
+        """
+        if socket_path:
+            self.server = await asyncio.start_unix_server(
+                self._handle_connection, path=socket_path
+            )
+        else:
+            self.server = await asyncio.start_server(
+                self._handle_connection, host=host, port=port
+            )
+        return self.server
+
+    @property
+    def port(self):
+        """TCP port the server is bound to, None for Unix sockets."""
+        if not self.server or not self.server.sockets:
+            return None
+        address = self.server.sockets[0].getsockname()
+        return address[1] if isinstance(address, tuple) else None
+
+    async def close(self):
+        """Stop accepting connections."""
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def dispatch(self, request: Request) -> Response:
+        """Find the handler for a request and run it."""
+        path_matched = False
+        for method, regex, handler in self.routes:
+            match = regex.match(request.path)
+            if not match:
+                continue
+            path_matched = True
+            if method != request.method:
+                continue
+            request.params = match.groupdict()
+            return await handler(request)
+        if path_matched:
+            return json_response({"error": "method not allowed"}, status=405)
+        return json_response({"error": "not found"}, status=404)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            try:
+                request = await self._read_request(reader)
+            except ValueError as e:
+                response = json_response({"error": str(e)}, status=400)
+                await self._write_response(writer, response)
+                return
+            if request is None:
+                return
+            try:
+                response = await self.dispatch(request)
+            except ValueError as e:
+                response = json_response({"error": str(e)}, status=400)
+            except Exception as e:
+                logger.debug(f"Error handling {request.method} {request.path}: {e}")
+                response = json_response({"error": str(e)}, status=500)
+            await self._write_response(writer, response)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def _read_request(self, reader) -> Optional[Request]:
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        parts = request_line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise ValueError("malformed request line")
+        method, target, _ = parts
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise ValueError("invalid Content-Length") from None
+        if length < 0:
+            raise ValueError("invalid Content-Length")
+        if length > MAX_BODY_SIZE:
+            raise ConnectionError("request body too large")
+        body = await reader.readexactly(length) if length else b""
+
+        url = urlsplit(target)
+        return Request(
+            method=method.upper(),
+            path=url.path,
+            query=parse_qs(url.query),
+            headers=headers,
+            body=body,
+        )
+
+    async def _write_response(self, writer, response: Response):
+        reason = REASONS.get(response.status, "Unknown")
+        headers = dict(response.headers)
+        headers["Connection"] = "close"
+        if response.stream is not None:
+            headers["Transfer-Encoding"] = "chunked"
+        else:
+            headers["Content-Length"] = str(len(response.body))
+
+        head = f"HTTP/1.1 {response.status} {reason}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write((head + "\r\n").encode("latin-1"))
+
+        if response.stream is None:
+            writer.write(response.body)
+            await writer.drain()
+            return
+
+        async for chunk in response.stream:
+            if chunk:
+                writer.write(f"{len(chunk):x}\r\n".encode("latin-1") + chunk + b"\r\n")
+                await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
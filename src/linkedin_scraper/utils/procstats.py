@@ -0,0 +1,143 @@
+"""
+Resident memory of this process and of the browser processes it started.
+Uses psutil when it is installed, /proc otherwise (Linux only).
+"""
+
+import os
+import asyncio
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:  # optional
+    psutil = None
+
+# Process names of the browser started by Playwright
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "headless_shell", "firefox", "webkit")
+
+
+def _proc_children() -> Dict[int, list]:
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read().decode("latin-1")
+        except OSError:
+            continue
+        # The command name is in parentheses and may contain spaces
+        ppid = int(stat[stat.rindex(")") + 2 :].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def _proc_rss(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def _proc_name(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/comm", "r") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _descendants(pid: int) -> Iterator[Tuple[int, str, int]]:
+    """(pid, name, rss) of every process below `pid`."""
+    if psutil is not None:
+        try:
+            for child in psutil.Process(pid).children(recursive=True):
+                try:
+                    yield child.pid, child.name(), child.memory_info().rss
+                except psutil.Error:
+                    continue
+        except psutil.Error:
+            return
+        return
+    children = _proc_children()
+    stack = list(children.get(pid, []))
+    while stack:
+        child = stack.pop()
+        stack.extend(children.get(child, []))
+        yield child, _proc_name(child), _proc_rss(child)
+
+
+def is_supported() -> bool:
+    """Whether memory can be measured on this platform."""
+    return psutil is not None or os.path.isdir("/proc")
+
+
+def python_rss(pid: Optional[int] = None) -> int:
+    """Resident memory of a process (this one by default), in bytes."""
+    pid = pid or os.getpid()
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return 0
+    return _proc_rss(pid)
+
+
+def browser_rss(pid: Optional[int] = None) -> int:
+    """Summed resident memory of the browser processes below a process."""
+    pid = pid or os.getpid()
+    return sum(
+        rss
+        for _, name, rss in _descendants(pid)
+        if any(browser in name.lower() for browser in BROWSER_PROCESS_NAMES)
+    )
+
+
+class PeakMemorySampler:
+    """
+    Samples Python and browser RSS in the background and keeps the peaks
+    """
+
+    def __init__(self, interval: float = 0.25):
+        """
+        Initialize the sampler
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.python_peak = 0
+        self.browser_peak = 0
+        self.task: Optional[asyncio.Task] = None
+
+    def sample(self):
+        """Take one sample now."""
+        if not is_supported():
+            return
+        self.python_peak = max(self.python_peak, python_rss())
+        self.browser_peak = max(self.browser_peak, browser_rss())
+
+    async def _run(self):
+        while True:
+            # /proc walks are blocking, keep them off the event loop
+            await asyncio.to_thread(self.sample)
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start sampling in a background task."""
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop sampling, after one last sample."""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        self.sample()
@@ -0,0 +1,98 @@
+"""
+Per-stage timing for scrape jobs.
+Stages (goto, scroll, extract, ...) are observed in the stage latency
+histogram, timed into the recorder active in the current context, and
+traced as spans when tracing is on.
+"""
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from ..metrics import STAGE_SECONDS
+from ..tracing import span
+
+_recorder: ContextVar[Optional["StageRecorder"]] = ContextVar(
+    "stage_recorder", default=None
+)
+
+
+def percentile(values, q: float) -> float:
+    """
+    Nearest-rank percentile
+
+    Args:
+        values: Samples
+        q: Quantile between 0 and 1
+
+    Returns:
+        float: The percentile, 0.0 without samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def summarize(values) -> dict:
+    """Count, mean and p50/p95/p99 of a list of durations (seconds)."""
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": max(values) if values else 0.0,
+    }
+
+
+class StageRecorder:
+    """
+    Collects stage durations
+    """
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def record(self, name: str, seconds: float):
+        """Add one duration sample to a stage."""
+        self.samples[name].append(seconds)
+
+    def summary(self) -> Dict[str, dict]:
+        """Statistics per stage, in the order stages were first seen."""
+        return {name: summarize(values) for name, values in self.samples.items()}
+
+
+@contextmanager
+def stage(name: str, **attributes):
+    """
+    Time the enclosed block as one sample of a stage, and as a span
+
+    Works around awaits too: `with stage("goto"): await page.goto(url)`.
+
+    Args:
+        name: Stage name
+        attributes: Span attributes
+    """
+    recorder = _recorder.get()
+    with span(name, **attributes):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            STAGE_SECONDS.observe(elapsed, stage=name)
+            if recorder is not None:
+                recorder.record(name, elapsed)
+
+
+@contextmanager
+def recording(recorder: StageRecorder):
+    """Make `recorder` receive the stages timed in this context."""
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
@@ -0,0 +1,158 @@
+"""Shared fixtures and Playwright stand-ins for the test suite."""
+
+import os
+import asyncio
+import tempfile
+
+import pytest
+
+# Stores, caches and results opened with their defaults stay out of the
+# repository's data/ directory; set before the package reads its config
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="linkedin-scraper-tests-")
+
+
+class FakeLocator:
+    """Minimal async locator that answers after a fixed latency."""
+
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    async def _wait(self):
+        self.page.calls += 1
+        await asyncio.sleep(self.page.latency)
+
+    async def count(self):
+        await self._wait()
+        return len(self.page.texts.get(self.selector, []))
+
+    async def text_content(self):
+        await self._wait()
+        texts = self.page.texts.get(self.selector)
+        if not texts:
+            # Playwright waits for the element until the default timeout
+            await asyncio.sleep(3600)
+        return texts[0]
+
+    async def get_attribute(self, name):
+        await self._wait()
+        return None
+
+    async def click(self):
+        await self._wait()
+
+    @property
+    def first(self):
+        return self
+
+    def nth(self, index):
+        return self
+
+    def locator(self, selector):
+        return FakeLocator(self.page, selector)
+
+
+class FakePage:
+    """
+    Page stand-in whose locators resolve from a selector -> texts map
+
+    Navigation takes `load_time`, `evaluate` answers from a script -> result
+    map (and hangs while `hang` is set) and `wait_for_function` resolves
+    after `ready_after` seconds, or times out the way Playwright does.
+    """
+
+    def __init__(
+        self,
+        texts=None,
+        latency=0.01,
+        context=None,
+        results=None,
+        load_time=0.05,
+        ready_after=0.0,
+        title="LinkedIn",
+    ):
+        self.texts = texts or {}
+        self.latency = latency
+        self.calls = 0
+        self.context = context
+        self.results = results or {}
+        self.load_time = load_time
+        self.ready_after = ready_after
+        self.page_title = title
+        self.url = "about:blank"
+        self.visits = []
+        self.evaluated = []
+        self.expressions = []
+        self.handlers = {}
+        self.hang = False
+        self.closed = False
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    async def goto(self, url, timeout=None, wait_until=None):
+        self.url = url
+        self.visits.append(url)
+        await asyncio.sleep(self.load_time)
+
+    async def wait_for_function(self, expression, timeout=None):
+        self.expressions.append(expression)
+        if timeout is not None and self.ready_after * 1000 > timeout:
+            await asyncio.sleep(timeout / 1000)
+            raise TimeoutError(f"Timeout {timeout}ms exceeded.")
+        await asyncio.sleep(self.ready_after)
+
+    async def evaluate(self, script, arg=None):
+        self.evaluated.append((script, arg))
+        if self.hang:
+            await asyncio.sleep(3600)
+        return self.results.get(script)
+
+    async def title(self):
+        return self.page_title
+
+    async def content(self):
+        return f"<html><main>{self.url}</main></html>"
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def crash(self):
+        self.handlers["crash"](self)
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    """Browser context stand-in; new pages take the given FakePage options."""
+
+    def __init__(self, **page_options):
+        self.page_options = page_options
+        self.pages = []
+        self.closed = False
+
+    async def new_page(self):
+        page = FakePage(context=self, **self.page_options)
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_page():
+    return FakePage(
+        texts={
+            "h1.text-heading-xlarge": [" Jane Doe "],
+            "div.text-body-medium": ["Engineer"],
+            "span.text-body-small": ["Sydney"],
+        }
+    )
@@ -0,0 +1,97 @@
+import random
+import time
+
+import pytest
+
+pytest.importorskip("zstandard")
+
+from linkedin_scraper.fetch import Target
+from linkedin_scraper.fetch.tiers import ArchiveTier
+from linkedin_scraper.storage.archive import STRUCTURED_TIER, HtmlArchive
+
+
+def make_page(name, seed):
+    rng = random.Random(seed)
+    items = "".join(
+        f"<li class='pvs-list__item artdeco-list__item'><span class='mr1 t-bold'>"
+        f"Role {rng.randint(0, 10**6)}</span><span class='t-14 t-normal'>"
+        f"Company {rng.randint(0, 10**6)}</span></li>"
+        for _ in range(40)
+    )
+    return (
+        "<html><body><main class='scaffold-layout__main'><section "
+        f"class='artdeco-card pv-top-card'><h1 class='text-heading-xlarge'>{name}"
+        f"</h1></section><section id='experience'><ul class='pvs-list'>{items}"
+        "</ul></section></main></body></html>"
+    )
+
+
+def test_roundtrip_dedup_and_query(tmp_path):
+    archive = HtmlArchive(archive_dir=str(tmp_path), max_age=0, max_bytes=0)
+    html = make_page("Jane", 1)
+    first = archive.put("profile", "jane", html, fetched_at=100.0)
+    second = archive.put("profile", "jane", html, fetched_at=200.0)
+    archive.put("company", "acme", make_page("Acme", 2), fetched_at=150.0)
+
+    assert first == second
+    assert archive.get(first) == html
+    stats = archive.stats()
+    assert stats["pages"] == 3 and stats["blobs"] == 2
+    assert archive.latest("profile", "jane").fetched_at == 200.0
+    assert [p.target_name for p in archive.query(since=120)] == ["jane", "acme"]
+    assert len(archive.query(latest_only=True)) == 2
+
+    # Names are matched exactly, patterns only when asked for
+    archive.put("profile", "j*", make_page("Star", 3), fetched_at=300.0)
+    assert archive.latest("profile", "jane").fetched_at == 200.0
+    assert [p.target_name for p in archive.query(target_name="j*")] == ["j*"]
+    assert len(archive.query(name_pattern="j*", latest_only=True)) == 2
+    archive.close()
+
+
+def test_dictionary_and_retention(tmp_path):
+    archive = HtmlArchive(archive_dir=str(tmp_path), max_age=0, max_bytes=0)
+    now = time.time()
+    for i in range(60):
+        archive.put(
+            "profile", f"user{i}", make_page(f"User {i}", i), fetched_at=now + i
+        )
+    plain_ratio = archive.stats()["ratio"]
+
+    dict_id = archive.train_dictionary(dict_size=16384)
+    assert dict_id
+    sha = archive.put("profile", "fresh", make_page("Fresh", 999), fetched_at=now + 100)
+    assert archive.get(sha) == make_page("Fresh", 999)
+    # Pages written before training still decode with their own settings
+    old = archive.latest("profile", "user0")
+    assert archive.get(old.sha256) == make_page("User 0", 0)
+
+    reopened = HtmlArchive(archive_dir=str(tmp_path), max_age=0, max_bytes=0)
+    assert reopened.current_dict_id == dict_id
+    assert reopened.get(sha) == make_page("Fresh", 999)
+    assert plain_ratio > 1
+
+    budget = archive.stats()["compressed_bytes"] // 2
+    assert archive.prune(max_bytes=budget) > 0
+    assert archive.stats()["compressed_bytes"] <= budget
+    assert archive.latest("profile", "fresh") is not None
+    assert archive.latest("profile", "user0") is None
+    archive.close()
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_archive_tier_skips_structured_scrapes(tmp_path):
+    archive = HtmlArchive(archive_dir=str(tmp_path), max_age=0, max_bytes=0)
+    tier = ArchiveTier(archive, max_age=3600)
+    target = Target("profile", "jane")
+    archive.put("profile", "jane", make_page("Jane", 1), tier="browser")
+    archive.put("profile", "jane", make_page("Jane", 2), tier=STRUCTURED_TIER)
+
+    assert archive.latest("profile", "jane").tier == STRUCTURED_TIER
+    result = await tier.fetch(target)
+    assert result.html == make_page("Jane", 1)
+
+    archive.put("company", "acme", make_page("Acme", 3), tier=STRUCTURED_TIER)
+    assert await tier.fetch(Target("company", "acme")) is None
+    archive.close()
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from linkedin_scraper.bench import compare, format_table, make_targets, run_benchmark
+from linkedin_scraper.utils.stages import stage
+
+
+class FakeScraper:
+    def __init__(self, headless=True):
+        self.browser = object()
+
+    async def initialize_browser(self, browser=None):
+        await asyncio.sleep(0.001)
+
+    async def login(self):
+        return True
+
+    async def scrape_profile(self, name):
+        with stage("goto"):
+            await asyncio.sleep(0.01)
+        with stage("scroll"):
+            await asyncio.sleep(0.02)
+        with stage("extract"):
+            await asyncio.sleep(0.005)
+        if name.endswith("3"):
+            return {"error": "not found"}
+        return {"name": name}
+
+    async def cleanup(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_benchmark_report(tmp_path):
+    report = await run_benchmark(
+        make_targets(8),
+        concurrency=4,
+        output_dir=str(tmp_path),
+        scraper_factory=FakeScraper,
+    )
+    assert report["jobs"] == {"total": 8, "ok": 7, "failed": 1}
+    assert list(report["stages"]) == ["launch", "login", "goto", "scroll", "extract"]
+    assert report["stages"]["goto"]["count"] == 8
+    assert report["stages"]["scroll"]["p50"] >= 0.02
+    # Four workers in parallel: about two rounds of ~35ms, not eight
+    assert report["wall_seconds"] < 0.2
+    assert report["throughput"]["pages_per_minute"] > 0
+    assert "scroll" in format_table(report)
+
+
+def test_compare_flags_regressions():
+    baseline = {
+        "stages": {"goto": {"p50": 0.100, "p95": 0.200, "p99": 0.300}},
+        "job_latency": {"p50": 1.0, "p95": 1.5, "p99": 2.0},
+        "throughput": {"pages_per_minute": 60.0},
+        "memory": {"python_peak_rss_mb": 100.0, "browser_peak_rss_mb": 400.0},
+    }
+    current = {
+        "stages": {"goto": {"p50": 0.102, "p95": 0.300, "p99": 0.301}},
+        "job_latency": {"p50": 1.0, "p95": 1.5, "p99": 2.0},
+        "throughput": {"pages_per_minute": 45.0},
+        "memory": {"python_peak_rss_mb": 105.0, "browser_peak_rss_mb": 600.0},
+    }
+    metrics = {r["metric"] for r in compare(current, baseline)}
+    assert metrics == {
+        "goto.p95",
+        "throughput.pages_per_minute",
+        "memory.browser_peak_rss_mb",
+    }
+    assert compare(baseline, baseline) == []
@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+
+from linkedin_scraper.pacing import pacing_job
+from linkedin_scraper.scrapers import company as company_module
+from linkedin_scraper.scrapers.company import CompanyScraper, split_specialties
+from linkedin_scraper.storage.archive import STRUCTURED_TIER, HtmlArchive
+from tests.conftest import FakeContext
+
+EVALUATED = {
+    company_module.ABOUT_DETAILS_SCRIPT: {
+        "overview": "Builds AI agents.",
+        "Website": "https://acme.example.com",
+        "Company size": "51-200 employees",
+        "Specialties": "AI agents, Automation, and Search",
+    },
+    company_module.JOBS_SCRIPT: [{"title": "Engineer", "location": "Berlin"}],
+    company_module.PEOPLE_SCRIPT: {
+        "employees": "180 associated members",
+        "people": [{"name": "Jo", "headline": "Founder"}],
+    },
+}
+
+
+# The main page's name; everything else is read through EVALUATED
+TEXTS = {'//div[contains(@class, "org-module-card__margin-bottom")]//h1': [" Acme "]}
+
+
+def fake_context():
+    return FakeContext(texts=TEXTS, results=EVALUATED, latency=0)
+
+
+@pytest.mark.asyncio
+async def test_subpages_load_concurrently_and_merge(tmp_path):
+    context = fake_context()
+    page = await context.new_page()
+    scraper = CompanyScraper(str(tmp_path), subpages="about,jobs,people")
+
+    start = time.perf_counter()
+    with pacing_job("none"):
+        data = await scraper.scrape_company(page, "acme")
+    elapsed = time.perf_counter() - start
+
+    # Four loads of 50ms side by side, not one after another
+    assert elapsed < 0.15
+    assert [p.url.split("/company/acme/")[1] for p in context.pages] == [
+        "",
+        "about/",
+        "jobs/",
+        "people/",
+    ]
+    assert all(p.closed for p in context.pages[1:])
+    assert data["name"] == "Acme"
+    assert data["website"] == "https://acme.example.com"
+    assert data["specialties"] == ["AI agents", "Automation", "Search"]
+    assert data["jobs"] == [{"title": "Engineer", "location": "Berlin"}]
+    assert data["employees_on_linkedin"] == "180 associated members"
+    # The sink only queues the file for the background writer
+    scraper.sink.flush()
+    assert (tmp_path / "company_acme.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_main_page_failure_stops_the_subpages(tmp_path):
+    context = fake_context()
+    page = await context.new_page()
+
+    async def crash(url, timeout, wait_until):
+        # Fails while the sub-pages are still loading
+        await asyncio.sleep(0.01)
+        raise RuntimeError("page crashed")
+
+    page.goto = crash
+    scraper = CompanyScraper(str(tmp_path), subpages="about,jobs,people")
+
+    with pacing_job("none"), pytest.raises(RuntimeError, match="page crashed"):
+        await scraper.scrape_company(page, "acme")
+
+    # The sub-pages were cancelled mid-navigation and closed before the
+    # error came back, instead of loading on in the background
+    assert len(context.pages) == 4
+    assert all(p.closed for p in context.pages[1:])
+
+
+def test_specialties_split_on_commas_only():
+    assert split_specialties("Research and Development, Sales") == [
+        "Research and Development",
+        "Sales",
+    ]
+    assert split_specialties("a, b, and c") == ["a", "b", "c"]
+    assert split_specialties("Search,, ") == ["Search"]
+
+
+def test_unknown_subpage_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        CompanyScraper(str(tmp_path), subpages=["about", "events"])
+
+
+@pytest.mark.asyncio
+async def test_rendered_page_is_archived(tmp_path):
+    pytest.importorskip("zstandard")
+    archive = HtmlArchive(archive_dir=str(tmp_path / "archive"))
+    page = await fake_context().new_page()
+    scraper = CompanyScraper(str(tmp_path), subpages=[], archive=archive)
+
+    with pacing_job("none"):
+        await scraper.scrape_company(page, "acme")
+
+    archived = archive.latest("company", "acme")
+    assert archived.tier == STRUCTURED_TIER
+    assert archive.get(archived.sha256) == f"<html><main>{page.url}</main></html>"
+    archive.close()
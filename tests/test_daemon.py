@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from linkedin_scraper import daemon as daemon_module
+from linkedin_scraper.daemon import ScraperDaemon
+
+
+@pytest.mark.asyncio
+async def test_job_api_and_backpressure(monkeypatch):
+    release = asyncio.Event()
+
+    async def fake_run_job(scraper, job):
+        await release.wait()
+        return {"name": job.name}
+
+    monkeypatch.setattr(daemon_module, "run_job", fake_run_job)
+
+    daemon = ScraperDaemon(workers=1, queue_size=1)
+    daemon.worker_tasks.append(asyncio.create_task(daemon._worker(object())))
+    daemon.started_at = 0
+    await daemon.http.start(port=0)
+    base_url = f"http://127.0.0.1:{daemon.http.port}"
+
+    try:
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            first = await client.post("/jobs", json={"type": "profile", "name": "a"})
+            assert first.status_code == 202
+            job_id = first.json()["id"]
+            await asyncio.sleep(0.05)  # let the worker pick it up
+
+            queued = await client.post("/jobs", json={"type": "company", "name": "b"})
+            assert queued.status_code == 202
+            rejected = await client.post("/jobs", json={"type": "profile", "name": "c"})
+            assert rejected.status_code == 429
+
+            health = (await client.get("/health")).json()
+            assert health["workers_busy"] == 1 and health["saturated"]
+
+            assert (await client.get(f"/jobs/{job_id}/result")).status_code == 202
+            bad = await client.post("/jobs", json={"type": "group", "name": "x"})
+            assert bad.status_code == 400
+            not_object = await client.post("/jobs", json=["profile", "x"])
+            assert not_object.status_code == 400
+
+            reader, writer = await asyncio.open_connection(
+                "127.0.0.1", daemon.http.port
+            )
+            writer.write(b"GARBAGE\r\n\r\n")
+            await writer.drain()
+            status_line = await reader.readline()
+            writer.close()
+            assert status_line.startswith(b"HTTP/1.1 400")
+
+            async with client.stream("GET", f"/jobs/{job_id}/stream") as stream:
+                release.set()
+                events = [json.loads(line) async for line in stream.aiter_lines()]
+            assert events[-1]["status"] == "done"
+            assert events[-1]["result"] == {"name": "a"}
+
+            result = (await client.get(f"/jobs/{job_id}/result")).json()
+            assert result["result"] == {"name": "a"}
+    finally:
+        await daemon.stop()
+
+
+class ErrorScraper:
+    async def scrape_profile(self, name):
+        return {"error": f"Profile {name} not found"}
+
+
+@pytest.mark.asyncio
+async def test_scraper_error_marks_job_failed():
+    daemon = ScraperDaemon(workers=1, queue_size=1)
+    daemon.worker_tasks.append(asyncio.create_task(daemon._worker(ErrorScraper())))
+    before = daemon_module.JOBS.value(type="profile", status="failed")
+    try:
+        job = daemon_module.Job(type="profile", name="ghost")
+        assert daemon.submit(job)
+        await asyncio.wait_for(daemon.queue.join(), timeout=1)
+        assert job.status == "failed" and job.error == "Profile ghost not found"
+        after = daemon_module.JOBS.value(type="profile", status="failed")
+        assert after - before == 1
+    finally:
+        await daemon.stop()
@@ -0,0 +1,60 @@
+from linkedin_scraper.storage.deltas import DeltaStore, apply_changes, diff_records
+
+
+def test_diff_roundtrip_is_field_level():
+    old = {"name": "Acme", "about": {"size": "11-50", "site/url": "a"}, "jobs": [1]}
+    new = {"name": "Acme", "about": {"size": "51-200"}, "jobs": [1, 2], "hq": "Berlin"}
+
+    changes = diff_records(old, new)
+
+    assert apply_changes(old, changes) == new
+    assert {"op": "replace", "path": "/about/size", "value": "51-200"} in changes
+    assert {"op": "remove", "path": "/about/site~1url"} in changes
+    assert {"op": "replace", "path": "/jobs", "value": [1, 2]} in changes
+    assert len(changes) == 4
+    assert old["about"]["site/url"] == "a"
+
+
+def test_store_keeps_snapshot_and_changes_since(tmp_path):
+    store = DeltaStore(path=str(tmp_path / "deltas.sqlite"))
+    v1 = {"name": "Jane", "headline": "Engineer", "skills": ["Go"]}
+    v2 = {"name": "Jane", "headline": "Staff Engineer", "skills": ["Go"]}
+
+    assert store.put("profile", "jane", v1, scraped_at=100.0).version == 1
+    assert store.put("profile", "jane", v1, scraped_at=150.0) is None
+    store.put("company", "acme", {"name": "Acme"}, scraped_at=160.0)
+    delta = store.put("profile", "jane", v2, scraped_at=200.0)
+
+    assert delta.version == 2
+    assert delta.changes == [
+        {"op": "replace", "path": "/headline", "value": "Staff Engineer"}
+    ]
+    assert store.latest("profile", "jane") == v2
+    assert [(d.entity_name, d.version) for d in store.changes_since(120.0)] == [
+        ("acme", 1),
+        ("jane", 2),
+    ]
+    assert store.changes_since(0, entity_type="profile", after_id=delta.id) == []
+    assert store.record_at("profile", "jane", at=180.0) == v1
+    assert store.record_at("profile", "jane") == v2
+    assert store.record_at("profile", "john") is None
+    assert store.stats() == {"records": 2, "deltas": 3}
+    store.close()
+
+
+def test_failed_fields_carry_forward(tmp_path):
+    store = DeltaStore(path=str(tmp_path / "deltas.sqlite"))
+    full = {"name": "Acme", "jobs": [1, 2], "people": ["Jo"]}
+    store.put("company", "acme", full, scraped_at=100.0)
+
+    # The jobs sub-page failed: no spurious remove, only the real change
+    partial = {"name": "Acme Inc", "people": ["Jo"], "partial_sections": ["jobs"]}
+    delta = store.put("company", "acme", partial, scraped_at=200.0, partial=["jobs"])
+    assert delta.changes == [{"op": "replace", "path": "/name", "value": "Acme Inc"}]
+    assert store.latest("company", "acme")["jobs"] == [1, 2]
+
+    again = {"name": "Acme Inc", "jobs": [], "people": ["Jo"]}
+    assert (
+        store.put("company", "acme", again, scraped_at=300.0, partial=["jobs"]) is None
+    )
+    store.close()
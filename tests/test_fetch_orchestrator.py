@@ -0,0 +1,117 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from linkedin_scraper.fetch import (
+    BrowserTier,
+    CacheTier,
+    FetchOrchestrator,
+    FetchResult,
+    FetchTier,
+    HttpFetcher,
+    HttpTier,
+    Target,
+)
+
+
+class StubTier(FetchTier):
+    def __init__(self, name, complete=True, fail=False):
+        self.name = name
+        self.complete = complete
+        self.fail = fail
+        self.calls = 0
+
+    async def fetch(self, target):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("down")
+        return FetchResult(
+            target=target,
+            html=f"<main>{self.name}</main>",
+            url=target.url,
+            complete=self.complete,
+        )
+
+
+@pytest.mark.asyncio
+async def test_falls_back_and_fills_cache(tmp_path):
+    cache = CacheTier(cache_dir=str(tmp_path), max_age=60)
+    http = StubTier("http", complete=False)
+    browser = StubTier("browser")
+    orchestrator = FetchOrchestrator([cache, http, browser])
+    target = Target("profile", "jane")
+
+    first = await orchestrator.fetch(target)
+    assert first.tier == "browser"
+
+    second = await orchestrator.fetch(target)
+    assert second.tier == "cache" and second.html == "<main>browser</main>"
+    assert browser.calls == 1 and http.calls == 1
+
+    report = orchestrator.report()
+    assert report["cache"]["attempts"] == 2 and report["cache"]["hit_rate"] == 0.5
+    assert report["http"]["hits"] == 0
+    assert report["browser"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failing_tier_is_skipped():
+    orchestrator = FetchOrchestrator([StubTier("http", fail=True), StubTier("browser")])
+    result = await orchestrator.fetch(Target("company", "acme"))
+    assert result.tier == "browser"
+    assert orchestrator.report()["http"]["errors"] == 1
+
+    empty = FetchOrchestrator([StubTier("http", complete=False)])
+    assert await empty.fetch(Target("company", "acme")) is None
+
+
+@pytest.mark.asyncio
+async def test_http_and_browser_tiers_share_the_session():
+    class FakeContext:
+        def __init__(self):
+            self.jar = []
+
+        async def cookies(self):
+            return self.jar
+
+        async def add_cookies(self, cookies):
+            self.jar += cookies
+
+    class FakeScraper:
+        def __init__(self):
+            self.context = FakeContext()
+            self.page = SimpleNamespace(url="https://www.linkedin.com/in/jane")
+            self.renders = 0
+
+        async def scrape_profile_html(self, name, is_unchanged=None):
+            # Logging in (or rendering) leaves the session in the context
+            self.renders += 1
+            self.context.jar = [
+                {"name": "li_at", "value": "browser", "domain": ".linkedin.com"}
+            ]
+            return "<main class='text-heading-xlarge'>browser</main>"
+
+    def handler(request):
+        if "li_at=browser" not in (request.headers.get("cookie") or ""):
+            return httpx.Response(200, text="<div id='app'></div>")
+        return httpx.Response(
+            200,
+            text="<main class='text-heading-xlarge'>http</main>",
+            headers={"set-cookie": "lidc=fresh; Domain=.linkedin.com; Path=/"},
+        )
+
+    fetcher = HttpFetcher()
+    fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper = FakeScraper()
+    browser = BrowserTier(scraper=scraper, http=fetcher)
+    orchestrator = FetchOrchestrator([HttpTier(fetcher, browser=browser), browser])
+
+    first = await orchestrator.fetch(Target("profile", "jane"))
+    assert first.tier == "browser"
+    # The browser session now authenticates plain HTTP fetches
+    second = await orchestrator.fetch(Target("profile", "john"))
+    assert second.tier == "http" and scraper.renders == 1
+    # Cookies refreshed over HTTP are pushed back into the browser
+    assert "lidc" in [cookie["name"] for cookie in scraper.context.jar]
+    await orchestrator.close()
@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+from linkedin_scraper.har import HarSession, job_slug
+
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+
+    async def route_from_har(self, path, not_found=None):
+        self.routes.append(("har", path, not_found))
+
+    async def route(self, pattern, handler):
+        self.routes.append(("route", pattern, handler))
+
+
+class FakeRoute:
+    def __init__(self):
+        self.fell_back_at = None
+
+    async def fallback(self):
+        self.fell_back_at = time.perf_counter()
+
+
+def test_record_options(tmp_path):
+    har = HarSession(mode="record", har_dir=str(tmp_path))
+    options = har.context_options("profile_jane doe")
+    assert options["record_har_path"].endswith("profile_jane_doe.har.zip")
+    assert options["record_har_content"] == "attach"
+    assert HarSession(mode="replay").context_options("x") == {}
+    assert job_slug("company_acme/../x") == "company_acme_.._x"
+
+
+@pytest.mark.asyncio
+async def test_replay_routes_with_latency(tmp_path):
+    har = HarSession(mode="replay", har_dir=str(tmp_path), latency=30)
+    context = FakeContext()
+    with pytest.raises(FileNotFoundError):
+        await har.attach(context, "profile_jane")
+
+    (tmp_path / "profile_jane.har.zip").write_bytes(b"")
+    await har.attach(context, "profile_jane")
+    assert context.routes[0][0] == "har" and context.routes[0][2] == "abort"
+    kind, _, delay = context.routes[1]
+    assert kind == "route"
+
+    route = FakeRoute()
+    start = time.perf_counter()
+    await delay(route)
+    assert route.fell_back_at - start >= 0.03
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        HarSession(mode="rewind")
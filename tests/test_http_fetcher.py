@@ -0,0 +1,50 @@
+import json
+
+import httpx
+import pytest
+
+from linkedin_scraper.fetch import HttpFetcher, Target, is_complete
+
+RENDERED = "<html><main><h1 class='text-heading-xlarge'>Jane</h1></main></html>"
+APP_SHELL = "<html><body><div id='app'></div></body></html>"
+
+
+def test_completeness_check():
+    profile = Target("profile", "jane")
+    assert is_complete(profile, 200, profile.url, RENDERED)
+    assert not is_complete(profile, 200, profile.url, APP_SHELL)
+    assert not is_complete(profile, 200, "https://www.linkedin.com/authwall", RENDERED)
+    assert not is_complete(Target("company", "acme"), 200, profile.url, RENDERED)
+
+
+@pytest.mark.asyncio
+async def test_fetch_uses_stored_session(tmp_path):
+    state = tmp_path / "storage_state.json"
+    state.write_text(
+        json.dumps(
+            {
+                "cookies": [
+                    {"name": "li_at", "value": "s3cret", "domain": ".linkedin.com"}
+                ]
+            }
+        )
+    )
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("cookie"))
+        body = RENDERED if request.url.path == "/in/jane" else APP_SHELL
+        return httpx.Response(200, text=body)
+
+    fetcher = HttpFetcher(storage_state_path=str(state), concurrency=2)
+    fetcher.client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), cookies=fetcher.load_cookies()
+    )
+    async with fetcher:
+        rendered = await fetcher.fetch(Target("profile", "jane"))
+        shell = await fetcher.fetch(Target("profile", "john"))
+
+    assert seen == ["li_at=s3cret", "li_at=s3cret"]
+    assert rendered.complete and rendered.tier == "http"
+    assert not shell.complete
+    assert fetcher.client is None
@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from linkedin_scraper.jobqueue import (
+    JobQueue,
+    MemoryQueue,
+    QueueConsumer,
+    SqliteQueue,
+    open_queue,
+)
+
+BACKENDS = ["memory", "sqlite", "redis"]
+
+
+@pytest_asyncio.fixture(params=BACKENDS)
+async def make_queue(request, tmp_path):
+    queues = []
+
+    def make(**kwargs):
+        kwargs.setdefault("visibility_timeout", 0.2)
+        kwargs.setdefault("max_attempts", 2)
+        if request.param == "memory":
+            queue = MemoryQueue(**kwargs)
+        elif request.param == "sqlite":
+            queue = SqliteQueue(path=str(tmp_path / "jobs.sqlite"), **kwargs)
+        else:
+            fakeredis = pytest.importorskip("fakeredis")
+            from linkedin_scraper.jobqueue.redis import RedisQueue
+
+            if not queues:
+                make.server = fakeredis.FakeServer()
+            client = fakeredis.aioredis.FakeRedis(
+                server=make.server, decode_responses=True
+            )
+            queue = RedisQueue(client=client, **kwargs)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        await queue.close()
+
+
+def jobs(*names):
+    return [{"type": "profile", "name": name} for name in names]
+
+
+@pytest.mark.asyncio
+async def test_claim_ack_and_dedupe(make_queue):
+    queue = make_queue()
+    assert await queue.put(jobs("a", "b", "c")) == 3
+    assert await queue.put(jobs("a", "d")) == 1
+
+    first = await queue.claim(3)
+    assert [job.id for job in first] == [
+        "profile:a:data",
+        "profile:b:data",
+        "profile:c:data",
+    ]
+    assert first[0].payload == {"type": "profile", "name": "a"}
+    second = await queue.claim(3)
+    assert [job.id for job in second] == ["profile:d:data"]
+    assert await queue.claim(3) == []
+
+    assert await queue.ack(first + second) == 4
+    assert await queue.stats() == {"pending": 0, "in_flight": 0, "dead": 0}
+
+
+@pytest.mark.asyncio
+async def test_modes_of_one_target_are_separate_jobs(make_queue):
+    queue = make_queue()
+    payloads = [
+        {"type": "profile", "name": "a"},
+        {"type": "profile", "name": "a", "mode": "data"},
+        {"type": "profile", "name": "a", "mode": "html", "llm": True},
+    ]
+    assert await queue.put(payloads) == 2
+    claimed = await queue.claim(3)
+    assert [job.id for job in claimed] == ["profile:a:data", "profile:a:html+llm"]
+    with pytest.raises(TypeError):
+        JobQueue()
+
+
+@pytest.mark.asyncio
+async def test_visibility_timeout_nack_and_dead_letters(make_queue):
+    queue = make_queue()
+    await queue.put(jobs("a", "b"))
+    claimed = await queue.claim(2)
+    assert await queue.nack([claimed[1]]) == 1
+    assert [job.id for job in await queue.claim(2)] == ["profile:b:data"]
+    assert (await queue.stats())["in_flight"] == 2
+
+    # Never acknowledged: redelivered once, then dead-lettered
+    await asyncio.sleep(0.25)
+    again = await queue.claim(2)
+    assert {job.id for job in again} == {"profile:a:data"}
+    assert again[0].attempts == 2 and claimed[0].attempts == 1
+    await asyncio.sleep(0.25)
+    assert await queue.claim(2) == []
+    dead = await queue.dead_letters()
+    assert {job.id for job in dead} == {"profile:a:data", "profile:b:data"}
+    assert (await queue.stats())["dead"] == 2
+
+
+@pytest.mark.asyncio
+async def test_superseded_lease_cannot_ack_or_nack(make_queue):
+    queue = make_queue(max_attempts=3)
+    await queue.put(jobs("a"))
+    (stale,) = await queue.claim()
+    await asyncio.sleep(0.25)
+    (current,) = await queue.claim(visibility_timeout=60)
+    assert current.lease != stale.lease
+
+    assert await queue.ack([stale]) == 0
+    assert await queue.nack([stale]) == 0
+    assert await queue.stats() == {"pending": 0, "in_flight": 1, "dead": 0}
+    assert await queue.ack([current]) == 1
+    assert await queue.stats() == {"pending": 0, "in_flight": 0, "dead": 0}
+
+
+@pytest.mark.asyncio
+async def test_nodes_never_claim_the_same_job(make_queue):
+    queue = make_queue()
+    if isinstance(queue, MemoryQueue):
+        pytest.skip("in-memory queues are not shared")
+    nodes = [queue, make_queue(), make_queue()]
+    await queue.put(jobs(*[f"user{i}" for i in range(60)]))
+
+    async def drain(node):
+        ids = []
+        while batch := await node.claim(4, visibility_timeout=60):
+            ids.extend(job.id for job in batch)
+            await node.ack(batch)
+        return ids
+
+    claimed = await asyncio.gather(*(drain(node) for node in nodes))
+    everything = [id for ids in claimed for id in ids]
+    assert len(everything) == len(set(everything)) == 60
+
+
+class FakeScraper:
+    async def scrape_profile(self, name):
+        await asyncio.sleep(0.01)
+        if name == "broken":
+            raise RuntimeError("page crashed")
+        return {"name": name}
+
+
+@pytest.mark.asyncio
+async def test_consumer_acks_done_and_retries_failed(tmp_path):
+    queue = open_queue(f"sqlite://{tmp_path}/jobs.sqlite", max_attempts=2)
+    await queue.put(jobs("a", "b", "c", "broken"))
+    results = []
+    consumer = QueueConsumer(
+        queue,
+        [FakeScraper(), FakeScraper()],
+        batch_size=2,
+        retry_delay=0,
+        on_result=lambda job, status, result, error: results.append((job.id, status)),
+    )
+
+    summary = await consumer.run(drain=True)
+
+    assert summary["done"] == 3 and summary["failed"] == 2
+    assert results.count(("profile:broken:data", "failed")) == 2
+    assert await queue.stats() == {"pending": 0, "in_flight": 0, "dead": 1}
+    await queue.close()
@@ -0,0 +1,68 @@
+import pytest
+
+from linkedin_scraper.lifecycle import ContextLifecycle, PageCrashed
+from linkedin_scraper.scrapers.linkedin import LinkedInScraper
+from tests.conftest import FakeContext, FakePage
+
+
+@pytest.fixture
+def scraper():
+    scraper = LinkedInScraper(har_mode="off")
+    scraper.lifecycle = ContextLifecycle(
+        max_jobs=2, max_rss_mb=0, hang_timeout=0.05, max_attempts=2
+    )
+    scraper.contexts = []
+
+    async def new_context(**options):
+        context, page = FakeContext(), FakePage()
+        scraper.lifecycle.watch(page)
+        scraper.contexts.append(context)
+        return context, page
+
+    scraper.new_context = new_context
+    return scraper
+
+
+@pytest.mark.asyncio
+async def test_context_recycled_after_max_jobs(scraper):
+    scraper.context, scraper.page = await scraper.new_context()
+    pages = []
+
+    async def run(page):
+        pages.append(page)
+        return "ok"
+
+    for _ in range(5):
+        assert await scraper.run_job("profile_x", run) == "ok"
+    # Jobs 1-2, 3-4 and 5 ran in three contexts
+    assert len(set(map(id, pages))) == 3
+    assert [c.closed for c in scraper.contexts] == [True, True, False]
+
+
+@pytest.mark.asyncio
+async def test_crashed_page_is_replaced_and_job_rerun(scraper):
+    scraper.context, scraper.page = await scraper.new_context()
+    calls = []
+
+    async def run(page):
+        calls.append(page)
+        if len(calls) == 1:
+            page.crash()
+            return {"error": "Target crashed"}
+        return {"name": "x"}
+
+    assert await scraper.run_job("profile_x", run) == {"name": "x"}
+    assert calls[0] is not calls[1]
+    assert scraper.contexts[0].closed
+
+
+@pytest.mark.asyncio
+async def test_hung_page_fails_after_max_attempts(scraper):
+    scraper.context, scraper.page = await scraper.new_context()
+
+    async def run(page):
+        page.hang = True
+
+    with pytest.raises(PageCrashed):
+        await scraper.run_job("company_x", run)
+    assert len(scraper.contexts) == 3
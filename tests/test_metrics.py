@@ -0,0 +1,72 @@
+import httpx
+import pytest
+
+from linkedin_scraper.metrics import (
+    STAGE_SECONDS,
+    MetricsRegistry,
+    MetricsServer,
+    serve_metrics,
+)
+from linkedin_scraper.utils.stages import stage
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    pages = registry.counter("pages_total", "Pages fetched", ("tier",))
+    depth = registry.gauge("queue_depth", "Queued jobs")
+    latency = registry.histogram(
+        "stage_seconds", "Stage durations", ("stage",), (0.1, 1)
+    )
+
+    pages.inc(tier="http")
+    pages.inc(2, tier='we"ird')
+    depth.set_function(lambda: 3)
+    latency.observe(0.05, stage="goto")
+    latency.observe(0.5, stage="goto")
+    latency.observe(5, stage="goto")
+
+    assert registry.counter("pages_total", "Pages fetched", ("tier",)) is pages
+    with pytest.raises(ValueError):
+        pages.inc()
+
+    text = registry.render()
+    assert "# TYPE pages_total counter" in text
+    assert 'pages_total{tier="http"} 1' in text
+    assert 'pages_total{tier="we\\"ird"} 2' in text
+    assert "queue_depth 3" in text
+    assert 'stage_seconds_bucket{stage="goto",le="0.1"} 1' in text
+    assert 'stage_seconds_bucket{stage="goto",le="1"} 2' in text
+    assert 'stage_seconds_bucket{stage="goto",le="+Inf"} 3' in text
+    assert 'stage_seconds_sum{stage="goto"} 5.55' in text
+    assert 'stage_seconds_count{stage="goto"} 3' in text
+
+
+def test_stage_observes_latency():
+    before = STAGE_SECONDS.count(stage="metrics-test")
+    with stage("metrics-test"):
+        pass
+    assert STAGE_SECONDS.count(stage="metrics-test") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint():
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Jobs").inc()
+    server = MetricsServer(registry)
+    await server.start(host="127.0.0.1", port=0)
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"http://127.0.0.1:{server.port}/metrics")
+    finally:
+        await server.close()
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "jobs_total 1" in response.text
+
+
+def test_serve_metrics_in_background_thread():
+    registry = MetricsRegistry()
+    registry.gauge("up", "Up").set(1)
+    port = serve_metrics(0, registry=registry)
+    response = httpx.get(f"http://127.0.0.1:{port}/metrics")
+    assert "up 1" in response.text
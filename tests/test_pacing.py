@@ -0,0 +1,44 @@
+import pytest
+
+from linkedin_scraper.metrics import PACING_SECONDS
+from linkedin_scraper import pacing
+from linkedin_scraper.pacing import (
+    PACING_PROFILES,
+    Pacer,
+    configure_pacing,
+    pace,
+    pacing_job,
+)
+
+
+@pytest.mark.asyncio
+async def test_delays_stop_at_the_job_budget(monkeypatch):
+    monkeypatch.setitem(PACING_PROFILES, "test", {"click": (0.02, 0.02)})
+    before = PACING_SECONDS.value(action="click")
+
+    with pacing_job("test", budget=0.05) as pacer:
+        waited = [await pace("click") for _ in range(4)]
+        # Reads are not in the profile and never wait
+        assert await pace("read") == 0.0
+
+    assert waited[:2] == [0.02, 0.02] and waited[3] == 0.0
+    assert pacer.spent == pytest.approx(0.05)
+    assert PACING_SECONDS.value(action="click") - before == pytest.approx(0.05)
+
+
+@pytest.mark.asyncio
+async def test_none_profile_never_waits():
+    pacer = Pacer("none", budget=0)
+    for action in ("navigation", "click", "input", "scroll", "pointer"):
+        assert await pacer.pause(action) == 0.0
+    with pytest.raises(ValueError):
+        Pacer("slow")
+
+
+def test_unknown_profile_from_the_environment_falls_back_to_human():
+    assert pacing._env_profile("fast") == "fast"
+    assert pacing._env_profile("slow") == "human"
+    # Chosen explicitly, e.g. on the command line, it is still an error
+    with pytest.raises(ValueError):
+        configure_pacing("slow")
+    assert Pacer().profile == pacing._default_profile
@@ -0,0 +1,90 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from linkedin_scraper.pacing import PACING_PROFILES, pacing_job
+from linkedin_scraper.pipeline import Prefetcher, open_page, target_url
+from tests.conftest import FakePage
+
+
+class FakeScraper:
+    def __init__(self):
+        self.har = SimpleNamespace(enabled=False)
+        self.context = object()
+        self.pages = []
+        self.page = self._page()
+
+    def _page(self):
+        page = FakePage(context=self.context)
+        self.pages.append(page)
+        return page
+
+    async def new_page(self):
+        return self._page()
+
+
+async def scrape(scraper, name):
+    await open_page(scraper.page, target_url("profile", name), "profile")
+    # Scroll, extract and save
+    await asyncio.sleep(0.05)
+
+
+@pytest.mark.asyncio
+async def test_next_target_loads_while_current_one_is_extracted():
+    scraper = FakeScraper()
+    prefetcher = Prefetcher(scraper, depth=1)
+    queue = ["a", "b", "c", "d"]
+
+    start = time.perf_counter()
+    with pacing_job("none"):
+        while True:
+            name = prefetcher.next() or (queue.pop(0) if queue else None)
+            if name is None:
+                break
+            while prefetcher.wants_more() and queue:
+                ahead = queue.pop(0)
+                await prefetcher.prefetch(ahead, "profile", ahead)
+            await scrape(scraper, name)
+    elapsed = time.perf_counter() - start
+    await prefetcher.close()
+
+    visits = sorted(url for page in scraper.pages for url in page.visits)
+    assert visits == [target_url("profile", name) for name in "abcd"]
+    # Two pages take turns; one load in four is not hidden behind extraction
+    assert len(scraper.pages) == 2
+    assert elapsed < 0.35
+    assert [page.closed for page in scraper.pages].count(True) == 1
+
+
+@pytest.mark.asyncio
+async def test_prefetch_from_recycled_context_is_dropped():
+    scraper = FakeScraper()
+    prefetcher = Prefetcher(scraper, depth=1)
+    with pacing_job("none"):
+        await prefetcher.prefetch("b", "profile", "b")
+        # The context was recycled meanwhile
+        scraper.context = object()
+        scraper.page = scraper._page()
+        assert prefetcher.next() == "b"
+        await scrape(scraper, "b")
+    assert scraper.page.visits == [target_url("profile", "b")]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_navigation_is_paced_by_its_job(monkeypatch):
+    monkeypatch.setitem(PACING_PROFILES, "test", {"navigation": (0.01, 0.01)})
+    scraper = FakeScraper()
+    prefetcher = Prefetcher(scraper, depth=1)
+    with pacing_job("test", budget=0) as current:
+        await prefetcher.prefetch("b", "profile", "b")
+        assert prefetcher.next() == "b"
+        await scrape(scraper, "b")
+    await prefetcher.close()
+
+    # The prefetch drew from the next job's pacer, with the job budget
+    pacer = scraper.prefetch_pacer
+    assert pacer is not current and pacer.profile == "test" and pacer.budget
+    assert pacer.spent == pytest.approx(0.01) and current.spent == 0
+    assert prefetcher.next() is None and scraper.prefetch_pacer is None
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from linkedin_scraper.pacing import pacing_job
+from linkedin_scraper.pipeline import target_url
+from linkedin_scraper.scrapers.profile import (
+    ANCHOR_DETAIL_SECTION_SCRIPT,
+    ProfileScraper,
+)
+from tests.conftest import FakeContext
+
+# Fallback selectors read without a count(); missing ones would never resolve
+TEXTS = {
+    "h1.text-heading-xlarge": [" Jane Doe "],
+    "div.text-body-medium": ["Engineer"],
+    "span.text-body-small": ["Sydney"],
+}
+
+
+@pytest.mark.asyncio
+async def test_detail_pages_load_concurrently_and_merge(tmp_path, monkeypatch):
+    context = FakeContext(texts=TEXTS, latency=0)
+    page = await context.new_page()
+    scraper = ProfileScraper(str(tmp_path), detail_sections="experience,skills")
+
+    async def experience(page, profile_data):
+        assert page.evaluated[-1] == (ANCHOR_DETAIL_SECTION_SCRIPT, "experience")
+        profile_data["experiences"] = [{"title": "Engineer", "page": page.url}]
+
+    async def fails(page, profile_data):
+        raise RuntimeError("layout changed")
+
+    async def no_scroll(page):
+        raise AssertionError("profile page scrolled")
+
+    monkeypatch.setattr(scraper, "_extract_experience", experience)
+    monkeypatch.setattr(scraper, "_extract_skills", fails)
+    monkeypatch.setattr(scraper, "_scroll_page", no_scroll)
+
+    start = time.perf_counter()
+    with pacing_job("none"):
+        data = await scraper.scrape_profile(page, "jane")
+    elapsed = time.perf_counter() - start
+
+    # Three loads of 50ms side by side, not one after another
+    assert elapsed < 0.15
+    assert data["name"] == "Jane Doe"
+    detail_url = target_url("profile", "jane") + "/details/experience/"
+    assert data["experiences"] == [{"title": "Engineer", "page": detail_url}]
+    assert data["skills"] == []
+    # Sections without a detail page are still read from the profile page
+    assert data["educations"] == [] and data["languages"] == []
+    assert all(p.closed for p in context.pages[1:])
+
+
+def test_rejects_unknown_detail_sections(tmp_path):
+    with pytest.raises(ValueError):
+        ProfileScraper(str(tmp_path), detail_sections="experience,posts")
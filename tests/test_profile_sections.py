@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import pytest
+
+from linkedin_scraper.scrapers.profile import ProfileScraper
+
+
+async def _timed_extract(scraper, page):
+    start = time.perf_counter()
+    data = await scraper._extract_profile_data(page)
+    return data, time.perf_counter() - start
+
+
+@pytest.mark.asyncio
+async def test_sections_run_concurrently(tmp_path, fake_page):
+    sequential = ProfileScraper(data_dir=str(tmp_path), concurrent_sections=False)
+    concurrent = ProfileScraper(data_dir=str(tmp_path), concurrent_sections=True)
+
+    seq_data, seq_time = await _timed_extract(sequential, fake_page)
+    con_data, con_time = await _timed_extract(concurrent, fake_page)
+
+    assert seq_data == con_data
+    assert con_data["name"] == "Jane Doe"
+    assert con_data["experiences"] == []
+    assert "partial_sections" not in con_data
+    # Seven sections on one page: concurrent wall time tracks the slowest one
+    assert con_time < seq_time / 2
+
+
+@pytest.mark.asyncio
+async def test_stalled_section_is_isolated(tmp_path, fake_page, monkeypatch):
+    scraper = ProfileScraper(data_dir=str(tmp_path), section_timeout=200)
+    del fake_page.texts["div.text-body-medium"]
+
+    async def stalled(page, profile_data):
+        profile_data["skills"] = ["partial"]
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(scraper, "_extract_skills", stalled)
+    data, elapsed = await _timed_extract(scraper, fake_page)
+
+    assert elapsed < 1
+    assert data["skills"] == ["partial"]
+    assert data["name"] == "Jane Doe"
+    # The headline lookup stalls, so basic info keeps its partial result
+    assert data["headline"] == "Position not found"
+    assert data["about"] == "About information not found"
+    assert data["partial_sections"] == ["basic_info", "skills"]
+
+
+@pytest.mark.asyncio
+async def test_contact_dialog_opens_after_other_sections(
+    tmp_path, fake_page, monkeypatch
+):
+    scraper = ProfileScraper(data_dir=str(tmp_path))
+    done = []
+
+    async def slow_skills(page, profile_data):
+        await asyncio.sleep(0.05)
+        done.append("skills")
+
+    async def contact_info(page, profile_data):
+        # The dialog would cover the page other sections are still reading
+        profile_data["contact_info"] = {"sections_done": list(done)}
+
+    monkeypatch.setattr(scraper, "_extract_skills", slow_skills)
+    monkeypatch.setattr(scraper, "_extract_contact_info", contact_info)
+    data, _ = await _timed_extract(scraper, fake_page)
+
+    assert data["contact_info"] == {"sections_done": ["skills"]}
@@ -0,0 +1,16 @@
+import pytest
+
+from linkedin_scraper.readiness import wait_until_ready
+from linkedin_scraper.utils.stages import StageRecorder, recording
+from tests.conftest import FakePage
+
+
+@pytest.mark.asyncio
+async def test_wait_until_ready_is_recorded_as_a_stage():
+    page = FakePage(ready_after=0.01)
+    with recording(StageRecorder()) as recorder:
+        assert await wait_until_ready(page, "company", budget=1000)
+        assert not await wait_until_ready(FakePage(ready_after=5), "profile", budget=20)
+
+    assert ".org-module-card__margin-bottom h1" in page.expressions[0]
+    assert recorder.summary()["ready"]["count"] == 2
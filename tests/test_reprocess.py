@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from linkedin_scraper import llm_extractor
+from linkedin_scraper.reprocess import iter_archive_pages, iter_html_files, reprocess
+
+PAGE = (
+    "<html><body><nav>menu</nav><main><h1>{name}</h1><p>{text}</p></main></body></html>"
+)
+
+
+def write_pages(tmp_path):
+    (tmp_path / "profile").mkdir()
+    (tmp_path / "profile" / "jane.html").write_text(PAGE.format(name="Jane", text="x"))
+    (tmp_path / "company_acme.html").write_text(PAGE.format(name="Acme", text="y"))
+    (tmp_path / "notes.html").write_text(PAGE.format(name="?", text="z"))
+
+
+def test_iter_html_files_infers_targets(tmp_path):
+    write_pages(tmp_path)
+    pages = {(p.type, p.name) for p in iter_html_files(str(tmp_path))}
+    assert pages == {("profile", "jane"), ("company", "acme")}
+    typed = {(p.type, p.name) for p in iter_html_files(str(tmp_path), "profile")}
+    assert ("profile", "notes") in typed
+
+
+@pytest.mark.asyncio
+async def test_reprocess_cleans_and_extracts(tmp_path, monkeypatch):
+    write_pages(tmp_path)
+    output = tmp_path / "out"
+    monkeypatch.setattr(
+        llm_extractor, "extract_profile", lambda html: {"profile_name": html}
+    )
+    monkeypatch.setattr(
+        llm_extractor, "extract_company", lambda html: {"company_name": html}
+    )
+
+    stats = await reprocess(
+        iter_html_files(str(tmp_path)), str(output), llm=True, workers=2
+    )
+
+    assert stats["pages"] == 2 and stats["written"] == 2 and stats["failed"] == 0
+    profile = json.loads((output / "profile_jane.json").read_text())
+    assert "Jane" in profile["profile_name"] and "menu" not in profile["profile_name"]
+    company = json.loads((output / "company_acme.json").read_text())
+    assert "Acme" in company["company_name"]
+
+    stats = await reprocess(iter_html_files(str(tmp_path)), str(output), llm=False)
+    cleaned = json.loads((output / "profile_jane.json").read_text())
+    assert cleaned["main_html"].startswith("<main>")
+
+
+@pytest.mark.asyncio
+async def test_reprocess_reads_archived_pages(tmp_path):
+    pytest.importorskip("zstandard")
+    from linkedin_scraper.storage.archive import HtmlArchive
+
+    archive = HtmlArchive(archive_dir=str(tmp_path / "archive"), max_age=0, max_bytes=0)
+    archive.put("profile", "jane", PAGE.format(name="Old", text="x"), fetched_at=1.0)
+    archive.put("profile", "jane", PAGE.format(name="Jane", text="x"), fetched_at=2.0)
+    archive.put("company", "acme", PAGE.format(name="Acme", text="y"), fetched_at=1.0)
+    output = tmp_path / "out"
+
+    pages = iter_archive_pages(archive, target_type="profile")
+    stats = await reprocess(pages, str(output), llm=False)
+
+    assert stats["pages"] == 1 and stats["written"] == 1
+    cleaned = json.loads((output / "profile_jane.json").read_text())
+    assert "Jane" in cleaned["main_html"]
+    assert not (output / "company_acme.json").exists()
@@ -0,0 +1,106 @@
+import json
+import sqlite3
+import time
+
+from linkedin_scraper.storage import results
+from linkedin_scraper.storage.results import ResultStore
+from linkedin_scraper.storage.sinks import open_sink
+
+
+def test_upserts_keep_newest_record_and_change_time(tmp_path):
+    store = ResultStore(path=str(tmp_path / "results.sqlite"))
+    store.upsert_many(
+        [
+            ("company", "acme", {"name": "Acme"}, 100.0),
+            ("company", "globex", {"name": "Globex"}, 120.0),
+            ("profile", "jane", {"name": "Jane"}, 110.0),
+        ]
+    )
+    # Same content later, different content later, then a stale batch
+    store.upsert("company", "acme", {"name": "Acme"}, scraped_at=200.0)
+    store.upsert("profile", "jane", {"name": "Jane Doe"}, scraped_at=210.0)
+    store.upsert("profile", "jane", {"name": "Old"}, scraped_at=150.0)
+
+    acme = store.info("company", "acme")
+    assert (acme.scraped_at, acme.changed_at, acme.first_seen_at) == (200, 100, 100)
+    assert store.get("profile", "jane") == {"name": "Jane Doe"}
+    assert store.info("profile", "jane").changed_at == 210.0
+    assert [r.slug for r in store.query(since=115.0)] == ["jane", "acme", "globex"]
+    assert [r.slug for r in store.query(changed_since=150.0)] == ["jane"]
+    assert [r.slug for r in store.query("company", slug="g*")] == ["globex"]
+    assert [row["slug"] for row in store.export(entity_type="company")] == [
+        "acme",
+        "globex",
+    ]
+    assert not store.is_fresh("company", "acme")
+    store.upsert("company", "acme", {"name": "Acme"})
+    assert store.is_fresh("company", "acme", max_age=60)
+    assert store.stats() == {"company": 2, "profile": 1}
+    store.close()
+
+
+def test_export_reads_in_chunks_while_the_sink_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(results, "EXPORT_CHUNK", 3)
+    sink = open_sink("sqlite", str(tmp_path), batch_size=5)
+    for i in range(10):
+        sink.write("profile", f"user{i}", {"name": f"User {i}"})
+    sink.flush()
+
+    exported = []
+    for row in sink.store.export(since=0):
+        exported.append(row["slug"])
+        # Writes go on between chunks instead of waiting for the export
+        sink.write("company", row["slug"], {"name": row["slug"]})
+    sink.flush()
+
+    assert exported == [f"user{i}" for i in range(10)]
+    assert sink.store.stats() == {"company": 10, "profile": 10}
+    sink.close()
+
+
+def test_sqlite_sink_batches_in_writer_thread(tmp_path):
+    sink = open_sink("sqlite", str(tmp_path), batch_size=50)
+    for i in range(500):
+        sink.write("profile", f"user{i}", {"name": f"User {i}"})
+    sink.flush()
+
+    assert sink.store.stats() == {"profile": 500}
+    assert sink.store.get("profile", "user499") == {"name": "User 499"}
+    assert 10 <= sink.batches <= 500 and sink.errors == 0
+    sink.close()
+
+
+def test_sqlite_sink_retries_failed_batches(tmp_path):
+    sink = open_sink("sqlite", str(tmp_path), retry_delays=(0, 0))
+    upsert_many = sink.store.upsert_many
+    calls = []
+
+    def flaky(rows):
+        calls.append(len(rows))
+        if len(calls) == 1 or any(row[1] == "bad" for row in rows):
+            raise sqlite3.OperationalError("database is locked")
+        return upsert_many(rows)
+
+    sink.store.upsert_many = flaky
+    sink.write("profile", "first", {"name": "First"})
+    sink.flush()
+    assert sink.store.get("profile", "first") == {"name": "First"}
+
+    for name in ("a", "bad", "b"):
+        sink.write("profile", name, {"name": name})
+    sink.flush()
+    assert sink.store.stats() == {"profile": 3}
+    assert sink.errors == 1
+    sink.close()
+
+
+def test_import_json_files(tmp_path):
+    for name, record in (("profile_jane", {"name": "Jane"}), ("company_acme", {})):
+        (tmp_path / f"{name}.json").write_text(json.dumps(record))
+    (tmp_path / "cookies.json").write_text("[]")
+
+    store = ResultStore(path=str(tmp_path / "results.sqlite"))
+    assert store.import_dir(str(tmp_path)) == 2
+    assert store.get("profile", "jane") == {"name": "Jane"}
+    assert store.info("company", "acme").scraped_at <= time.time()
+    store.close()
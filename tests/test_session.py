@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+from linkedin_scraper.session import SessionStore, parse_cookies
+
+
+class FakeContext:
+    async def storage_state(self, path):
+        with open(path, "w") as f:
+            json.dump({"cookies": [], "origins": []}, f)
+
+
+def test_parse_cookie_string():
+    cookies = parse_cookies('li_at="abc"; JSESSIONID=ajax:1')
+    assert [c["name"] for c in cookies] == ["li_at", "JSESSIONID"]
+    assert cookies[0]["value"] == "abc"
+    assert cookies[1]["domain"] == ".linkedin.com"
+
+
+def test_session_freshness(tmp_path):
+    store = SessionStore(path=str(tmp_path / "state.json"), ttl=60)
+    assert not store.is_fresh()
+    assert store.context_options() == {}
+
+    asyncio.run(store.save(FakeContext()))
+    assert store.is_fresh()
+    assert store.context_options() == {"storage_state": store.path}
+
+    store.invalidate()
+    assert store.exists() and not store.is_fresh()
+
+    store.ttl = 0
+    store.mark_validated()
+    assert not store.is_fresh()
+
+
+def test_invalid_env_cookies_fall_back_to_password_login(tmp_path, monkeypatch):
+    from linkedin_scraper.scrapers import linkedin
+    from linkedin_scraper.storage.sinks import JsonFileSink
+
+    class FakePage:
+        async def goto(self, url, **kwargs):
+            pass
+
+    class FakeAuth:
+        def __init__(self):
+            self.password_logins = 0
+
+        async def is_logged_in(self, page):
+            return False
+
+        async def login(self, page, context):
+            self.password_logins += 1
+            return False
+
+    class CookieContext(FakeContext):
+        async def add_cookies(self, cookies):
+            pass
+
+    monkeypatch.setattr(linkedin, "get_env_cookies", lambda: [{"name": "li_at"}])
+    scraper = linkedin.LinkedInScraper(sink=JsonFileSink(str(tmp_path)))
+    scraper.session = SessionStore(path=str(tmp_path / "state.json"))
+    scraper.auth_handler = FakeAuth()
+    scraper.page, scraper.context = FakePage(), CookieContext()
+
+    assert asyncio.run(scraper.login()) is False
+    assert scraper.auth_handler.password_logins == 1
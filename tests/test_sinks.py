@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from linkedin_scraper.storage.sinks import benchmark_sink, open_sink
+
+
+def test_json_sink_keeps_one_file_per_target(tmp_path):
+    sink = open_sink("json", str(tmp_path))
+    sink.write("profile", "jane", {"name": "Jane"})
+    sink.write("profile", "jane", {"name": "Jane Doe"})
+    sink.close()
+
+    with open(tmp_path / "profile_jane.json", encoding="utf-8") as f:
+        assert json.load(f) == {"name": "Jane Doe"}
+    assert sink.stats()["records"] == 2
+
+
+def test_ndjson_sink_appends_and_rotates(tmp_path):
+    sink = open_sink("ndjson", str(tmp_path), rotate_bytes=200)
+    for i in range(10):
+        sink.write("company", f"acme-{i}", {"name": "Acme", "jobs": [i]})
+    sink.close()
+
+    assert len(sink.files) > 1
+    lines = []
+    for path in sink.files:
+        with open(path, encoding="utf-8") as f:
+            lines += [json.loads(line) for line in f]
+    assert [line["name"] for line in lines] == [f"acme-{i}" for i in range(10)]
+    assert lines[3]["type"] == "company" and lines[3]["data"]["jobs"] == [3]
+
+
+def test_parquet_sink_flushes_every_batch(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    sink = open_sink("parquet", str(tmp_path), batch_size=4)
+    for i in range(10):
+        sink.write("profile", f"user{i}", {"name": f"User {i}"})
+    assert len(sink.files) == 2
+    sink.close()
+
+    tables = [pq.read_table(path) for path in sink.files]
+    assert [t.num_rows for t in tables] == [4, 4, 2]
+    assert json.loads(tables[2].column("data")[1].as_py()) == {"name": "User 9"}
+
+
+def test_benchmark_and_unknown_sink(tmp_path):
+    result = benchmark_sink("ndjson", str(tmp_path), records=200)
+    assert result["records"] == 200 and result["records_per_second"] > 0
+    with pytest.raises(ValueError):
+        open_sink("csv", str(tmp_path))
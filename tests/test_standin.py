@@ -0,0 +1,84 @@
+import time
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from linkedin_scraper.fetch import Target, is_complete
+from linkedin_scraper.standin import Fixtures, StandInServer
+
+
+@pytest_asyncio.fixture
+async def standin():
+    server = StandInServer(fixtures=Fixtures())
+    await server.start(host="127.0.0.1", port=0)
+    yield server
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_login_then_lazy_profile(standin):
+    async with httpx.AsyncClient(base_url=standin.base_url) as client:
+        response = await client.get("/in/hqman")
+        assert response.status_code == 302
+        assert response.headers["location"].startswith("/authwall")
+
+        response = await client.post(
+            "/login", data={"session_key": "me@example.com", "session_password": "x"}
+        )
+        assert response.status_code == 302 and "li_at" in client.cookies
+
+        feed = await client.get("/feed/")
+        assert 'class="global-nav__me"' in feed.text
+
+        profile = await client.get("/in/hqman/")
+        assert 'class="text-heading-xlarge">Hq Man<' in profile.text
+        assert 'data-src="/in/hqman/sections/experience"' in profile.text
+        assert is_complete(
+            Target("profile", "hqman"), 200, str(profile.url), profile.text
+        )
+
+        section = await client.get("/in/hqman/sections/experience")
+        assert section.text.count("<li>") == 2 and 'id="experience"' in section.text
+        details = await client.get("/in/hqman/details/experience/")
+        assert details.text.count("<li>") == 2 and 'id="experience"' not in details.text
+
+        company = await client.get("/company/some-startup/")
+        assert "Some Startup" in company.text and "org-top-card" in company.text
+
+        about = await client.get("/company/relevanceai/about/")
+        assert "<dt><h3>Company size</h3></dt><dd>51-200 employees</dd>" in about.text
+        jobs = await client.get("/company/relevanceai/jobs/")
+        assert jobs.text.count('class="job-card-square"') == 2
+
+
+@pytest.mark.asyncio
+async def test_latency_and_errors():
+    server = StandInServer(latency=40, error_rate=1.0)
+    await server.start(host="127.0.0.1", port=0)
+    try:
+        async with httpx.AsyncClient(base_url=server.base_url) as client:
+            start = time.perf_counter()
+            response = await client.get("/login")
+            assert time.perf_counter() - start >= 0.04
+            assert response.status_code == 503
+            stats = (await client.get("/_standin/stats")).json()
+        assert stats["statuses"] == {"503": 1}
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_rejects_wrong_credentials():
+    server = StandInServer(username="me", password="secret", strict_auth=True)
+    await server.start(host="127.0.0.1", port=0)
+    try:
+        async with httpx.AsyncClient(base_url=server.base_url) as client:
+            response = await client.post(
+                "/login", data={"session_key": "me", "session_password": "nope"}
+            )
+            assert response.status_code == 401 and "form__error" in response.text
+            client.cookies.set("li_at", "forged")
+            assert (await client.get("/company/acme/")).status_code == 302
+    finally:
+        await server.close()
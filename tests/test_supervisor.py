@@ -0,0 +1,56 @@
+import os
+
+from linkedin_scraper.supervisor import Supervisor, make_job
+
+
+class FakeScraper:
+    """Picklable stand-in for LinkedInScraper, run in the worker processes."""
+
+    def __init__(self, headless=True):
+        self.browser = object()
+
+    async def initialize_browser(self, browser=None):
+        pass
+
+    async def login(self):
+        return True
+
+    async def scrape_profile(self, name):
+        marker = os.environ.get("SUPERVISOR_TEST_MARKER")
+        if name == "crash" and marker and not os.path.exists(marker):
+            open(marker, "w").close()
+            os._exit(1)
+        if name == "missing":
+            return {"error": "not found"}
+        return {"name": name, "pid": os.getpid()}
+
+    async def cleanup(self):
+        pass
+
+
+def test_supervisor_shards_jobs_and_restarts_dead_workers(tmp_path, monkeypatch):
+    monkeypatch.setenv("SUPERVISOR_TEST_MARKER", str(tmp_path / "crashed"))
+    names = [f"user{i}" for i in range(12)] + ["crash", "missing"]
+    supervisor = Supervisor(
+        processes=2, concurrency=2, max_attempts=2, scraper_factory=FakeScraper
+    )
+    records = []
+
+    summary = supervisor.run(
+        [make_job("profile", name) for name in names], on_result=records.append
+    )
+
+    by_name = {record["name"]: record for record in records}
+    assert len(by_name) == len(names)
+    assert summary["done"] == len(names) - 1 and summary["failed"] == 1
+    assert summary["restarts"] == 1 and summary["not_run"] == 0
+    assert by_name["crash"]["status"] == "done"
+    assert by_name["crash"]["attempts"] == 2
+    assert by_name["missing"]["error"] == "not found"
+    # Both processes took work
+    assert len({r["result"]["pid"] for r in records if r["status"] == "done"}) >= 2
+    assert all(not worker.process.is_alive() for worker in supervisor.workers.values())
+
+    metrics = supervisor.render()
+    assert "linkedin_scraper_worker_restarts_total 1" in metrics
+    assert 'linkedin_scraper_jobs_total{type="profile",status="done"}' in metrics
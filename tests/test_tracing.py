@@ -0,0 +1,102 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from linkedin_scraper import tracing
+from linkedin_scraper.storage.writer import FileWriter
+from linkedin_scraper.tracing import (
+    JsonlExporter,
+    configure_tracing,
+    current_trace_id,
+    flush_traces,
+    span,
+)
+from linkedin_scraper.utils.stages import stage
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    configure_tracing(True, JsonlExporter(path=str(path), batch_size=1000))
+    yield path
+    configure_tracing(False)
+
+
+def read_spans(path):
+    flush_traces()
+    spans = []
+    for line in path.read_text().splitlines():
+        for resource in json.loads(line)["resourceSpans"]:
+            for scope in resource["scopeSpans"]:
+                spans.extend(scope["spans"])
+    return {s["name"]: s for s in spans}
+
+
+def test_nested_spans_share_trace(trace_file):
+    with span("job", target="alice") as job:
+        with stage("goto"):
+            pass
+        with pytest.raises(ValueError):
+            with span("extract.experience"):
+                raise ValueError("boom")
+
+    spans = read_spans(trace_file)
+    assert spans["goto"]["traceId"] == job.trace_id
+    assert spans["goto"]["parentSpanId"] == job.span_id
+    assert "parentSpanId" not in spans["job"]
+    assert spans["job"]["attributes"] == [
+        {"key": "target", "value": {"stringValue": "alice"}}
+    ]
+    assert spans["job"]["status"]["code"] == "STATUS_CODE_OK"
+    failed = spans["extract.experience"]
+    assert failed["status"] == {"code": "STATUS_CODE_ERROR", "message": "boom"}
+    assert failed["events"][0]["name"] == "exception"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_jobs_get_separate_traces(trace_file):
+    async def job(name):
+        with span("job", target=name):
+            await asyncio.sleep(0.01)
+            with span("scroll"):
+                await asyncio.sleep(0.01)
+            return current_trace_id()
+
+    first, second = await asyncio.gather(job("a"), job("b"))
+    assert first != second
+    assert current_trace_id() is None
+
+
+def test_disabled_tracing_is_noop(tmp_path):
+    configure_tracing(False)
+    with span("job") as active:
+        assert active is None
+        assert current_trace_id() is None
+    assert span("a") is span("b") is tracing._NOOP
+
+
+def test_full_writer_drops_spans_instead_of_blocking(tmp_path):
+    writer = FileWriter(max_pending=1)
+    stuck = threading.Event()
+    # Hold the writer thread in a callback and fill its queue behind it
+    writer.submit(str(tmp_path / "a.json"), {}, done=lambda error: stuck.wait())
+    time.sleep(0.05)
+    writer.submit(str(tmp_path / "b.json"), {})
+    path = tmp_path / "traces.jsonl"
+    exporter = JsonlExporter(path=str(path), batch_size=1, writer=writer)
+    configure_tracing(True, exporter)
+    try:
+        start = time.perf_counter()
+        for _ in range(3):
+            with span("job"):
+                pass
+        assert time.perf_counter() - start < 1
+        assert exporter.dropped == 3
+    finally:
+        stuck.set()
+        configure_tracing(False)
+        writer.close()
+    assert not path.exists()
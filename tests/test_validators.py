@@ -0,0 +1,212 @@
+import time
+import asyncio
+
+import pytest
+
+from linkedin_scraper.fetch import (
+    FetchOrchestrator,
+    FetchResult,
+    FetchTier,
+    Target,
+    ValidatorStore,
+    Validators,
+    main_content_hash,
+)
+from linkedin_scraper.fetch.validators import DUE, FRESH, STALE
+
+
+class ConditionalTier(FetchTier):
+    """Answers 304 whenever the request carries the ETag it handed out."""
+
+    name = "http"
+
+    def __init__(self, html):
+        self.html = html
+        self.etag = '"v1"'
+        self.conditional_calls = 0
+
+    async def fetch(self, target):
+        return FetchResult(
+            target=target, html=self.html, url=target.url, headers={"etag": self.etag}
+        )
+
+    async def revalidate(self, target, validators):
+        self.conditional_calls += 1
+        if validators.conditional_headers().get("If-None-Match") == self.etag:
+            return FetchResult(
+                target=target, html="", url=target.url, status=304, unchanged=True
+            )
+        return await self.fetch(target)
+
+
+def test_hash_ignores_markup_outside_visible_text():
+    a = '<body><nav>x</nav><main id="ember1"><h1>Jane</h1> <script>1</script></main>'
+    b = '<main class="new" id="ember9"><h1 data-x="y">Jane</h1><script>2</script></main>'
+    assert main_content_hash(a) == main_content_hash(b)
+    assert main_content_hash(a) != main_content_hash("<main><h1>John</h1></main>")
+
+
+def test_freshness_states(tmp_path):
+    store = ValidatorStore(
+        path=str(tmp_path / "v.sqlite"),
+        ttls={"profile": 100},
+        stale_while_revalidate=50,
+    )
+    record = store.get("profile:jane")
+    assert store.state("profile", record) == DUE
+
+    now = time.time()
+    assert store.state("profile", Validators("k", checked_at=now - 10)) == FRESH
+    assert store.state("profile", Validators("k", checked_at=now - 120)) == STALE
+    assert store.state("profile", Validators("k", checked_at=now - 200)) == DUE
+
+
+@pytest.mark.asyncio
+async def test_conditional_revalidation(tmp_path):
+    tier = ConditionalTier("<main><h1>Jane</h1></main>")
+    store = ValidatorStore(
+        path=str(tmp_path / "v.sqlite"), ttls={"profile": 0}, stale_while_revalidate=0
+    )
+    orchestrator = FetchOrchestrator([tier], validators=store)
+    target = Target("profile", "jane")
+
+    first = await orchestrator.fetch(target)
+    assert not first.unchanged and first.html
+    orchestrator.commit(first)
+
+    # Same ETag: a 304 and nothing left to process
+    second = await orchestrator.fetch(target)
+    assert second.unchanged and second.html == ""
+    assert tier.conditional_calls == 1
+
+    # New ETag but the same main region still counts as unchanged
+    tier.etag = '"v2"'
+    tier.html = '<main class="redesign"><h1>Jane</h1></main>'
+    assert (await orchestrator.fetch(target)).unchanged
+
+    tier.etag = '"v3"'
+    tier.html = "<main><h1>Jane Doe</h1></main>"
+    changed = await orchestrator.fetch(target)
+    assert not changed.unchanged
+    orchestrator.commit(changed)
+
+    report = orchestrator.report()["revalidation"]
+    assert report == {"changed": 2, "unchanged": 2}
+    await orchestrator.close()
+
+
+@pytest.mark.asyncio
+async def test_fresh_and_stale_targets_are_skipped(tmp_path):
+    tier = ConditionalTier("<main>Acme</main>")
+    store = ValidatorStore(
+        path=str(tmp_path / "v.sqlite"),
+        ttls={"company": 3600},
+        stale_while_revalidate=3600,
+    )
+    orchestrator = FetchOrchestrator([tier], validators=store, serve_stale=True)
+    target = Target("company", "acme")
+    orchestrator.commit(await orchestrator.fetch(target))
+
+    fresh = await orchestrator.fetch(target)
+    assert fresh.unchanged and tier.conditional_calls == 0
+
+    record = store.get(target.key)
+    record.checked_at -= 5400
+    store.save(record)
+    stale = await orchestrator.fetch(target)
+    assert stale.unchanged
+    await orchestrator.close()
+    # The stale hit was revalidated in the background before closing
+    assert tier.conditional_calls == 1
+    assert orchestrator.revalidation["stale"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_targets_are_revalidated_right_away_by_default(tmp_path):
+    tier = ConditionalTier("<main>Acme</main>")
+    store = ValidatorStore(
+        path=str(tmp_path / "v.sqlite"),
+        ttls={"company": 3600},
+        stale_while_revalidate=3600,
+    )
+    orchestrator = FetchOrchestrator([tier], validators=store)
+    target = Target("company", "acme")
+    orchestrator.commit(await orchestrator.fetch(target))
+
+    record = store.get(target.key)
+    record.checked_at -= 5400
+    store.save(record)
+    tier.etag, tier.html = '"v2"', "<main>Acme Corp</main>"
+    stale = await orchestrator.fetch(target)
+    assert stale.html == "<main>Acme Corp</main>" and not orchestrator.background
+    assert "stale" not in orchestrator.revalidation
+    await orchestrator.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_processing_leaves_the_target_due(tmp_path):
+    tier = ConditionalTier("<main>Acme</main>")
+    store = ValidatorStore(path=str(tmp_path / "v.sqlite"), ttls={"company": 3600})
+    orchestrator = FetchOrchestrator([tier], validators=store, serve_stale=True)
+    target = Target("company", "acme")
+
+    # Extraction of the first fetch fails, so it is never committed
+    first = await orchestrator.fetch(target)
+    assert first.html and store.get(target.key) is None
+
+    again = await orchestrator.fetch(target)
+    assert not again.unchanged and again.html == "<main>Acme</main>"
+    orchestrator.commit(again)
+    assert (await orchestrator.fetch(target)).unchanged
+
+    # A changed page found by a background revalidation is due next time,
+    # and the next fetch in this process gets it without fetching again
+    record = store.get(target.key)
+    record.checked_at -= 3600 + 60
+    store.save(record)
+    tier.etag, tier.html = '"v2"', "<main>Acme Corp</main>"
+    assert (await orchestrator.fetch(target)).unchanged
+    await asyncio.gather(*orchestrator.background)
+    assert store.state("company", store.get(target.key)) == DUE
+    calls = tier.conditional_calls
+    changed = await orchestrator.fetch(target)
+    assert changed.html == "<main>Acme Corp</main>"
+    assert tier.conditional_calls == calls
+    orchestrator.commit(changed)
+    assert (await orchestrator.fetch(target)).unchanged
+    await orchestrator.close()
+
+
+@pytest.mark.asyncio
+async def test_structured_scrape_skips_fresh_targets(tmp_path, monkeypatch):
+    from linkedin_scraper import main
+
+    scraped = []
+
+    class FakeScraper:
+        def __init__(self, sink=None):
+            pass
+
+        async def initialize_browser(self):
+            pass
+
+        async def login(self):
+            return True
+
+        async def scrape_company(self, name):
+            scraped.append(name)
+            return {"error": "timeout"} if len(scraped) == 1 else {"name": name}
+
+        async def cleanup(self):
+            pass
+
+    path = str(tmp_path / "v.sqlite")
+    monkeypatch.setattr(main, "LinkedInScraper", FakeScraper)
+    monkeypatch.setattr(main, "ValidatorStore", lambda: ValidatorStore(path=path))
+
+    # A failed scrape is retried, a successful one makes the target fresh
+    for _ in range(3):
+        await main.scrape("acme", "company")
+    assert scraped == ["acme", "acme"]
+    await main.scrape("acme", "company", force=True)
+    assert len(scraped) == 3
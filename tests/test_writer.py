@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from linkedin_scraper.storage.writer import FileWriter
+
+
+def test_writer_replaces_files_with_the_latest_document(tmp_path):
+    writer = FileWriter(max_pending=4, batch_size=8)
+    path = str(tmp_path / "nested" / "profile_jane.json")
+    for i in range(20):
+        writer.submit(path, {"name": "Jane", "version": i}, indent=True)
+    writer.close()
+
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {"name": "Jane", "version": 19}
+    stats = writer.stats()
+    # Every document is either written or superseded within its batch
+    assert stats["files"] + stats["coalesced"] == 20
+    assert stats["errors"] == 0
+    assert [p.name for p in (tmp_path / "nested").iterdir()] == ["profile_jane.json"]
+
+
+@pytest.mark.asyncio
+async def test_write_json_waits_for_the_file_and_raises_its_error(tmp_path):
+    writer = FileWriter(max_pending=1)
+    try:
+        for i in range(10):
+            await writer.write_json(str(tmp_path / f"company_{i}.json"), {"i": i})
+        await writer.write_json(str(tmp_path / "last.json"), {"i": 10}, wait=True)
+        assert (tmp_path / "last.json").exists()
+        await writer.aflush()
+        assert len(list(tmp_path.glob("company_*.json"))) == 10
+
+        (tmp_path / "file").write_text("")
+        with pytest.raises(OSError):
+            await writer.write_json(str(tmp_path / "file" / "x.json"), {}, wait=True)
+    finally:
+        writer.close()
+
+
+def test_appended_lines_keep_their_order_and_outlive_close(tmp_path):
+    writer = FileWriter(max_pending=4, batch_size=8)
+    path = tmp_path / "traces" / "spans.jsonl"
+    for i in range(20):
+        writer.append(str(path), {"i": i})
+    writer.close()
+    # Late callers, e.g. atexit hooks, are written inline
+    writer.append(str(path), {"i": 20})
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["i"] for line in lines] == list(range(21))
+    assert writer.stats()["coalesced"] == 0 and writer.stats()["errors"] == 0
+
+
+@pytest.mark.asyncio
+async def test_write_json_after_close_writes_inline(tmp_path):
+    writer = FileWriter()
+    writer.close()
+
+    await writer.write_json(str(tmp_path / "late.json"), {"late": True}, wait=True)
+    assert json.loads((tmp_path / "late.json").read_text()) == {"late": True}
+    (tmp_path / "file").write_text("")
+    with pytest.raises(OSError):
+        await writer.write_json(str(tmp_path / "file" / "x.json"), {}, wait=True)